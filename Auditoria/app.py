@@ -1,7 +1,11 @@
 import json
 import os
+import sys
 from flask import Flask, render_template_string, request, jsonify
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Data Loader Tools"))
+from registros_json import iterar_registros, localizar
+
 app = Flask(__name__)
 
 DATASET_FILE = 'dataset_completo_raciociniologico.json'
@@ -9,9 +13,8 @@ AUDIT_FILE = 'audit_dataset_completo_raciociniologico.json'
 
 # Carrega o Dataset Original
 def load_dataset():
-    with open(DATASET_FILE, 'r', encoding='utf-8') as f:
-        # Filtra apenas os capturados para não perder tempo com os quebrados
-        return [q for q in json.load(f) if q.get('capturado')]
+    # Filtra apenas os capturados para não perder tempo com os quebrados (.json ou .jsonl)
+    return [q for q in iterar_registros(localizar(DATASET_FILE)) if q.get('capturado')]
 
 # Carrega ou Cria o Arquivo de Auditoria
 def load_audit():
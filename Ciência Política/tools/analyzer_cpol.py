@@ -1,5 +1,8 @@
-import json
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Data Loader Tools"))
+from registros_json import iterar_registros, localizar, formato_do_caminho, caminho_no_formato, EscritorRegistros
 
 ARQUIVO_ENTRADA = "dataset_ciencia_politica_final.json"
 ARQUIVO_APROVADO = "dataset_ciencia_politica_aprovado.json"
@@ -36,37 +39,30 @@ def auditar_questao(q):
 
 def main():
     print("--- ANALISADOR CIÊNCIA POLÍTICA ---")
-    if not os.path.exists(ARQUIVO_ENTRADA):
+    entrada = localizar(ARQUIVO_ENTRADA)
+    if not os.path.exists(entrada):
         print(f"Arquivo {ARQUIVO_ENTRADA} não encontrado.")
         return
 
-    with open(ARQUIVO_ENTRADA, 'r', encoding='utf-8') as f:
-        dados = json.load(f)
-
-    aprovadas = []
-    revisar = []
-
-    for item in dados:
-        q = auditar_questao(item)
-        if q['qa_status'] == "APROVADA":
-            aprovadas.append(q)
-        else:
-            revisar.append(q)
+    # Aprovadas/revisão saem no formato da entrada (.json ou .jsonl)
+    formato = formato_do_caminho(entrada)
+    total = 0
+    with EscritorRegistros(caminho_no_formato(ARQUIVO_APROVADO, formato)) as aprovadas, \
+         EscritorRegistros(caminho_no_formato(ARQUIVO_REVISAO, formato), gravar_vazio=False) as revisar:
+        for item in iterar_registros(entrada):
+            q = auditar_questao(item)
+            if q['qa_status'] == "APROVADA":
+                aprovadas.escrever(q)
+            else:
+                revisar.escrever(q)
+            total += 1
 
-    total = len(dados)
-    precisao = (len(aprovadas) / total * 100) if total > 0 else 0
+    precisao = (aprovadas.total / total * 100) if total > 0 else 0
 
     print(f"Total: {total}")
-    print(f"Aprovadas: {len(aprovadas)}")
-    print(f"Revisar: {len(revisar)}")
+    print(f"Aprovadas: {aprovadas.total}")
+    print(f"Revisar: {revisar.total}")
     print(f"Precisão: {precisao:.2f}%")
 
-    with open(ARQUIVO_APROVADO, 'w', encoding='utf-8') as f:
-        json.dump(aprovadas, f, indent=4, ensure_ascii=False)
-    
-    if revisar:
-        with open(ARQUIVO_REVISAO, 'w', encoding='utf-8') as f:
-            json.dump(revisar, f, indent=4, ensure_ascii=False)
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
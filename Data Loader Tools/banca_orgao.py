@@ -0,0 +1,161 @@
+"""
+Campos estruturados da linha de banca do TEC.
+
+    "CEBRASPE (CESPE) - AFRDF (SEFAZ DF)/SEFAZ DF/Auditoria/2020"
+        banca "CEBRASPE" | cargo "AFRDF" | orgao "SEFAZ DF" | ano 2020
+
+O texto original continua em banca_orgao; os quatro campos vão para
+colunas indexadas (questao.banca/cargo/orgao/ano), assim filtrar por banca
+ou por ano vira busca no índice em vez de ILIKE sobre o texto.
+
+Linhas sem " - " (ex: "Questões Inéditas") ficam só com a banca. Quando o
+TEC quebra a linha e o ano fica na de baixo, o motor de extração junta as
+duas; datasets antigos com a linha cortada ficam com ano None.
+
+Uso direto (confere a separação de um dataset):
+    python banca_orgao.py "../Informática/datasets/dataset_informatica_final.json"
+"""
+import re
+import argparse
+from collections import Counter
+
+from registros_json import iterar_registros
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+# Marcas que identificam a linha da banca no lookahead (e a banca normalizada)
+MARCAS_BANCA = ("CEBRASPE", "FGV", "FCC")
+# "CESPE" sozinho é o nome antigo do CEBRASPE
+SINONIMOS_BANCA = {"CESPE": "CEBRASPE"}
+
+REGEX_ANO_FINAL = re.compile(r'(?:^|/)\s*((?:19|20)\d{2})\s*$')
+# "Adm (PF)" -> "Adm": a sigla entre parênteses repete o órgão
+REGEX_SIGLA_CARGO = re.compile(r'\s*\([^()]*\)$')
+
+CAMPOS = ("banca", "cargo", "orgao", "ano")
+TAMANHO_BANCA = 60
+TAMANHO_CARGO = 120
+TAMANHO_ORGAO = 120
+
+# ==============================================================================
+# SEPARAÇÃO
+# ==============================================================================
+def eh_linha_banca(linha):
+    return any(marca in linha for marca in MARCAS_BANCA)
+
+def termina_com_ano(linha):
+    return REGEX_ANO_FINAL.search(linha) is not None
+
+def normalizar_banca(texto):
+    """Nome canônico da banca ("CEBRASPE (CESPE)" -> "CEBRASPE"), ou None."""
+    texto = (texto or "").strip()
+    if not texto:
+        return None
+    maiusculo = texto.upper()
+    for marca in MARCAS_BANCA:
+        if marca in maiusculo:
+            return marca
+    for sinonimo, banca in SINONIMOS_BANCA.items():
+        if sinonimo in maiusculo:
+            return banca
+    return texto
+
+def separar_banca_orgao(texto):
+    """{"banca", "cargo", "orgao", "ano"} do banca_orgao; o que faltar vem None."""
+    campos = dict.fromkeys(CAMPOS)
+    texto = (texto or "").strip()
+    if not texto:
+        return campos
+
+    banca, separador, resto = texto.partition(" - ")
+    campos["banca"] = normalizar_banca(banca)
+    if not separador:
+        return campos
+
+    match_ano = REGEX_ANO_FINAL.search(resto)
+    if match_ano:
+        campos["ano"] = int(match_ano.group(1))
+        resto = resto[:match_ano.start()]
+
+    partes = [p.strip() for p in resto.split("/")]
+    campos["cargo"] = REGEX_SIGLA_CARGO.sub("", partes[0]) or None
+    if len(partes) > 1:
+        campos["orgao"] = partes[1] or None
+    return campos
+
+def campos_banca(q):
+    """Os campos já extraídos da questão, ou a separação do banca_orgao (datasets antigos)."""
+    if "banca" in q:
+        return {campo: q.get(campo) for campo in CAMPOS}
+    return separar_banca_orgao(q.get("banca_orgao"))
+
+# ==============================================================================
+# BANCO (colunas indexadas em questao)
+# ==============================================================================
+SQL_COLUNAS = f"""
+    ALTER TABLE questao
+        ADD COLUMN IF NOT EXISTS banca VARCHAR({TAMANHO_BANCA}),
+        ADD COLUMN IF NOT EXISTS cargo VARCHAR({TAMANHO_CARGO}),
+        ADD COLUMN IF NOT EXISTS orgao VARCHAR({TAMANHO_ORGAO}),
+        ADD COLUMN IF NOT EXISTS ano SMALLINT
+"""
+SQL_INDICES = (
+    "CREATE INDEX IF NOT EXISTS idx_questao_banca_ano ON questao (banca, ano)",
+    "CREATE INDEX IF NOT EXISTS idx_questao_ano ON questao (ano)",
+    "CREATE INDEX IF NOT EXISTS idx_questao_orgao ON questao (orgao)",
+)
+
+def _limitar(campos):
+    # Um órgão/cargo fora do comum não pode derrubar a carga inteira
+    campos = dict(campos)
+    for campo, tamanho in (("banca", TAMANHO_BANCA), ("cargo", TAMANHO_CARGO), ("orgao", TAMANHO_ORGAO)):
+        if campos[campo]:
+            campos[campo] = campos[campo][:tamanho]
+    return campos
+
+def valores_banca(q):
+    """(banca, cargo, orgao, ano) prontos para o INSERT."""
+    campos = _limitar(campos_banca(q))
+    return tuple(campos[campo] for campo in CAMPOS)
+
+def preparar_colunas(cursor):
+    """Cria as colunas e índices, e preenche as questões já gravadas sem eles."""
+    cursor.execute(SQL_COLUNAS)
+    for sql in SQL_INDICES:
+        cursor.execute(sql)
+
+    cursor.execute("SELECT id, banca_orgao FROM questao WHERE banca IS NULL AND banca_orgao IS NOT NULL")
+    pendentes = [valores_banca({"banca_orgao": texto}) + (id_questao,) for id_questao, texto in cursor.fetchall()]
+    if pendentes:
+        cursor.executemany("UPDATE questao SET banca = %s, cargo = %s, orgao = %s, ano = %s WHERE id = %s", pendentes)
+        print(f"🏛️  Banca/cargo/órgão/ano preenchidos em {len(pendentes)} questões já gravadas")
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Mostra como o banca_orgao dos datasets é separado.")
+    parser.add_argument("arquivos", nargs="+", help="Datasets .json ou .jsonl (lista de questões)")
+    args = parser.parse_args()
+
+    bancas = Counter()
+    anos = Counter()
+    sem_ano = Counter()
+    for caminho in args.arquivos:
+        for q in iterar_registros(caminho):
+            campos = campos_banca(q)
+            bancas[campos["banca"]] += 1
+            anos[campos["ano"]] += 1
+            if campos["ano"] is None and " - " in (q.get("banca_orgao") or ""):
+                sem_ano[q["banca_orgao"]] += 1
+
+    print(f"🏛️  Bancas: {', '.join(f'{b}: {n}' for b, n in bancas.most_common())}")
+    print(f"📅 Anos: {', '.join(f'{a}: {n}' for a, n in sorted(anos.items(), key=lambda x: x[0] or 0))}")
+    if sem_ano:
+        print(f"⚠️  {sum(sem_ano.values())} questões com a linha da banca cortada (sem ano):")
+        for texto, n in sem_ano.most_common(10):
+            print(f"   {n}x {texto}")
+
+if __name__ == "__main__":
+    main()
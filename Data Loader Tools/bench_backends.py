@@ -0,0 +1,161 @@
+"""
+Benchmark dos leitores de PDF (BACKENDS do motor_extracao) sobre */fonts/*.pdf.
+
+Para cada PDF, cada backend extrai o texto sem cache; o texto passa pela mesma
+máquina de estados dos extratores e as questões (id_tec -> gabarito) são
+comparadas com as do backend de referência (pdfplumber). Também conta as
+linhas de texto que diferem, que afetam comando/enunciado.
+
+Só vale trocar o backend padrão quando este relatório não mostrar diferenças.
+
+Uso:
+    python bench_backends.py
+    python bench_backends.py -m "Informática" --limite 2
+    python bench_backends.py --saida relatorio_backends.json
+"""
+import os
+import glob
+import json
+import time
+import difflib
+import argparse
+
+from motor_extracao import BACKENDS, BACKEND_PADRAO, extrair_questoes
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+def listar_pdfs(materias=None, limite=None):
+    arquivos = []
+    for pasta in sorted(glob.glob(os.path.join(RAIZ_PROJETO, "*", "fonts"))):
+        materia = os.path.basename(os.path.dirname(pasta))
+        if materias and materia not in materias:
+            continue
+        pdfs = sorted(glob.glob(os.path.join(pasta, "*.pdf")))
+        arquivos += pdfs[:limite] if limite else pdfs
+    return arquivos
+
+# ==============================================================================
+# EXTRAÇÃO
+# ==============================================================================
+def extrair_com_backend(caminho_pdf, nome):
+    """Retorna (paginas, segundos, {id_tec: gabarito}, linhas)."""
+    extrair = BACKENDS[nome][0]
+
+    inicio = time.perf_counter()
+    paginas = list(extrair(caminho_pdf))
+    segundos = time.perf_counter() - inicio
+
+    linhas = []
+    for t in paginas:
+        if t:
+            linhas += t.split('\n')
+    linhas.append("")
+
+    gabaritos = {q['id_tec']: q['gabarito'] for q, _ in extrair_questoes(linhas, "")}
+    return len(paginas), segundos, gabaritos, linhas
+
+def comparar(referencia, outro):
+    """Diferenças de IDs e gabaritos entre dois {id_tec: gabarito}."""
+    faltando = sorted(set(referencia) - set(outro), key=int)
+    sobrando = sorted(set(outro) - set(referencia), key=int)
+    gabaritos = sorted(
+        (i for i in set(referencia) & set(outro) if referencia[i] != outro[i]), key=int
+    )
+    return {
+        "ids_faltando": faltando,
+        "ids_sobrando": sobrando,
+        "gabaritos_diferentes": [
+            {"id_tec": i, BACKEND_PADRAO: referencia[i], "backend": outro[i]} for i in gabaritos
+        ],
+    }
+
+def linhas_diferentes(a, b):
+    """Quantas linhas mudam de um texto para o outro (pelo diff, não por posição)."""
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    return sum(max(i2 - i1, j2 - j1) for op, i1, i2, j1, j2 in matcher.get_opcodes() if op != "equal")
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Compara velocidade e saída dos leitores de PDF.")
+    parser.add_argument("-m", "--materia", action="append", default=None,
+                        help="Restringe a uma matéria (nome da pasta). Pode repetir.")
+    parser.add_argument("--limite", type=int, default=None, help="Máximo de PDFs por matéria")
+    parser.add_argument("--saida", default=None, help="Grava o relatório completo em JSON")
+    args = parser.parse_args()
+
+    outros = [b for b in sorted(BACKENDS) if b != BACKEND_PADRAO]
+    if not outros:
+        print("❌ Só há um backend disponível (instale pypdfium2 para comparar).")
+        return
+
+    arquivos = listar_pdfs(args.materia, args.limite)
+    if not arquivos:
+        print("❌ Nenhum PDF encontrado.")
+        return
+
+    print(f"--- BENCHMARK DE BACKENDS: {BACKEND_PADRAO} x {', '.join(outros)} ---")
+    print(f"📦 {len(arquivos)} PDFs")
+
+    nomes = [BACKEND_PADRAO] + outros
+    totais = {b: {"paginas": 0, "segundos": 0.0} for b in nomes}
+    relatorio = []
+    problemas = 0
+
+    for caminho in arquivos:
+        rel = os.path.relpath(caminho, RAIZ_PROJETO)
+        resultados = {b: extrair_com_backend(caminho, b) for b in nomes}
+        paginas, seg_ref, gab_ref, linhas_ref = resultados[BACKEND_PADRAO]
+
+        item = {"pdf": rel, "paginas": paginas, "questoes": len(gab_ref), "backends": {}}
+        resumo = []
+        for b in nomes:
+            pags, seg, gab, linhas = resultados[b]
+            totais[b]["paginas"] += pags
+            totais[b]["segundos"] += seg
+            dados = {"segundos": round(seg, 3), "paginas_por_segundo": round(pags / seg, 1) if seg else None}
+            if b != BACKEND_PADRAO:
+                dif = comparar(gab_ref, gab)
+                dados.update(dif)
+                dados["linhas_diferentes"] = linhas_diferentes(linhas_ref, linhas)
+                if dif["ids_faltando"] or dif["ids_sobrando"] or dif["gabaritos_diferentes"]:
+                    problemas += 1
+            item["backends"][b] = dados
+            resumo.append(f"{b} {pags / seg if seg else 0:>7.1f} pág/s")
+        relatorio.append(item)
+
+        marcas = []
+        for b in outros:
+            d = item["backends"][b]
+            if d["ids_faltando"] or d["ids_sobrando"] or d["gabaritos_diferentes"]:
+                marcas.append(f"❌ {b}: -{len(d['ids_faltando'])} +{len(d['ids_sobrando'])} IDs, "
+                              f"{len(d['gabaritos_diferentes'])} gabaritos")
+            if d["linhas_diferentes"]:
+                marcas.append(f"⚠️  {b}: {d['linhas_diferentes']} linhas de texto diferentes")
+        print(f"   {rel:<60} {paginas:>4} pág | {' | '.join(resumo)} {' '.join(marcas) or '✅'}")
+
+    print("-" * 50)
+    for b in nomes:
+        t = totais[b]
+        taxa = t["paginas"] / t["segundos"] if t["segundos"] else 0
+        print(f"{b:<12} {t['paginas']:>6} páginas em {t['segundos']:>8.1f}s = {taxa:>7.1f} pág/s")
+    for b in outros:
+        if totais[b]["segundos"]:
+            print(f"🚀 {b}: {totais[BACKEND_PADRAO]['segundos'] / totais[b]['segundos']:.1f}x mais rápido")
+
+    if problemas:
+        print(f"❌ {problemas} PDFs com IDs/gabaritos diferentes.")
+    else:
+        print("✅ IDs e gabaritos idênticos em todos os PDFs.")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump({"totais": totais, "pdfs": relatorio}, f, indent=4, ensure_ascii=False)
+        print(f"💾 Relatório salvo em: {args.saida}")
+
+if __name__ == "__main__":
+    main()
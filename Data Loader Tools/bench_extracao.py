@@ -0,0 +1,376 @@
+"""
+Benchmark do pipeline de extração, etapa por etapa, sobre um subconjunto fixo
+de PDFs, com baseline gravado em JSON.
+
+As etapas rodam o código dos extratores, com o perfil de cada PDF em
+perfis_materias.json (a matéria é a pasta do PDF): banca padrão, regex de
+gabarito, gatilhos, limite do fallback, formato e arquivos de saída. Os PDFs
+de uma matéria dividem um IdsVistos, como no extrator_materias.
+
+As etapas são as funções que o processar_pdf/consolidar encadeiam, chamadas
+uma a uma. Cada PDF passa por elas na ordem dos arquivos (as cópias puladas
+dependem do filtro dos PDFs anteriores) e o tempo de cada etapa é somado
+entre os PDFs; o pico de RSS é o maior deles.
+
+Etapas:
+    abrir_pdf       abre o PDF e conta as páginas
+    texto_paginas   texto de cada página pelo backend (sem cache)
+    texto_cache     o mesmo pelo cache de páginas (preenchido antes, fora da medição)
+    imagens         mapear_imagens (só matérias no formato imagens)
+    metadados       linhas + máquina de estados (extrair_questoes com a banca,
+                    o gabarito e as cópias puladas do perfil)
+    separacao       separar_questoes sem o memo
+    separacao_memo  separar_questoes com o memo já preenchido
+    filtro          filtro do perfil, cópias repetidas (pular_repetidas) e
+                    dedup/ordenação do juntar()
+    gravacao        gravar_saidas(): textos associados e registros_json,
+                    numa pasta temporária
+
+Para cada etapa: tempo de parede, tempo de CPU e pico de RSS. O pico é o
+RSS máximo durante a etapa, incluindo o que o processo já ocupava (no Linux
+ele é zerado antes de cada etapa via /proc/self/clear_refs; fora dele vale o
+pico do processo inteiro). O que os extratores imprimem fica fora da saída,
+menos os erros.
+
+O baseline depende da máquina: grave-o antes da mudança e compare depois, no
+mesmo computador. A saída de erro é 1 quando há regressão acima do limiar.
+
+Uso:
+    python bench_extracao.py --salvar-baseline     # grava a referência
+    python bench_extracao.py                       # compara com a referência
+    python bench_extracao.py --limiar 0.2 --backend pdfium
+    python bench_extracao.py --formato jsonl
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+from contextlib import redirect_stdout
+
+import pdfplumber
+
+from motor_extracao import (
+    BACKENDS, BACKEND_PADRAO, IdsVistos, contar_paginas, iterar_textos_paginas, linhas_das_paginas,
+    extrair_questoes,
+)
+from extrator_materias import (
+    carregar_perfis, parametros_leitura, separar_questoes, filtrar_por_perfil, pular_repetidas, juntar,
+    gravar_saidas, _mapear,
+)
+from imagens_pdf import mapear_imagens
+from registros_json import iterar_registros, caminho_no_formato, FORMATOS as FORMATOS_ARQUIVO, FORMATO_PADRAO
+from memoria import zerar_pico_rss, pico_rss_mb
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+ARQUIVO_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_extracao_baseline.json")
+
+# Subconjunto fixo: PDFs pequenos de matérias com layouts diferentes (~70 páginas)
+SUBCONJUNTO = [
+    "Direito Administrativo/fonts/DA10.pdf",
+    "Ciência Política/fonts/CP5.pdf",
+    "Língua Inglesa/fonts/ING4.pdf",
+    "Direito Constitucional/fonts/DC10.pdf",
+    "Informática/fonts/INF7.pdf",
+]
+
+ETAPAS = ["abrir_pdf", "texto_paginas", "texto_cache", "imagens", "metadados", "separacao", "separacao_memo",
+          "filtro", "gravacao"]
+METRICAS = ["parede_s", "cpu_s", "pico_rss_mb"]
+
+LIMIAR_PADRAO = 0.10
+# Diferenças absolutas abaixo disto são ruído, mesmo que passem do limiar
+TOLERANCIA_ABSOLUTA = {"parede_s": 0.05, "cpu_s": 0.05, "pico_rss_mb": 5.0}
+
+# ==============================================================================
+# MEDIÇÃO
+# ==============================================================================
+def medir(funcao, *args):
+    """Retorna (resultado, {parede_s, cpu_s, pico_rss_mb})."""
+    zerar_pico_rss()
+    parede = time.perf_counter()
+    cpu = time.process_time()
+    resultado = funcao(*args)
+    medida = {
+        "parede_s": time.perf_counter() - parede,
+        "cpu_s": time.process_time() - cpu,
+        "pico_rss_mb": pico_rss_mb(),
+    }
+    return resultado, medida
+
+def somar(medidas, etapa, medida):
+    """Acumula a medida de um PDF na etapa: tempos somados, pico pelo maior."""
+    atual = medidas.setdefault(etapa, {"parede_s": 0.0, "cpu_s": 0.0, "pico_rss_mb": 0.0})
+    atual["parede_s"] += medida["parede_s"]
+    atual["cpu_s"] += medida["cpu_s"]
+    atual["pico_rss_mb"] = max(atual["pico_rss_mb"], medida["pico_rss_mb"])
+
+def medir_em(medidas, etapa, funcao, *args):
+    """medir() sem a saída dos extratores, somado em medidas[etapa]."""
+    resultado, medida = medir(_silencioso, funcao, *args)
+    somar(medidas, etapa, medida)
+    return resultado
+
+def _silencioso(funcao, *args, **kwargs):
+    """funcao sem a saída dos extratores; as linhas de erro (❌) continuam aparecendo."""
+    saida = io.StringIO()
+    with redirect_stdout(saida):
+        resultado = funcao(*args, **kwargs)
+    for linha in saida.getvalue().splitlines():
+        if "❌" in linha:
+            print(linha)
+    return resultado
+
+# ==============================================================================
+# ETAPAS
+# ==============================================================================
+def perfis_dos_pdfs(pdfs, perfis):
+    """{pdf: perfil} pela pasta da matéria (<Matéria>/fonts/<pdf>)."""
+    por_pdf = {}
+    for caminho in pdfs:
+        materia = os.path.basename(os.path.dirname(os.path.dirname(caminho)))
+        if materia not in perfis:
+            raise ValueError(f"{caminho}: matéria '{materia}' sem perfil em perfis_materias.json")
+        por_pdf[caminho] = perfis[materia]
+    return por_pdf
+
+def etapa_abrir_pdf(pdfs, backend):
+    if backend == "pdfplumber":
+        paginas = 0
+        for caminho in pdfs:
+            with pdfplumber.open(caminho) as pdf:
+                paginas += len(pdf.pages)
+        return paginas
+    return sum(contar_paginas(caminho) for caminho in pdfs)
+
+def etapa_texto_paginas(pdfs, backend, usar_cache):
+    return {caminho: list(iterar_textos_paginas(caminho, usar_cache=usar_cache, backend=backend)) for caminho in pdfs}
+
+def etapa_metadados(perfil, paginas, pular):
+    return list(extrair_questoes(linhas_das_paginas(paginas), **parametros_leitura(perfil), pular=pular))
+
+def etapa_filtro(perfil, questoes, nome_pdf, vistos):
+    if perfil["formato"] == "mapa":
+        resultado = _mapear(questoes)
+    else:
+        resultado = filtrar_por_perfil(perfil, questoes)
+    return pular_repetidas(resultado, nome_pdf, vistos)
+
+def _copias(questoes):
+    # separar_questoes preenche as questões; cada passada recebe as suas
+    return [(dict(q), texto) for q, texto in questoes]
+
+def extrair_materia(perfil, pdfs, textos, medidas):
+    """
+    O processar_pdf de cada PDF da matéria, etapa por etapa, e o juntar().
+    Retorna (listas finais, questões, cópias puladas, separações diferentes com/sem memo).
+    """
+    vistos = IdsVistos()
+    resultados = []
+    questoes_total = 0
+    divergentes = 0
+    for caminho in pdfs:
+        nome_pdf = os.path.basename(caminho)
+        imagens = {}
+        if perfil["formato"] == "imagens":
+            imagens = medir_em(medidas, "imagens", mapear_imagens, caminho)
+        questoes = medir_em(medidas, "metadados", etapa_metadados, perfil, textos[caminho], vistos.pular_em(nome_pdf))
+
+        if perfil["formato"] != "mapa":
+            separadas = medir_em(medidas, "separacao", separar_questoes, perfil, _copias(questoes), imagens, False)
+            # Preenche o memo; a medida é a da passada seguinte
+            _silencioso(separar_questoes, perfil, _copias(questoes), imagens, True)
+            do_memo = medir_em(medidas, "separacao_memo", separar_questoes, perfil, _copias(questoes), imagens, True)
+            divergentes += sum(a != b for a, b in zip(separadas, do_memo))
+            questoes = separadas
+
+        resultados.append(medir_em(medidas, "filtro", etapa_filtro, perfil, questoes, nome_pdf, vistos))
+        questoes_total += len(questoes)
+
+    finais = medir_em(medidas, "filtro", juntar, perfil, resultados)
+    return finais, questoes_total, vistos.total_puladas(), divergentes
+
+def etapa_gravacao(perfil, finais, pasta, formato_arquivo):
+    """gravar_saidas() em pasta/<matéria>. Retorna {arquivo: caminho gravado}."""
+    destino = os.path.join(pasta, perfil["materia"])
+    os.makedirs(destino, exist_ok=True)
+    gravar_saidas(perfil, finais, destino, formato_arquivo)
+    gravados = {}
+    for nome in perfil["saida"]:
+        arquivo = caminho_no_formato(os.path.join(destino, nome), formato_arquivo)
+        if os.path.exists(arquivo):
+            gravados[os.path.join(perfil["materia"], os.path.basename(arquivo))] = arquivo
+    return gravados
+
+def rodar_pipeline(pdfs, perfis, backend, formato_arquivo):
+    """Uma execução completa. Retorna ({etapa: medida}, resumo)."""
+    por_pdf = perfis_dos_pdfs(pdfs, perfis)
+    medidas = {}
+    paginas, medidas["abrir_pdf"] = medir(etapa_abrir_pdf, pdfs, backend)
+    textos, medidas["texto_paginas"] = medir(etapa_texto_paginas, pdfs, backend, False)
+
+    # Preenche o cache de páginas; a medida é a da leitura seguinte
+    etapa_texto_paginas(pdfs, backend, True)
+    do_cache, medidas["texto_cache"] = medir(etapa_texto_paginas, pdfs, backend, True)
+    if do_cache != textos:
+        print("⚠️  O cache de páginas devolveu textos diferentes da leitura direta.")
+    del do_cache
+
+    por_materia = {}
+    for caminho, perfil in por_pdf.items():
+        por_materia.setdefault(perfil["materia"], (perfil, []))[1].append(caminho)
+
+    resumo = {"paginas": paginas, "questoes": 0, "puladas": 0, "arquivos": {}, "bytes_saida": 0}
+    divergentes = 0
+    with tempfile.TemporaryDirectory() as pasta:
+        for perfil, caminhos in por_materia.values():
+            finais, questoes, puladas, diferentes = extrair_materia(perfil, caminhos, textos, medidas)
+            gravados = medir_em(medidas, "gravacao", etapa_gravacao, perfil, finais, pasta, formato_arquivo)
+            resumo["questoes"] += questoes
+            resumo["puladas"] += puladas
+            divergentes += diferentes
+            for nome, caminho in gravados.items():
+                resumo["arquivos"][nome] = sum(1 for _ in iterar_registros(caminho))
+                resumo["bytes_saida"] += os.path.getsize(caminho)
+    if divergentes:
+        print(f"⚠️  {divergentes} questões separadas de outro jeito com o memo.")
+
+    # Etapa que não rodou (nenhuma matéria no formato imagens) fica zerada
+    for etapa in ETAPAS:
+        medidas.setdefault(etapa, {"parede_s": 0.0, "cpu_s": 0.0, "pico_rss_mb": 0.0})
+    resumo["arquivos"] = dict(sorted(resumo["arquivos"].items()))
+    return medidas, resumo
+
+def melhor_de(execucoes):
+    """Mínimo de cada métrica entre as execuções (o menos afetado por ruído)."""
+    return {
+        etapa: {m: min(e[etapa][m] for e in execucoes) for m in METRICAS}
+        for etapa in ETAPAS
+    }
+
+# ==============================================================================
+# BASELINE
+# ==============================================================================
+def configuracao(pdfs, backend, formato_arquivo):
+    return {
+        "pdfs": [os.path.relpath(p, RAIZ_PROJETO) for p in pdfs],
+        "backend": backend,
+        "formato": formato_arquivo,
+        "backend_versao": BACKENDS[backend][1],
+        "python": platform.python_version(),
+    }
+
+def comparar(atual, baseline, limiar):
+    """Lista de (etapa, métrica, base, atual, variação) acima do limiar."""
+    regressoes = []
+    for etapa in ETAPAS:
+        for m in METRICAS:
+            base = baseline.get(etapa, {}).get(m)
+            valor = atual[etapa][m]
+            if not base:
+                continue
+            variacao = (valor - base) / base
+            if variacao > limiar and valor - base > TOLERANCIA_ABSOLUTA[m]:
+                regressoes.append((etapa, m, base, valor, variacao))
+    return regressoes
+
+def imprimir_tabela(atual, baseline=None):
+    print(f"{'Etapa':<15} {'Parede (s)':>11} {'CPU (s)':>9} {'Pico RSS (MB)':>14}"
+          + ("   Δ parede   Δ CPU   Δ RSS" if baseline else ""))
+    for etapa in ETAPAS:
+        a = atual[etapa]
+        linha = f"{etapa:<15} {a['parede_s']:>11.3f} {a['cpu_s']:>9.3f} {a['pico_rss_mb']:>14.1f}"
+        if baseline and etapa in baseline:
+            deltas = []
+            for m in METRICAS:
+                base = baseline[etapa].get(m)
+                deltas.append(f"{(a[m] - base) / base * 100:>+7.1f}%" if base else f"{'-':>8}")
+            linha += "  " + " ".join(deltas)
+        print(linha)
+    total_parede = sum(atual[e]["parede_s"] for e in ETAPAS)
+    total_cpu = sum(atual[e]["cpu_s"] for e in ETAPAS)
+    print(f"{'TOTAL':<15} {total_parede:>11.3f} {total_cpu:>9.3f}")
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark por etapa do pipeline de extração, com baseline.")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=BACKEND_PADRAO,
+                        help="Leitor de PDF (Padrão: pdfplumber)")
+    parser.add_argument("--pdf", action="append", default=None,
+                        help="PDF do subconjunto (relativo à raiz). Pode repetir. Padrão: SUBCONJUNTO")
+    parser.add_argument("--formato", choices=FORMATOS_ARQUIVO, default=FORMATO_PADRAO,
+                        help="Formato dos datasets gravados pelo gravar_saidas (Padrão: json)")
+    parser.add_argument("--repeticoes", type=int, default=1, help="Melhor de N execuções (Padrão: 1)")
+    parser.add_argument("--baseline", default=ARQUIVO_BASELINE, help="Arquivo JSON do baseline")
+    parser.add_argument("--salvar-baseline", action="store_true", help="Grava o resultado como novo baseline")
+    parser.add_argument("--limiar", type=float, default=LIMIAR_PADRAO,
+                        help=f"Piora relativa tolerada antes de acusar regressão (Padrão: {LIMIAR_PADRAO})")
+    args = parser.parse_args()
+
+    pdfs = [os.path.join(RAIZ_PROJETO, p) for p in (args.pdf or SUBCONJUNTO)]
+    faltando = [p for p in pdfs if not os.path.exists(p)]
+    if faltando:
+        print(f"❌ PDFs não encontrados: {faltando}")
+        sys.exit(2)
+
+    try:
+        perfis = carregar_perfis()
+        perfis_dos_pdfs(pdfs, perfis)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+
+    print(f"--- BENCHMARK DA EXTRAÇÃO ({args.backend}) ---")
+    print(f"📦 {len(pdfs)} PDFs | Repetições: {args.repeticoes} | Formato: {args.formato}")
+
+    execucoes = []
+    for i in range(args.repeticoes):
+        medidas, resumo = rodar_pipeline(pdfs, perfis, args.backend, args.formato)
+        execucoes.append(medidas)
+        print(f"   Execução {i + 1}: {sum(m['parede_s'] for m in medidas.values()):.1f}s")
+    atual = melhor_de(execucoes)
+    print(f"📄 {resumo['paginas']} páginas | {resumo['questoes']} questões | {resumo['puladas']} cópias puladas")
+    for nome, total in resumo["arquivos"].items():
+        print(f"   {nome}: {total}")
+    print("-" * 50)
+
+    config = configuracao(pdfs, args.backend, args.formato)
+    if args.salvar_baseline:
+        imprimir_tabela(atual)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({"configuracao": config, "resumo": resumo, "etapas": atual}, f, indent=4, ensure_ascii=False)
+        print(f"💾 Baseline salvo em: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        imprimir_tabela(atual)
+        print(f"⚠️  Sem baseline em {args.baseline}. Rode com --salvar-baseline para criar.")
+        return
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    imprimir_tabela(atual, baseline["etapas"])
+    if baseline.get("configuracao") != config:
+        print("⚠️  Baseline gravado com outra configuração (PDFs/backend/versões); compare com cautela.")
+    if baseline.get("resumo") and baseline["resumo"] != resumo:
+        print(f"⚠️  A saída mudou: baseline {baseline['resumo']} x atual {resumo}")
+
+    regressoes = comparar(atual, baseline["etapas"], args.limiar)
+    print("-" * 50)
+    if regressoes:
+        for etapa, m, base, valor, variacao in regressoes:
+            print(f"❌ {etapa}.{m}: {base:.3f} -> {valor:.3f} ({variacao * 100:+.1f}%)")
+        print(f"❌ {len(regressoes)} regressões acima de {args.limiar * 100:.0f}%.")
+        sys.exit(1)
+    print(f"✅ Nenhuma regressão acima de {args.limiar * 100:.0f}%.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Micro-benchmark do segmentador (segmentador.py) contra a implementação antiga
+(um re.finditer com DOTALL por gatilho), que fica aqui só como referência.
+
+Os textos vêm dos datasets (<Matéria>/datasets/*.json): texto_completo quando
+existe (dataset_RL_rico), senão comando + enunciado, com o texto associado dos
+datasets compactados resolvido (o texto inteiro que o segmentador recebe na
+extração). Além deles entram textos sintéticos longos, o caso em que o ".*?"
+antigo reescaneia o texto inteiro.
+
+Toda separação é conferida: qualquer diferença entre antigo e novo é listada.
+
+Uso:
+    python bench_segmentador.py
+    python bench_segmentador.py --repeticoes 5
+"""
+import os
+import re
+import glob
+import time
+import argparse
+
+from segmentador import separar_comando_enunciado, GATILHOS_PT, GATILHOS_EN
+from registros_json import iterar_registros
+from textos_associados import carregar_textos, expandir_comando
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+ANTIGOS_PT = [
+    r'(julgue\s+o(s)?\s+.*?(item|itens)\s+(a\s+seguir|seguintes?|subsequentes?|próximos?).*?(:|\.))',
+    r'(julgue\s+o(s)?\s+(seguintes?|próximos?|subsequentes?)\s+(item|itens).*?(:|\.))',
+    r'(julgue\s+o(s)?\s+(item|itens).*?de\s+acordo.*?(:|\.))',
+    r'(julgue\s+o(s)?\s+.*?(item|itens).*?(:|\.))',
+    r'(assinale\s+a\s+opção\s+correta.*?(:|\.))'
+]
+ANTIGOS_EN = [
+    r'(Judge\s+the\s+(following|next|subsequent)?\s*items?.*?(:|\.))',
+    r'(Judge\s+the\s+.*?items?.*?(:|\.))',
+    r'(Based\s+on\s+the\s+.*?judge.*?(:|\.))',
+    r'(Considering\s+the\s+.*?judge.*?(:|\.))',
+    r'(Choose\s+the\s+correct\s+option.*?(:|\.))'
+]
+
+# ==============================================================================
+# IMPLEMENTAÇÃO ANTIGA (referência)
+# ==============================================================================
+def _separar_antigo(texto_completo, gatilhos, limite_fallback):
+    if not texto_completo: return "", ""
+
+    divisor = None
+    match_pos = -1
+    for g in gatilhos:
+        for match in re.finditer(g, texto_completo, re.IGNORECASE | re.DOTALL):
+            if match.end() > match_pos and match.end() < len(texto_completo) - 2:
+                match_pos = match.end()
+                divisor = match
+
+    if divisor:
+        comando = texto_completo[:divisor.end()].strip()
+        enunciado = texto_completo[divisor.end():].strip()
+        enunciado = re.sub(r'^[\.\:\-\s]+', '', enunciado)
+        enunciado = re.sub(r'\s+(Certo|Errado)$', '', enunciado, flags=re.IGNORECASE)
+        return comando, enunciado
+
+    partes = texto_completo.split('\n\n')
+    if len(partes) >= 2:
+        enunciado_cand = partes[-1].strip()
+        if len(enunciado_cand) < limite_fallback:
+            comando = "\n\n".join(partes[:-1]).strip()
+            return comando, enunciado_cand
+
+    return texto_completo, "[Enunciado não separado automaticamente]"
+
+# ==============================================================================
+# TEXTOS
+# ==============================================================================
+def _comando(q, associados):
+    try:
+        return expandir_comando(q, associados)
+    except KeyError:
+        return q.get('comando') or ""
+
+def textos_dos_datasets():
+    """Retorna {"PT": [...], "EN": [...]} com os textos dos datasets."""
+    textos = {"PT": [], "EN": []}
+    vistos = set()
+    caminhos = glob.glob(os.path.join(RAIZ_PROJETO, "*", "datasets", "*.json"))
+    caminhos += glob.glob(os.path.join(RAIZ_PROJETO, "*", "datasets", "*.jsonl"))
+    for caminho in sorted(caminhos):
+        idioma = "EN" if "Língua Inglesa" in caminho else "PT"
+        associados = carregar_textos(os.path.dirname(caminho))
+        # Um arquivo que não é lista de questões (mapas, textos_associados) é pulado inteiro
+        novos = []
+        try:
+            for q in iterar_registros(caminho):
+                if not isinstance(q, dict):
+                    continue
+                texto = q.get('texto_completo') or "\n".join(
+                    p for p in (_comando(q, associados), q.get('enunciado') or "") if p
+                )
+                if texto:
+                    novos.append(texto)
+        except (ValueError, UnicodeDecodeError):
+            continue
+
+        for texto in novos:
+            if (idioma, texto) not in vistos:
+                vistos.add((idioma, texto))
+                textos[idioma].append(texto)
+    return textos
+
+def textos_sinteticos():
+    """Textos de apoio longos, sem o fecho que o ".*?" antigo procurava."""
+    paragrafo = ("Segundo o texto, o autor julgue o mérito da proposta e o item "
+                 "orçamentário sem pontuação final, de acordo com a lei ")
+    return {
+        # Muitos "julgue o" e nenhum "item" depois: cada início varre até o fim
+        "PT": [("julgue o desempenho do gestor " * 200) + "\n\nAssertiva final.",
+               # Muitos "item" sem ":" ou "." no resto do texto
+               "Julgue os itens a seguir. " + (paragrafo * 60),
+               ("julgue os " + "x " * 500) * 5],
+        "EN": [("Judge the author, considering the " * 400) + "\n\nFinal statement.",
+               "Based on the text, " + ("judge the idea, consider the " * 600)],
+    }
+
+# ==============================================================================
+# MEDIÇÃO
+# ==============================================================================
+def medir(funcao, textos, repeticoes):
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for t in textos:
+            funcao(t)
+        decorrido = time.perf_counter() - inicio
+        melhor = decorrido if melhor is None else min(melhor, decorrido)
+    return melhor
+
+def comparar(nome, textos, antigos, gatilhos, repeticoes):
+    def antigo(t):
+        return _separar_antigo(t, antigos, 600)
+
+    def novo(t):
+        return separar_comando_enunciado(t, gatilhos, 600)
+
+    diferencas = [t for t in textos if antigo(t) != novo(t)]
+    t_antigo = medir(antigo, textos, repeticoes)
+    t_novo = medir(novo, textos, repeticoes)
+    ganho = t_antigo / t_novo if t_novo else float('inf')
+    tamanho = sum(len(t) for t in textos)
+
+    print(f"{nome:<22} {len(textos):>6} textos {tamanho / 1024:>8.0f} KB | "
+          f"antigo {t_antigo * 1000:>9.1f} ms | novo {t_novo * 1000:>8.1f} ms | {ganho:>6.1f}x")
+    for t in diferencas[:5]:
+        print(f"   ❌ Diferença: {t[:80]!r}")
+    return len(diferencas)
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Compara o segmentador novo com os finditer antigos.")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Melhor de N execuções (Padrão: 3)")
+    args = parser.parse_args()
+
+    print("--- BENCHMARK DO SEGMENTADOR ---")
+    reais = textos_dos_datasets()
+    sinteticos = textos_sinteticos()
+
+    erros = 0
+    erros += comparar("Datasets PT", reais["PT"], ANTIGOS_PT, GATILHOS_PT, args.repeticoes)
+    erros += comparar("Datasets EN", reais["EN"], ANTIGOS_EN, GATILHOS_EN, args.repeticoes)
+    erros += comparar("Sintéticos PT", sinteticos["PT"], ANTIGOS_PT, GATILHOS_PT, args.repeticoes)
+    erros += comparar("Sintéticos EN", sinteticos["EN"], ANTIGOS_EN, GATILHOS_EN, args.repeticoes)
+
+    if erros:
+        print(f"\n❌ {erros} separações diferentes.")
+    else:
+        print("\n✅ Separações idênticas em todos os textos.")
+
+if __name__ == "__main__":
+    main()
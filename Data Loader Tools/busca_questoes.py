@@ -0,0 +1,415 @@
+"""
+Busca textual no banco de questões (índice invertido + BM25).
+
+Achar as questões de um assunto ("princípio da legalidade", "crase") era
+grep nos JSON ou ILIKE '%...%' no Postgres. Aqui todos os datasets viram um
+índice invertido num SQLite (.cache_extracao/busca.sqlite): para cada termo,
+as questões onde ele aparece e quantas vezes. A consulta lê só as listas dos
+termos pedidos e ordena por BM25.
+
+Texto indexado: assunto + comando (com o texto associado resolvido) +
+enunciado. Termos: minúsculas, sem acento, sem stopwords e com um radical
+leve (plural e vogal final: "públicas" e "público" viram "public"). A
+consulta passa pelo mesmo tratamento.
+
+Atualização incremental, como no manifesto da extração: cada dataset é
+lembrado por tamanho + mtime (e SHA-256 se eles mudarem), junto com os do
+textos_associados.json da pasta, que entra no texto indexado; só os alterados
+são reindexados, e os que sumiram saem do índice. Mudar este arquivo
+(stopwords, radical) refaz o índice inteiro.
+
+Uso:
+    python busca_questoes.py "princípio da legalidade"
+    python busca_questoes.py crase --materia portugues --gabarito C -n 20
+    python busca_questoes.py --atualizar
+    python busca_questoes.py --status
+    python busca_questoes.py --limpar
+
+    from busca_questoes import buscar
+    for r in buscar("poder de polícia", materia="administrativo"):
+        print(r["id_tec"], r["score"])
+"""
+import os
+import re
+import math
+import glob
+import time
+import heapq
+import sqlite3
+import hashlib
+import argparse
+import unicodedata
+
+from cache_paginas import PASTA_CACHE, hash_arquivo
+from registros_json import iterar_registros, localizar
+from textos_associados import carregar_textos, expandir_comando, ARQUIVO_TEXTOS
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+ARQUIVO_INDICE = os.path.join(PASTA_CACHE, "busca.sqlite")
+PADROES_DATASETS = ["*/datasets/dataset_*_final.json*", "*/datasets/dataset_*_imagens.json*"]
+
+K1 = 1.2                 # saturação da frequência do termo (BM25)
+B = 0.75                 # peso do tamanho da questão (BM25)
+LIMITE_PADRAO = 10
+TAMANHO_TRECHO = 200
+
+MARCA_FALHA = "[Enunciado não separado automaticamente]"
+
+STOPWORDS = frozenset("""
+a o as os um uma uns umas de do da dos das em no na nos nas por pelo pela pelos pelas
+para pra com sem sob sobre ao aos e ou nem mas que se ja nao sim como mais menos muito
+muita muitos muitas seu sua seus suas ele ela eles elas isso isto esse essa esses essas
+este esta estes estas aquele aquela aqueles aquelas qual quais quando onde ser sao foi
+era sera tem ter ha pode podem deve devem entre ate apos tambem so lhe lhes me te nos
+vos the of and to in is are be by for on or an it as at this that with from not
+""".split())
+
+PLURAIS = (("oes", "ao"), ("aes", "ao"), ("ais", "al"), ("eis", "el"), ("ois", "ol"),
+           ("ns", "m"), ("res", "r"), ("zes", "z"), ("ses", "s"))
+
+# ==============================================================================
+# TERMOS
+# ==============================================================================
+def dobrar(texto):
+    """Minúsculas e sem acento."""
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+def radical(palavra):
+    """Radical leve: tira o plural e a vogal final (gênero)."""
+    if len(palavra) <= 3 or palavra.isdigit():
+        return palavra
+    for sufixo, troca in PLURAIS:
+        if palavra.endswith(sufixo):
+            palavra = palavra[:-len(sufixo)] + troca
+            break
+    else:
+        if palavra.endswith("s") and palavra[-2] in "aeo":
+            palavra = palavra[:-1]
+    if len(palavra) > 3 and palavra[-1] in "aeo":
+        palavra = palavra[:-1]
+    return palavra
+
+def termos(texto):
+    return [radical(p) for p in re.findall(r'\w+', dobrar(texto or "")) if p not in STOPWORDS]
+
+# ==============================================================================
+# ÍNDICE EM DISCO
+# ==============================================================================
+_conexao = None
+
+def _versao():
+    # O tratamento dos termos mora neste arquivo: mudou, o índice não vale mais
+    with open(os.path.abspath(__file__), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _criar_tabelas(conn):
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS arquivos (
+            caminho TEXT PRIMARY KEY,
+            tamanho INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            sha256 TEXT NOT NULL,
+            tamanho_textos INTEGER NOT NULL,
+            mtime_textos REAL NOT NULL,
+            sha256_textos TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS documentos (
+            doc_id INTEGER PRIMARY KEY,
+            arquivo TEXT NOT NULL,
+            indice INTEGER NOT NULL,
+            id_tec TEXT,
+            materia TEXT,
+            assunto TEXT,
+            banca_orgao TEXT,
+            gabarito TEXT,
+            filtro_materia TEXT NOT NULL,
+            filtro_assunto TEXT NOT NULL,
+            filtro_banca TEXT NOT NULL,
+            filtro_gabarito TEXT NOT NULL,
+            comprimento INTEGER NOT NULL,
+            trecho TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS documentos_arquivo ON documentos (arquivo);
+        CREATE TABLE IF NOT EXISTS postings (
+            termo TEXT NOT NULL,
+            doc_id INTEGER NOT NULL,
+            tf INTEGER NOT NULL,
+            PRIMARY KEY (termo, doc_id)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+    """)
+
+def _conectar():
+    global _conexao
+    if _conexao is not None:
+        return _conexao
+
+    os.makedirs(PASTA_CACHE, exist_ok=True)
+    conn = sqlite3.connect(ARQUIVO_INDICE, timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (chave TEXT PRIMARY KEY, valor TEXT NOT NULL)")
+
+    versao = _versao()
+    linha = conn.execute("SELECT valor FROM meta WHERE chave = 'versao'").fetchone()
+    if not linha or linha[0] != versao:
+        # DROP em vez de DELETE: as tabelas são recriadas com o esquema atual
+        conn.executescript("DROP TABLE IF EXISTS postings; DROP TABLE IF EXISTS documentos; "
+                           "DROP TABLE IF EXISTS arquivos;")
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('versao', ?)", (versao,))
+    _criar_tabelas(conn)
+    conn.commit()
+
+    _conexao = conn
+    return conn
+
+def _chave(caminho):
+    return os.path.relpath(os.path.abspath(caminho), RAIZ_PROJETO)
+
+def datasets_padrao():
+    return sorted({c for p in PADROES_DATASETS for c in glob.glob(os.path.join(RAIZ_PROJETO, p))})
+
+# ==============================================================================
+# INDEXAÇÃO
+# ==============================================================================
+def _texto_indexado(q, textos):
+    try:
+        comando = expandir_comando(q, textos)
+    except KeyError:
+        comando = q.get("comando") or ""
+    enunciado = q.get("enunciado") or ""
+    if MARCA_FALHA in enunciado:
+        enunciado = ""
+    return f"{q.get('assunto') or ''}\n{comando}\n{enunciado}", enunciado or comando
+
+def _estado(caminho):
+    """(tamanho, mtime) do arquivo, ou (0, 0.0) se ele não existe."""
+    if not os.path.exists(caminho):
+        return 0, 0.0
+    info = os.stat(caminho)
+    return info.st_size, info.st_mtime
+
+def _hash(caminho):
+    return hash_arquivo(caminho) if os.path.exists(caminho) else ""
+
+def _remover_arquivo(conn, chave):
+    conn.execute("DELETE FROM postings WHERE doc_id IN (SELECT doc_id FROM documentos WHERE arquivo = ?)", (chave,))
+    conn.execute("DELETE FROM documentos WHERE arquivo = ?", (chave,))
+    conn.execute("DELETE FROM arquivos WHERE caminho = ?", (chave,))
+
+def _indexar_arquivo(conn, caminho, chave):
+    pasta = os.path.dirname(caminho)
+    materia_pasta = os.path.basename(os.path.dirname(pasta))
+    textos = carregar_textos(pasta)
+    total = 0
+    for indice, q in enumerate(iterar_registros(caminho)):
+        texto, trecho = _texto_indexado(q, textos)
+        lista = termos(texto)
+        if not lista:
+            continue
+        materia = q.get("materia") or materia_pasta
+        cursor = conn.execute(
+            "INSERT INTO documentos (arquivo, indice, id_tec, materia, assunto, banca_orgao, gabarito, "
+            "filtro_materia, filtro_assunto, filtro_banca, filtro_gabarito, comprimento, trecho) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (chave, indice, q.get("id_tec"), materia, q.get("assunto"), q.get("banca_orgao"), q.get("gabarito"),
+             dobrar(f"{materia} {materia_pasta}"), dobrar(q.get("assunto") or ""),
+             dobrar(q.get("banca_orgao") or ""), dobrar(q.get("gabarito") or ""),
+             len(lista), " ".join(trecho.split())[:TAMANHO_TRECHO])
+        )
+        frequencias = {}
+        for termo in lista:
+            frequencias[termo] = frequencias.get(termo, 0) + 1
+        conn.executemany("INSERT INTO postings VALUES (?, ?, ?)",
+                         [(termo, cursor.lastrowid, tf) for termo, tf in frequencias.items()])
+        total += 1
+    return total
+
+def _atualizar_estatisticas(conn):
+    n, media = conn.execute("SELECT COUNT(*), AVG(comprimento) FROM documentos").fetchone()
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('total_documentos', ?)", (str(n),))
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('comprimento_medio', ?)", (str(media or 0),))
+
+def atualizar_indice(arquivos=None, verbose=False):
+    """
+    Reindexa os datasets novos ou alterados (Padrão: todos os _final e
+    _imagens das matérias) e tira do índice os que não existem mais.
+    Retorna quantos datasets foram reindexados.
+    """
+    conn = _conectar()
+    arquivos = [localizar(a) for a in (arquivos or datasets_padrao())]
+    conhecidos = {c: ((t, m, tt, mt), (s, st)) for c, t, m, s, tt, mt, st in conn.execute(
+        "SELECT caminho, tamanho, mtime, sha256, tamanho_textos, mtime_textos, sha256_textos FROM arquivos")}
+    reindexados = 0
+
+    for chave in conhecidos:
+        if not os.path.exists(os.path.join(RAIZ_PROJETO, chave)):
+            _remover_arquivo(conn, chave)
+            reindexados += 1
+            if verbose:
+                print(f"🗑️  {chave}: removido do índice")
+
+    for caminho in arquivos:
+        if not os.path.exists(caminho):
+            continue
+        chave = _chave(caminho)
+        # O texto associado resolvido entra no índice: o repositório da pasta conta como parte do dataset
+        textos = os.path.join(os.path.dirname(caminho), ARQUIVO_TEXTOS)
+        estado = _estado(caminho) + _estado(textos)
+        anterior = conhecidos.get(chave)
+        if anterior and anterior[0] == estado:
+            continue
+        hashes = (hash_arquivo(caminho), _hash(textos))
+        if anterior and anterior[1] == hashes:
+            conn.execute("UPDATE arquivos SET tamanho = ?, mtime = ?, tamanho_textos = ?, mtime_textos = ? "
+                         "WHERE caminho = ?", (*estado, chave))
+            continue
+
+        _remover_arquivo(conn, chave)
+        total = _indexar_arquivo(conn, caminho, chave)
+        (tamanho, mtime, tamanho_textos, mtime_textos), (sha, sha_textos) = estado, hashes
+        conn.execute("INSERT INTO arquivos VALUES (?, ?, ?, ?, ?, ?, ?)",
+                     (chave, tamanho, mtime, sha, tamanho_textos, mtime_textos, sha_textos))
+        reindexados += 1
+        if verbose:
+            print(f"📥 {chave}: {total} questões indexadas")
+
+    if reindexados:
+        _atualizar_estatisticas(conn)
+    conn.commit()
+    return reindexados
+
+# ==============================================================================
+# CONSULTA
+# ==============================================================================
+def _filtrar(conn, materia, assunto, banca, gabarito):
+    """doc_ids que passam nos filtros (parte do texto, sem acento), ou None sem filtro."""
+    condicoes, valores = [], []
+    for coluna, valor in (("filtro_materia", materia), ("filtro_assunto", assunto), ("filtro_banca", banca)):
+        if valor:
+            condicoes.append(f"{coluna} LIKE ?")
+            valores.append(f"%{dobrar(valor)}%")
+    if gabarito:
+        # "C" vale "Certo"
+        condicoes.append("filtro_gabarito LIKE ?")
+        valores.append(f"{dobrar(gabarito)}%")
+    if not condicoes:
+        return None
+    sql = "SELECT doc_id FROM documentos WHERE " + " AND ".join(condicoes)
+    return {doc_id for doc_id, in conn.execute(sql, valores)}
+
+def buscar(consulta, limite=LIMITE_PADRAO, materia=None, assunto=None, banca=None, gabarito=None):
+    """
+    As `limite` questões mais relevantes para a consulta (BM25), como dicts
+    com id_tec, score, materia, assunto, banca_orgao, gabarito, arquivo,
+    indice e trecho. Os filtros casam com parte do campo, sem acento.
+    O índice não é atualizado aqui (veja atualizar_indice).
+    """
+    conn = _conectar()
+    pedidos = set(termos(consulta))
+    meta = dict(conn.execute("SELECT chave, valor FROM meta"))
+    n = int(meta.get("total_documentos", 0))
+    if not pedidos or not n:
+        return []
+    media = float(meta["comprimento_medio"])
+    permitidos = _filtrar(conn, materia, assunto, banca, gabarito)
+
+    comprimentos = {}
+    scores = {}
+    for termo in pedidos:
+        linhas = conn.execute(
+            "SELECT p.doc_id, p.tf, d.comprimento FROM postings p JOIN documentos d USING (doc_id) "
+            "WHERE p.termo = ?", (termo,)
+        ).fetchall()
+        if not linhas:
+            continue
+        idf = math.log(1 + (n - len(linhas) + 0.5) / (len(linhas) + 0.5))
+        for doc_id, tf, comprimento in linhas:
+            if permitidos is not None and doc_id not in permitidos:
+                continue
+            peso = tf * (K1 + 1) / (tf + K1 * (1 - B + B * comprimento / media))
+            scores[doc_id] = scores.get(doc_id, 0.0) + idf * peso
+            comprimentos[doc_id] = comprimento
+
+    melhores = heapq.nlargest(limite, scores.items(), key=lambda item: (item[1], -item[0]))
+    resultados = []
+    for doc_id, score in melhores:
+        id_tec, materia_q, assunto_q, banca_q, gabarito_q, arquivo, indice, trecho = conn.execute(
+            "SELECT id_tec, materia, assunto, banca_orgao, gabarito, arquivo, indice, trecho "
+            "FROM documentos WHERE doc_id = ?", (doc_id,)
+        ).fetchone()
+        resultados.append({
+            "id_tec": id_tec, "score": round(score, 3), "materia": materia_q, "assunto": assunto_q,
+            "banca_orgao": banca_q, "gabarito": gabarito_q, "arquivo": arquivo, "indice": indice,
+            "trecho": trecho,
+        })
+    return resultados
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def mostrar_status():
+    conn = _conectar()
+    print(f"📂 Índice: {ARQUIVO_INDICE}")
+    arquivos = conn.execute(
+        "SELECT a.caminho, COUNT(d.doc_id) FROM arquivos a LEFT JOIN documentos d ON d.arquivo = a.caminho "
+        "GROUP BY a.caminho ORDER BY a.caminho"
+    ).fetchall()
+    if not arquivos:
+        print("   (vazio)")
+    for caminho, total in arquivos:
+        print(f"   {caminho}: {total} questões")
+    termos_distintos = conn.execute("SELECT COUNT(DISTINCT termo) FROM postings").fetchone()[0]
+    print(f"   Termos distintos: {termos_distintos}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Busca textual (BM25) nas questões de todos os datasets.")
+    parser.add_argument("consulta", nargs="*", help="Termos da busca")
+    parser.add_argument("-n", "--limite", type=int, default=LIMITE_PADRAO,
+                        help=f"Quantos resultados (Padrão: {LIMITE_PADRAO})")
+    parser.add_argument("--materia", default=None, help="Filtra pela matéria (parte do nome)")
+    parser.add_argument("--assunto", default=None, help="Filtra pelo assunto (parte do nome)")
+    parser.add_argument("--banca", default=None, help="Filtra pela banca/órgão (parte do nome)")
+    parser.add_argument("--gabarito", default=None, help="Filtra pelo gabarito (C, E, Certo...)")
+    parser.add_argument("--datasets", nargs="+", default=None,
+                        help="Datasets a indexar (Padrão: todos os _final e _imagens das matérias)")
+    parser.add_argument("--atualizar", action="store_true", help="Só atualiza o índice")
+    parser.add_argument("--sem-atualizar", action="store_true",
+                        help="Busca no índice como está, sem conferir os datasets")
+    parser.add_argument("--status", action="store_true", help="Mostra o que está indexado")
+    parser.add_argument("--limpar", action="store_true", help="Apaga o índice (refeito na próxima busca)")
+    args = parser.parse_args()
+
+    if args.limpar:
+        for sufixo in ("", "-wal", "-shm"):
+            if os.path.exists(ARQUIVO_INDICE + sufixo):
+                os.remove(ARQUIVO_INDICE + sufixo)
+        print("🧹 Índice apagado.")
+        return
+
+    if args.status:
+        mostrar_status()
+        return
+
+    if not args.sem_atualizar:
+        inicio = time.time()
+        reindexados = atualizar_indice(args.datasets, verbose=True)
+        if reindexados:
+            print(f"✅ Índice atualizado: {reindexados} datasets em {time.time() - inicio:.1f}s")
+    if args.atualizar or not args.consulta:
+        return
+
+    consulta = " ".join(args.consulta)
+    inicio = time.time()
+    resultados = buscar(consulta, args.limite, args.materia, args.assunto, args.banca, args.gabarito)
+    print(f"🔎 \"{consulta}\": {len(resultados)} resultados em {(time.time() - inicio) * 1000:.1f} ms")
+    for posicao, r in enumerate(resultados, 1):
+        print(f"\n{posicao:>3}. [{r['id_tec']}] {r['score']:.2f} | {r['materia']} | {r['assunto']} | {r['gabarito']}")
+        print(f"     {r['trecho']}")
+
+if __name__ == "__main__":
+    main()
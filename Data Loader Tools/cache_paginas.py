@@ -0,0 +1,236 @@
+"""
+Cache em disco do texto extraído de cada página dos PDFs.
+
+Chave: (SHA-256 do PDF, índice da página, versão do backend). Enquanto o PDF e
+a versão do backend forem os mesmos, o extract_text() não roda de novo, então
+mexer em gatilhos/regex de separação passa a custar segundos.
+
+O cache é um SQLite (stdlib) com limite de tamanho: quando estoura, os
+documentos acessados há mais tempo são descartados primeiro (LRU).
+
+Uso direto:
+    python cache_paginas.py --status
+    python cache_paginas.py --limpar
+"""
+import os
+import time
+import sqlite3
+import hashlib
+import argparse
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+PASTA_CACHE = os.path.join(RAIZ_PROJETO, ".cache_extracao")
+ARQUIVO_CACHE = os.path.join(PASTA_CACHE, "paginas.sqlite")
+LIMITE_MB_PADRAO = 1024
+
+# ==============================================================================
+# CONEXÃO (uma por processo, o pool de extração abre várias)
+# ==============================================================================
+_conexao = None
+_pid_conexao = None
+
+def _conectar():
+    global _conexao, _pid_conexao
+    if _conexao is not None and _pid_conexao == os.getpid():
+        return _conexao
+
+    os.makedirs(PASTA_CACHE, exist_ok=True)
+    conn = sqlite3.connect(ARQUIVO_CACHE, timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS documentos (
+            sha256 TEXT NOT NULL,
+            backend TEXT NOT NULL,
+            total_paginas INTEGER NOT NULL,
+            acesso REAL NOT NULL,
+            PRIMARY KEY (sha256, backend)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS paginas (
+            sha256 TEXT NOT NULL,
+            backend TEXT NOT NULL,
+            pagina INTEGER NOT NULL,
+            texto TEXT NOT NULL,
+            tamanho INTEGER NOT NULL,
+            PRIMARY KEY (sha256, backend, pagina)
+        )
+    """)
+    conn.commit()
+
+    _conexao = conn
+    _pid_conexao = os.getpid()
+    return conn
+
+def hash_arquivo(caminho):
+    """SHA-256 do arquivo, lido em blocos."""
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+# ==============================================================================
+# LEITURA COM CACHE
+# ==============================================================================
+def iterar_paginas_com_cache(caminho_pdf, backend, extrair, limite_mb=LIMITE_MB_PADRAO):
+    """
+    Gera o texto de cada página do PDF.
+
+    - backend: identificador + versão do extrator (faz parte da chave).
+    - extrair: função geradora extrair(caminho_pdf) -> texto de cada página,
+      chamada apenas quando o documento não está completo no cache.
+    """
+    sha = hash_arquivo(caminho_pdf)
+    conn = _conectar()
+
+    row = conn.execute(
+        "SELECT total_paginas FROM documentos WHERE sha256 = ? AND backend = ?", (sha, backend)
+    ).fetchone()
+    if row:
+        qtd = conn.execute(
+            "SELECT COUNT(*) FROM paginas WHERE sha256 = ? AND backend = ?", (sha, backend)
+        ).fetchone()[0]
+        if qtd == row[0]:
+            conn.execute("UPDATE documentos SET acesso = ? WHERE sha256 = ? AND backend = ?",
+                         (time.time(), sha, backend))
+            conn.commit()
+            cursor = conn.execute(
+                "SELECT texto FROM paginas WHERE sha256 = ? AND backend = ? ORDER BY pagina", (sha, backend)
+            )
+            for (texto,) in cursor:
+                yield texto
+            return
+
+    # Miss: extrai e grava página a página (commit curto para não travar o pool)
+    total = 0
+    for idx, texto in enumerate(extrair(caminho_pdf)):
+        texto = texto or ""
+        conn.execute(
+            "INSERT OR REPLACE INTO paginas (sha256, backend, pagina, texto, tamanho) VALUES (?, ?, ?, ?, ?)",
+            (sha, backend, idx, texto, len(texto.encode('utf-8')))
+        )
+        conn.commit()
+        total += 1
+        yield texto
+
+    conn.execute(
+        "INSERT OR REPLACE INTO documentos (sha256, backend, total_paginas, acesso) VALUES (?, ?, ?, ?)",
+        (sha, backend, total, time.time())
+    )
+    conn.commit()
+    aplicar_limite(limite_mb)
+
+def iterar_intervalo_com_cache(caminho_pdf, backend, extrair, inicio, fim, total_paginas,
+                               limite_mb=LIMITE_MB_PADRAO):
+    """
+    Gera o texto das páginas [inicio, fim), para as fatias de um PDF grande.
+
+    - extrair: extrair(caminho_pdf, inicio, fim) -> texto de cada página do
+      intervalo, chamada quando falta alguma página do intervalo no cache.
+    - total_paginas: quando a fatia que completa o documento termina, ele é
+      registrado e a leitura inteira (iterar_paginas_com_cache) passa a usá-lo.
+    """
+    sha = hash_arquivo(caminho_pdf)
+    conn = _conectar()
+
+    filtro = "sha256 = ? AND backend = ? AND pagina >= ? AND pagina < ?"
+    qtd = conn.execute(f"SELECT COUNT(*) FROM paginas WHERE {filtro}", (sha, backend, inicio, fim)).fetchone()[0]
+    if qtd == fim - inicio:
+        cursor = conn.execute(f"SELECT texto FROM paginas WHERE {filtro} ORDER BY pagina",
+                              (sha, backend, inicio, fim))
+        for (texto,) in cursor:
+            yield texto
+        return
+
+    for idx, texto in enumerate(extrair(caminho_pdf, inicio, fim), inicio):
+        texto = texto or ""
+        conn.execute(
+            "INSERT OR REPLACE INTO paginas (sha256, backend, pagina, texto, tamanho) VALUES (?, ?, ?, ?, ?)",
+            (sha, backend, idx, texto, len(texto.encode('utf-8')))
+        )
+        conn.commit()
+        yield texto
+
+    gravadas = conn.execute(
+        "SELECT COUNT(*) FROM paginas WHERE sha256 = ? AND backend = ?", (sha, backend)
+    ).fetchone()[0]
+    if gravadas == total_paginas:
+        conn.execute(
+            "INSERT OR REPLACE INTO documentos (sha256, backend, total_paginas, acesso) VALUES (?, ?, ?, ?)",
+            (sha, backend, total_paginas, time.time())
+        )
+        conn.commit()
+        aplicar_limite(limite_mb)
+
+def aplicar_limite(limite_mb=LIMITE_MB_PADRAO):
+    """Descarta documentos menos usados até o cache caber em limite_mb."""
+    conn = _conectar()
+    limite = limite_mb * 1024 * 1024
+    total = conn.execute("SELECT COALESCE(SUM(tamanho), 0) FROM paginas").fetchone()[0]
+    if total <= limite:
+        return 0
+
+    docs = conn.execute("""
+        SELECT d.sha256, d.backend, COALESCE(SUM(p.tamanho), 0)
+        FROM documentos d LEFT JOIN paginas p ON p.sha256 = d.sha256 AND p.backend = d.backend
+        GROUP BY d.sha256, d.backend
+        ORDER BY d.acesso
+    """).fetchall()
+
+    removidos = 0
+    for sha, backend, tamanho in docs:
+        if total <= limite:
+            break
+        conn.execute("DELETE FROM paginas WHERE sha256 = ? AND backend = ?", (sha, backend))
+        conn.execute("DELETE FROM documentos WHERE sha256 = ? AND backend = ?", (sha, backend))
+        total -= tamanho
+        removidos += 1
+
+    # Páginas órfãs (extração interrompida no meio) também saem
+    if total > limite:
+        conn.execute("""
+            DELETE FROM paginas WHERE NOT EXISTS (
+                SELECT 1 FROM documentos d WHERE d.sha256 = paginas.sha256 AND d.backend = paginas.backend
+            )
+        """)
+    conn.commit()
+    return removidos
+
+# ==============================================================================
+# MAIN (manutenção)
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Manutenção do cache de texto das páginas dos PDFs.")
+    parser.add_argument("--status", action="store_true", help="Mostra tamanho e quantidade de documentos")
+    parser.add_argument("--limpar", action="store_true",
+                        help="Apaga o cache de páginas (o memo e o índice de busca têm o seu --limpar)")
+    parser.add_argument("--limite-mb", type=int, default=None, help="Aplica um limite de tamanho agora")
+    args = parser.parse_args()
+
+    if args.limpar:
+        # Só este SQLite: a pasta também guarda segmentacao.sqlite e busca.sqlite
+        for sufixo in ("", "-wal", "-shm"):
+            if os.path.exists(ARQUIVO_CACHE + sufixo):
+                os.remove(ARQUIVO_CACHE + sufixo)
+        print("🧹 Cache apagado.")
+        return
+
+    if args.limite_mb is not None:
+        removidos = aplicar_limite(args.limite_mb)
+        print(f"🗑️  Documentos removidos: {removidos}")
+
+    conn = _conectar()
+    docs = conn.execute("SELECT COUNT(*) FROM documentos").fetchone()[0]
+    paginas, tamanho = conn.execute("SELECT COUNT(*), COALESCE(SUM(tamanho), 0) FROM paginas").fetchone()
+    print(f"📂 Cache: {ARQUIVO_CACHE}")
+    print(f"   Documentos: {docs}")
+    print(f"   Páginas:    {paginas}")
+    print(f"   Texto:      {tamanho / (1024 * 1024):.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,10 @@ except ImportError:
     print("Erro: psycopg não instalado. Execute: pip install psycopg[binary]")
     sys.exit(1)
 
+from textos_associados import carregar_textos, preparar_banco, gravar_texto_banco
+from banca_orgao import preparar_colunas, valores_banca
+from registros_json import iterar_registros, localizar
+
 
 # =============================================================================
 # CONFIGURAÇÃO
@@ -151,14 +155,17 @@ def inserir_questao(cursor, questao_data):
     """Insere uma questão no banco."""
     cursor.execute("""
         INSERT INTO questao 
-        (id_materia, id_assunto, id_tec, link, banca_orgao, comando, enunciado, gabarito, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+        (id_materia, id_assunto, id_tec, link, banca_orgao, banca, cargo, orgao, ano,
+         texto_associado, comando, enunciado, gabarito, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
     """, (
         questao_data['materia_id'],
         questao_data['assunto_id'],
         questao_data['id_tec'],
         questao_data['link'],
         questao_data['banca_orgao'],
+        *questao_data['banca'],
+        questao_data['texto_associado'],
         questao_data['comando'],
         questao_data['enunciado'],
         questao_data['gabarito'],
@@ -279,6 +286,13 @@ def processar_questao(questao_json, cursor, cache, verbose=False):
     if not enunciado:
         return None, "enunciado ausente"
     
+    # Texto associado: grava uma vez na tabela texto_associado e referencia
+    texto_associado = questao_json.get('texto_associado') or None
+    if texto_associado:
+        if texto_associado not in cache['textos']:
+            return None, f"texto associado {texto_associado} ausente"
+        gravar_texto_banco(cursor, texto_associado, cache['textos'], cache['textos_gravados'])
+    
     # Buscar/criar matéria
     materia_id = get_or_create_materia(cursor, materia, cache)
     
@@ -293,6 +307,8 @@ def processar_questao(questao_json, cursor, cache, verbose=False):
         'assunto_id': assunto_id,
         'link': normalizar_link(questao_json.get('link')),
         'banca_orgao': questao_json.get('banca_orgao', '').strip() or None,
+        'banca': valores_banca(questao_json),
+        'texto_associado': texto_associado,
         'comando': questao_json.get('comando', '').strip() or None,
         'enunciado': limpar_enunciado(enunciado, gabarito_raw),
         'gabarito': gabarito
@@ -341,7 +357,7 @@ def main():
     args = parser.parse_args()
     
     # Verificar arquivo
-    arquivo = Path(args.arquivo)
+    arquivo = Path(localizar(args.arquivo))
     if not arquivo.exists():
         print(f"Erro: Arquivo não encontrado: {arquivo}")
         sys.exit(1)
@@ -353,16 +369,14 @@ def main():
     print(f"Dry-run: {'Sim' if args.dry_run else 'Não'}")
     print(f"{'='*60}\n")
     
-    # Carregar JSON
+    # Contar as questões (o arquivo é lido em streaming, .json ou .jsonl)
     print("Carregando arquivo JSON...")
     try:
-        with open(arquivo, 'r', encoding='utf-8') as f:
-            questoes_json = json.load(f)
-    except json.JSONDecodeError as e:
+        total_arquivo = sum(1 for _ in iterar_registros(arquivo))
+    except ValueError as e:
         print(f"Erro ao ler JSON: {e}")
         sys.exit(1)
     
-    total_arquivo = len(questoes_json)
     print(f"  Total de questões no arquivo: {total_arquivo}\n")
     
     # Conectar ao banco
@@ -376,12 +390,17 @@ def main():
         'materias': {},
         'assuntos': {},
         'questoes_existentes': set(),
+        'textos': carregar_textos(arquivo.parent),
+        'textos_gravados': set(),
         'stats': {
             'materias_criadas': 0,
             'assuntos_criados': 0
         }
     }
     
+    preparar_banco(cursor)
+    preparar_colunas(cursor)
+    
     # Carregar dados existentes no cache
     print("Carregando cache...")
     carregar_questoes_existentes(cursor, cache)
@@ -397,7 +416,7 @@ def main():
     erros = []
     duplicadas = []  # Lista para armazenar questões duplicadas
     
-    for i, questao_json in enumerate(questoes_json, 1):
+    for i, questao_json in enumerate(iterar_registros(arquivo), 1):
         id_tec = questao_json.get('id_tec', 'N/A')
         
         questao_data, erro = processar_questao(questao_json, cursor, cache, args.verbose)
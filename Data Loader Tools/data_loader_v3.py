@@ -5,6 +5,11 @@ import argparse
 import psycopg
 from collections import defaultdict
 
+from textos_associados import carregar_textos, preparar_banco, gravar_texto_banco
+from banca_orgao import preparar_colunas, valores_banca
+from registros_json import iterar_registros, localizar
+from imagens_pdf import PASTA_IMAGENS
+
 # =============================================================================
 # CONFIGURAÇÃO
 # =============================================================================
@@ -16,6 +21,10 @@ DB_CONFIG = {
     'password': 'root'
 }
 
+# Endereço onde a pasta imagens/ (armazém do imagens_pdf, fora do git) é
+# publicada; o imagem_url das questões extraídas dos PDFs aponta para lá.
+URL_IMAGENS = ""
+
 def get_or_create_materia(cursor, nome):
     if not nome: return None
     nome = nome[:255]
@@ -36,6 +45,24 @@ def get_or_create_assunto(cursor, nome, id_materia):
     cursor.execute("INSERT INTO assunto (nome, id_materia) VALUES (%s, %s) RETURNING id", (nome, id_materia))
     return cursor.fetchone()[0]
 
+def valida(q):
+    # Do scraper só vale o que foi capturado; os datasets do formato imagens
+    # do extrator (com o campo "imagens") já saem completos do PDF
+    return q.get('capturado') or 'imagens' in q
+
+def url_imagem(q, url_imagens):
+    """
+    imagem_url da questão: a do scraper, se houver; senão a primeira imagem
+    que o extrator guardou no armazém (campo "imagens"), sob url_imagens.
+    Retorna (url, nome_ausente), com o nome que ainda não está no armazém.
+    """
+    if q.get('imagem_url') or not q.get('imagens'):
+        return q.get('imagem_url', ''), None
+    nome = q['imagens'][0]
+    if not os.path.exists(os.path.join(PASTA_IMAGENS, nome)):
+        return '', nome
+    return f"{url_imagens.rstrip('/')}/{nome}", None
+
 def gerar_relatorio_arvore(stats, nome_arquivo="arvore_assuntos.json"):
     """
     Converte o dicionário de estatísticas para o formato de lista JSON solicitado.
@@ -59,21 +86,27 @@ def gerar_relatorio_arvore(stats, nome_arquivo="arvore_assuntos.json"):
 
 def main():
     parser = argparse.ArgumentParser(description="Loader V5 - Estatísticas e Hierarquia")
-    parser.add_argument("arquivo_json", help="Arquivo JSON gerado pelo scraper")
+    parser.add_argument("arquivo_json", help="Arquivo JSON gerado pelo scraper (ou pelo extrator, formato imagens)")
     parser.add_argument("--dry-run", action="store_true", help="Simulação sem persistência + Geração de Árvore JSON")
+    parser.add_argument("--url-imagens", default=URL_IMAGENS,
+                        help="URL onde a pasta imagens/ foi publicada (imagem_url das questões extraídas dos PDFs)")
     
     args = parser.parse_args()
 
-    if not os.path.exists(args.arquivo_json):
+    arquivo_json = localizar(args.arquivo_json)
+    if not os.path.exists(arquivo_json):
         print(f"❌ Arquivo {args.arquivo_json} não encontrado.")
         return
 
-    print(f"📂 Lendo: {args.arquivo_json}")
-    with open(args.arquivo_json, 'r', encoding='utf-8') as f:
-        dados = json.load(f)
-
-    questoes_validas = [q for q in dados if q.get('capturado')]
-    print(f"🚀 Iniciando processamento de {len(questoes_validas)} questões...")
+    # Lido em streaming (.json ou .jsonl): uma passada para contar, outra para carregar
+    print(f"📂 Lendo: {arquivo_json}")
+    total_validas = sum(1 for q in iterar_registros(arquivo_json) if valida(q))
+    questoes_validas = (q for q in iterar_registros(arquivo_json) if valida(q))
+    textos = carregar_textos(os.path.dirname(arquivo_json))
+    textos_gravados = set()
+    imagens_sem_url = 0
+    imagens_ausentes = []
+    print(f"🚀 Iniciando processamento de {total_validas} questões...")
 
     if args.dry_run:
         print("\n⚠️  MODO DRY-RUN: As alterações no banco serão revertidas ao final.")
@@ -85,6 +118,8 @@ def main():
     try:
         with psycopg.connect(**DB_CONFIG) as conn:
             with conn.cursor() as cursor:
+                preparar_banco(cursor)
+                preparar_colunas(cursor)
                 
                 sucessos = 0
                 erros = 0
@@ -107,7 +142,20 @@ def main():
                         id_tec = q.get('id_tec')
                         comando = q.get('comando')
                         enunciado = q.get('enunciado')
-                        imagem_url = q.get('imagem_url', '')
+                        if q.get('imagens') and not q.get('imagem_url') and not args.url_imagens:
+                            # Sem endereço publicado, a imagem fica de fora (o navegador é o outro caminho)
+                            imagens_sem_url += 1
+                            imagem_url = ''
+                        else:
+                            imagem_url, ausente = url_imagem(q, args.url_imagens)
+                            if ausente:
+                                imagens_ausentes.append(ausente)
+                        # Sem banca no JSON (dados do scraper), vale o CEBRASPE de sempre
+                        banca_orgao = q.get('banca_orgao') or 'CEBRASPE'
+                        banca, cargo, orgao, ano = valores_banca({**q, 'banca_orgao': banca_orgao})
+                        texto_associado = q.get('texto_associado') or None
+                        if texto_associado:
+                            gravar_texto_banco(cursor, texto_associado, textos, textos_gravados)
                         
                         gabarito_raw = q.get('gabarito', '').lower()
                         if 'certo' in gabarito_raw or 'c' == gabarito_raw: gabarito = 'Certo'
@@ -117,10 +165,16 @@ def main():
 
                         sql = """
                             INSERT INTO questao 
-                            (id_tec, id_materia, id_assunto, banca_orgao, comando, enunciado, gabarito, imagem_url, ativo, created_at, updated_at)
+                            (id_tec, id_materia, id_assunto, banca_orgao, banca, cargo, orgao, ano, texto_associado, comando, enunciado, gabarito, imagem_url, ativo, created_at, updated_at)
                             VALUES 
-                            (%s, %s, %s, 'CEBRASPE', %s, %s, %s, %s, true, NOW(), NOW())
+                            (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, true, NOW(), NOW())
                             ON CONFLICT (id_tec) DO UPDATE SET
+                                banca_orgao = EXCLUDED.banca_orgao,
+                                banca = EXCLUDED.banca,
+                                cargo = EXCLUDED.cargo,
+                                orgao = EXCLUDED.orgao,
+                                ano = EXCLUDED.ano,
+                                texto_associado = EXCLUDED.texto_associado,
                                 comando = EXCLUDED.comando,
                                 enunciado = EXCLUDED.enunciado,
                                 gabarito = EXCLUDED.gabarito,
@@ -129,7 +183,8 @@ def main():
                                 id_assunto = EXCLUDED.id_assunto,
                                 updated_at = NOW();
                         """
-                        cursor.execute(sql, (id_tec, id_materia, id_assunto, comando, enunciado, gabarito, imagem_url))
+                        cursor.execute(sql, (id_tec, id_materia, id_assunto, banca_orgao, banca, cargo, orgao, ano,
+                                             texto_associado, comando, enunciado, gabarito, imagem_url))
                         
                         sucessos += 1
                         if (i+1) % 100 == 0:
@@ -145,6 +200,10 @@ def main():
                 # Gera o relatório JSON independentemente de ser dry-run ou não
                 arquivo_stats = gerar_relatorio_arvore(stats)
                 print(f"📊 Árvore de Assuntos gerada: {arquivo_stats}")
+                if imagens_sem_url:
+                    print(f"⚠️  {imagens_sem_url} questões com imagem do PDF ficaram sem imagem_url (use --url-imagens).")
+                if imagens_ausentes:
+                    print(f"⚠️  {len(imagens_ausentes)} imagens fora de {PASTA_IMAGENS} (rode o extrator de novo): {imagens_ausentes[:5]}")
 
                 if args.dry_run:
                     conn.rollback()
@@ -0,0 +1,291 @@
+"""
+Questões quase iguais entre todos os datasets (MinHash + LSH).
+
+O data_loader só pega id_tec repetido. A mesma assertiva republicada com
+outro id, ou reaproveitada entre Administrativo e Constitucional, passa e
+cai duas vezes no simulado. Aqui o texto de cada questão vira um conjunto de
+shingles (trincas de palavras, sem acento e em minúsculas), resumido numa
+assinatura MinHash; o LSH por bandas só compara questões que coincidem em
+alguma banda da assinatura. Nada de comparar todos com todos: o custo é
+quase linear no número de questões.
+
+A assinatura é de uma permutação só (one permutation hashing, com
+densificação por rotação): cada shingle é hasheado uma vez e cai em um de
+NUM_BINS compartimentos, que guardam o menor valor. Com k permutações de
+verdade seriam k contas por shingle, caro demais em Python puro.
+
+Texto comparado: o enunciado (a assertiva) e o fim do comando, com o texto
+associado resolvido (as últimas PALAVRAS_COMANDO palavras: a proposição, as
+premissas, o trecho do texto-base). A mesma assertiva ("A tabela-verdade da
+proposição P possui 8 linhas.") sobre outra proposição é outra questão. Se a
+separação falhou, o comando guarda texto-base + assertiva; valem as últimas
+PALAVRAS_FINAIS palavras dele como enunciado e as anteriores como comando.
+
+Um par candidato é confirmado quando tem o mesmo gabarito e o Jaccard exato
+dos shingles passa do --limiar tanto no texto inteiro (comando + enunciado)
+quanto só no enunciado, para um comando padrão ("Julgue o item") não
+aproximar assertivas diferentes. Os confirmados viram grupos (componentes
+conexas); em cada grupo, o menor id_tec (o mais antigo no TEC) é o canônico.
+Como o grupo pode se formar em cadeia (A ~ B ~ C sem A ~ C), o mapa
+canônico só leva quem também é confirmado contra o canônico; os demais
+ficam só no relatório.
+
+Uso:
+    python duplicatas_proximas.py
+    python duplicatas_proximas.py ../*/datasets/dataset_*_final.json --limiar 0.9 --mapa mapa_canonico.json
+"""
+import os
+import re
+import glob
+import json
+import time
+import hashlib
+import argparse
+import unicodedata
+from datetime import datetime
+from collections import defaultdict
+
+from registros_json import iterar_registros
+from textos_associados import carregar_textos, expandir_comando
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+PADROES_DATASETS = ["*/datasets/dataset_*_final.json*", "*/datasets/dataset_*_imagens.json*"]
+ARQUIVO_RELATORIO = "duplicatas_proximas.json"
+
+TAMANHO_SHINGLE = 3      # palavras por shingle
+NUM_BINS = 128           # tamanho da assinatura
+BANDAS = 32              # BANDAS x LINHAS = NUM_BINS; limiar do LSH ~ (1/32)^(1/4) = 0.42
+LINHAS = NUM_BINS // BANDAS
+LIMIAR_PADRAO = 0.8      # Jaccard mínimo para confirmar um par
+MIN_PALAVRAS = 5         # textos menores que isso não entram (ex: "Certo")
+PALAVRAS_FINAIS = 40     # do comando, quando a separação falhou
+PALAVRAS_COMANDO = 40    # fim do comando (contexto da assertiva)
+# Balde do LSH maior que isto (texto padrão repetido) só é comparado em cadeia
+MAX_BALDE = 50
+
+MARCA_FALHA = "[Enunciado não separado automaticamente]"
+REGEX_GABARITO_FINAL = re.compile(r'(\s*\b(Certo|Errado)\b)+\s*$', re.IGNORECASE)
+_VAZIO = (1 << 64) - 1
+
+# ==============================================================================
+# SHINGLES E ASSINATURA
+# ==============================================================================
+def normalizar(texto):
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return re.findall(r'\w+', texto)
+
+def partes_da_questao(q, textos):
+    """(fim do comando, enunciado) comparados, já com o texto associado resolvido."""
+    try:
+        comando = expandir_comando(q, textos)
+    except KeyError:
+        comando = q.get('comando') or ""
+    palavras = comando.split()
+    enunciado = (q.get('enunciado') or "").strip()
+    if not enunciado or MARCA_FALHA in enunciado:
+        palavras = REGEX_GABARITO_FINAL.sub("", comando).split()
+        enunciado = " ".join(palavras[-PALAVRAS_FINAIS:])
+        palavras = palavras[:-PALAVRAS_FINAIS]
+    return " ".join(palavras[-PALAVRAS_COMANDO:]), enunciado
+
+def gabarito_da_questao(q):
+    return (q.get('gabarito') or "").strip().capitalize()
+
+def shingles(palavras, k=TAMANHO_SHINGLE):
+    """Hashes (64 bits) das k-palavras consecutivas."""
+    if len(palavras) < k:
+        grupos = [" ".join(palavras)]
+    else:
+        grupos = (" ".join(palavras[i:i + k]) for i in range(len(palavras) - k + 1))
+    return {int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=8).digest(), 'big') for g in grupos}
+
+def assinatura(hashes, num_bins=NUM_BINS):
+    """MinHash de uma permutação: o menor valor de cada compartimento."""
+    bins = [_VAZIO] * num_bins
+    for h in hashes:
+        b = h % num_bins
+        v = h // num_bins
+        if v < bins[b]:
+            bins[b] = v
+
+    # Densificação: compartimento vazio copia o próximo ocupado (circular),
+    # marcado pela distância para não coincidir à toa com o vizinho
+    if _VAZIO in bins:
+        ocupados = list(bins)
+        for b in range(num_bins):
+            if ocupados[b] != _VAZIO:
+                continue
+            for distancia in range(1, num_bins):
+                vizinho = ocupados[(b + distancia) % num_bins]
+                if vizinho != _VAZIO:
+                    bins[b] = vizinho * num_bins + distancia
+                    break
+    return bins
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+def confirmar(a, b, limiar):
+    """
+    Mesmo gabarito e Jaccard >= limiar no texto inteiro e no enunciado.
+    a e b: (gabarito, shingles do texto inteiro, shingles do enunciado).
+    """
+    return (a[0] == b[0] and jaccard(a[1], b[1]) >= limiar and jaccard(a[2], b[2]) >= limiar)
+
+# ==============================================================================
+# AGRUPAMENTO
+# ==============================================================================
+def pares_candidatos(assinaturas, bandas=BANDAS, linhas=LINHAS):
+    """Pares (i, j), i < j, que caem no mesmo balde em alguma banda."""
+    candidatos = set()
+    for banda in range(bandas):
+        inicio = banda * linhas
+        baldes = defaultdict(list)
+        for i, sig in enumerate(assinaturas):
+            baldes[tuple(sig[inicio:inicio + linhas])].append(i)
+        for membros in baldes.values():
+            if len(membros) < 2:
+                continue
+            if len(membros) > MAX_BALDE:
+                candidatos.update(zip(membros, membros[1:]))
+            else:
+                candidatos.update((a, b) for x, a in enumerate(membros) for b in membros[x + 1:])
+    return candidatos
+
+def _raiz(pais, i):
+    while pais[i] != i:
+        pais[i] = pais[pais[i]]
+        i = pais[i]
+    return i
+
+def agrupar(n, pares):
+    """Componentes conexas dos pares confirmados (só as com 2+ questões)."""
+    pais = list(range(n))
+    for a, b in pares:
+        ra, rb = _raiz(pais, a), _raiz(pais, b)
+        if ra != rb:
+            pais[max(ra, rb)] = min(ra, rb)
+    grupos = defaultdict(list)
+    for i in range(n):
+        grupos[_raiz(pais, i)].append(i)
+    return [membros for membros in grupos.values() if len(membros) > 1]
+
+def _ordem_id(id_tec):
+    return (0, int(id_tec)) if str(id_tec).isdigit() else (1, str(id_tec))
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def carregar_questoes(arquivos):
+    """[(arquivo, indice, questao, (fim do comando, enunciado))] de todos os datasets."""
+    questoes = []
+    for caminho in arquivos:
+        nome = os.path.relpath(os.path.abspath(caminho), RAIZ_PROJETO)
+        textos = carregar_textos(os.path.dirname(os.path.abspath(caminho)))
+        for indice, q in enumerate(iterar_registros(caminho)):
+            if q.get('id_tec'):
+                questoes.append((nome, indice, q, partes_da_questao(q, textos)))
+    return questoes
+
+def main():
+    parser = argparse.ArgumentParser(description="Acha questões quase iguais entre os datasets (MinHash/LSH).")
+    parser.add_argument("arquivos", nargs="*",
+                        help="Datasets .json ou .jsonl (Padrão: todos os _final e _imagens das matérias)")
+    parser.add_argument("--limiar", type=float, default=LIMIAR_PADRAO,
+                        help=f"Jaccard mínimo entre os textos (Padrão: {LIMIAR_PADRAO})")
+    parser.add_argument("-o", "--saida", default=ARQUIVO_RELATORIO, help="Relatório dos grupos")
+    parser.add_argument("--mapa", default=None,
+                        help="Também grava {id_tec: id canônico} das questões repetidas neste arquivo")
+    args = parser.parse_args()
+
+    arquivos = args.arquivos
+    if not arquivos:
+        arquivos = sorted({c for p in PADROES_DATASETS for c in glob.glob(os.path.join(RAIZ_PROJETO, p))})
+    if not arquivos:
+        print("❌ Nenhum dataset encontrado.")
+        return
+
+    inicio = time.time()
+    todas = carregar_questoes(arquivos)
+    questoes = []
+    comparados = []
+    for item in todas:
+        comando, enunciado = item[3]
+        palavras = normalizar(enunciado)
+        if len(palavras) >= MIN_PALAVRAS:
+            do_enunciado = shingles(palavras)
+            questoes.append(item)
+            comparados.append((gabarito_da_questao(item[2]), do_enunciado | shingles(normalizar(comando)), do_enunciado))
+    assinaturas = [assinatura(c[1]) for c in comparados]
+    print(f"📚 {len(arquivos)} datasets | {len(todas)} questões | {len(questoes)} com texto comparável")
+
+    candidatos = pares_candidatos(assinaturas)
+    confirmados = [(a, b) for a, b in candidatos if confirmar(comparados[a], comparados[b], args.limiar)]
+    grupos = agrupar(len(questoes), confirmados)
+    print(f"🔗 Pares candidatos (LSH): {len(candidatos)} | "
+          f"Confirmados (mesmo gabarito, Jaccard >= {args.limiar}): {len(confirmados)}")
+
+    relatorio = []
+    mapa = {}
+    entre_materias = 0
+    em_cadeia = 0
+    for membros in grupos:
+        membros.sort(key=lambda i: _ordem_id(questoes[i][2]['id_tec']))
+        primeiro = membros[0]
+        canonico = questoes[primeiro][2]['id_tec']
+        materias = {questoes[i][0].split(os.sep)[0] for i in membros}
+        entre_materias += len(materias) > 1
+        similaridade = min(jaccard(comparados[primeiro][1], comparados[i][1]) for i in membros[1:])
+        no_mapa = {i for i in membros[1:] if confirmar(comparados[primeiro], comparados[i], args.limiar)}
+        em_cadeia += len(membros) - 1 - len(no_mapa)
+        relatorio.append({
+            "canonico": canonico,
+            "similaridade_min": round(similaridade, 3),
+            "materias": sorted(materias),
+            "questoes": [{
+                "id_tec": questoes[i][2]['id_tec'],
+                "arquivo": questoes[i][0],
+                "indice": questoes[i][1],
+                "gabarito": comparados[i][0],
+                "no_mapa": i == primeiro or i in no_mapa,
+                "comando": questoes[i][3][0][-200:],
+                "enunciado": questoes[i][3][1][:200],
+            } for i in membros],
+        })
+        for i in no_mapa:
+            id_tec = questoes[i][2]['id_tec']
+            if id_tec != canonico:
+                mapa[id_tec] = canonico
+    relatorio.sort(key=lambda g: (-len(g["questoes"]), _ordem_id(g["canonico"])))
+
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump({
+            "metadata": {
+                "data_geracao": datetime.now().isoformat(),
+                "arquivos": [os.path.relpath(os.path.abspath(a), RAIZ_PROJETO) for a in arquivos],
+                "limiar": args.limiar,
+                "total_questoes": len(questoes),
+                "total_grupos": len(relatorio),
+                "grupos_entre_materias": entre_materias,
+                "fora_do_mapa_em_cadeia": em_cadeia,
+            },
+            "grupos": relatorio,
+        }, f, indent=2, ensure_ascii=False)
+
+    print(f"🧩 Grupos: {len(relatorio)} ({entre_materias} entre matérias) | "
+          f"Questões repetidas com outro id: {len(mapa)}")
+    if em_cadeia:
+        print(f"⛓️  Fora do mapa (ligadas só em cadeia, abaixo do limiar contra o canônico): {em_cadeia}")
+    print(f"⏱️  {time.time() - inicio:.1f}s")
+    print(f"💾 Relatório: {args.saida}")
+    if args.mapa:
+        with open(args.mapa, 'w', encoding='utf-8') as f:
+            json.dump(mapa, f, indent=2, ensure_ascii=False, sort_keys=True)
+        print(f"💾 Mapa canônico: {args.mapa}")
+
+if __name__ == "__main__":
+    main()
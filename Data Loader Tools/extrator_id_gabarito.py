@@ -1,170 +1,227 @@
-import pdfplumber
+"""
+Extrai (id_tec, gabarito) de todos os PDFs de uma pasta para gabaritos_<nome>.json.
+
+Leitura em streaming: as páginas chegam uma a uma e cada bloco de questão (o
+texto entre uma URL tecconcursos.com.br/questoes/ e a próxima) é fechado,
+classificado e gravado assim que a próxima URL aparece. Em memória ficam só o
+bloco atual e os IDs já vistos, qualquer que seja a quantidade de PDFs.
+
+A estatística (Certo/Errado/Anulada/outros) sai da mesma passada, com ou sem
+--debug (que só não grava o arquivo).
+
+Uso:
+    python extrator_id_gabarito.py "../Informática/fonts"
+    python extrator_id_gabarito.py "../Informática/fonts" "../Ciência Política/fonts" -w 2
+    python extrator_id_gabarito.py "../Informática/fonts" --formato jsonl
+"""
 import re
-import json
 import os
 import glob
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from motor_extracao import iterar_textos_paginas, BACKENDS, BACKEND_PADRAO
+from registros_json import EscritorRegistros, caminho_no_formato, FORMATOS, FORMATO_PADRAO
 
 # ==============================================================================
-# LÓGICA DE EXTRAÇÃO (Robustez Aumentada)
+# PADRÕES
 # ==============================================================================
-def processar_texto_bruto(texto_completo):
-    questoes_extraidas = []
-    ids_vistos = set()
-    
-    # Divide nos links das questões
-    blocos = re.split(r'www\.tecconcursos\.com\.br/questoes/', texto_completo)
-    
-    for i, bloco in enumerate(blocos[1:]):
+REGEX_URL = re.compile(r'www\.tecconcursos\.com\.br/questoes/')
+REGEX_ID = re.compile(r'^(\d+)')
+# Procura a palavra Gabarito seguida de qualquer palavra (Certo, Errado, Anulada, X...)
+REGEX_GABARITO = re.compile(r'Gabarito:\s*([a-zA-Zçã]+)', re.IGNORECASE)
+
+# ==============================================================================
+# LEITURA EM STREAMING
+# ==============================================================================
+def iterar_textos_pasta(arquivos_pdf, usar_cache=True, backend=BACKEND_PADRAO):
+    """Gera "\\n" + texto de cada página, PDF por PDF. Um PDF com erro é pulado."""
+    for caminho_pdf in arquivos_pdf:
+        print(f"📖 Lendo {os.path.basename(caminho_pdf)}...", end="", flush=True)
         try:
-            # 1. PEGAR O ID
-            match_id = re.match(r'^(\d+)', bloco)
-            if not match_id: continue
-            
-            id_tec = match_id.group(1)
-            
-            if id_tec in ids_vistos: continue
-
-            # 2. PEGAR O GABARITO (Mais flexível)
-            # Procura a palavra Gabarito seguida de qualquer palavra (Certo, Errado, Anulada, X...)
-            match_gab = re.search(r'Gabarito:\s*([a-zA-Zçã]+)', bloco, re.IGNORECASE)
-            
-            gabarito_final = "N/A" # Valor padrão se não encontrar
-
-            if match_gab:
-                texto_capturado = match_gab.group(1).title() # Ex: Certo, Errado, Anulada
-                
-                if texto_capturado in ['Certo', 'Errado']:
-                    gabarito_final = texto_capturado
-                elif 'Anula' in texto_capturado or 'Nula' in texto_capturado:
-                    gabarito_final = "Anulada"
-                else:
-                    gabarito_final = texto_capturado # Salva o que achou (ex: "X")
-            
-            # 3. SALVAR (Mesmo se for N/A ou Anulada, salvamos o ID)
-            questoes_extraidas.append({
-                "id_tec": id_tec,
-                "gabarito": gabarito_final
-            })
-            ids_vistos.add(id_tec)
-
-        except Exception:
-            pass
-
-    return questoes_extraidas
+            for texto_pagina in iterar_textos_paginas(caminho_pdf, usar_cache=usar_cache, backend=backend):
+                yield "\n" + texto_pagina
+            print(" OK")
+        except Exception as e:
+            print(f" ❌ Erro: {e}")
+
+def iterar_blocos(textos):
+    """
+    Gera o texto depois de cada URL até a próxima, os mesmos blocos de um
+    re.split da URL sobre o texto inteiro (sem o trecho antes da primeira).
+    Como cada página começa com "\\n", uma URL nunca fica partida entre dois
+    pedaços.
+    """
+    atual = None
+    for texto in textos:
+        partes = REGEX_URL.split(texto)
+        if atual is not None:
+            atual.append(partes[0])
+        for parte in partes[1:]:
+            if atual is not None:
+                yield "".join(atual)
+            atual = [parte]
+    if atual is not None:
+        yield "".join(atual)
 
 # ==============================================================================
-# LÓGICA DE DEBUG DETALHADA
+# LÓGICA DE EXTRAÇÃO (Robustez Aumentada)
 # ==============================================================================
-def diagnosticar_detalhado(texto_completo):
-    print("\n🕵️  DIAGNÓSTICO DETALHADO...")
-    
-    ids_encontrados = set()
-    qtd_padrao = 0        # Certo ou Errado
-    qtd_fora_padrao = 0   # Anulada, N/A, X, etc
-    
-    # Usa a mesma lógica de blocos para garantir consistência
-    blocos = re.split(r'www\.tecconcursos\.com\.br/questoes/', texto_completo)
-    
-    for bloco in blocos[1:]:
-        match_id = re.match(r'^(\d+)', bloco)
-        if not match_id: continue
-        
+def classificar_gabarito(bloco):
+    match_gab = REGEX_GABARITO.search(bloco)
+    if not match_gab:
+        return "N/A"  # Valor padrão se não encontrar
+
+    texto_capturado = match_gab.group(1).title()  # Ex: Certo, Errado, Anulada
+    if texto_capturado in ['Certo', 'Errado']:
+        return texto_capturado
+    if 'Anula' in texto_capturado or 'Nula' in texto_capturado:
+        return "Anulada"
+    return texto_capturado  # Salva o que achou (ex: "X")
+
+def iterar_questoes(blocos):
+    """Gera {"id_tec", "gabarito"} de cada bloco; um ID repetido vale só na 1ª vez."""
+    ids_vistos = set()
+    for bloco in blocos:
+        match_id = REGEX_ID.match(bloco)
+        if not match_id:
+            continue
         id_tec = match_id.group(1)
-        if id_tec in ids_encontrados: continue
-        ids_encontrados.add(id_tec)
-        
-        # Análise do Gabarito
-        match_gab = re.search(r'Gabarito:\s*([a-zA-Zçã]+)', bloco, re.IGNORECASE)
-        
-        eh_padrao = False
-        if match_gab:
-            resp = match_gab.group(1).title()
-            if resp in ['Certo', 'Errado']:
-                eh_padrao = True
-        
-        if eh_padrao:
-            qtd_padrao += 1
+        if id_tec in ids_vistos:
+            continue
+        ids_vistos.add(id_tec)
+        # Mesmo se for N/A ou Anulada, salvamos o ID
+        yield {"id_tec": id_tec, "gabarito": classificar_gabarito(bloco)}
+
+# ==============================================================================
+# SAÍDA
+# ==============================================================================
+def nome_arquivo_saida(pasta_pdfs, nome=None, formato_arquivo=FORMATO_PADRAO):
+    return caminho_no_formato(_nome_arquivo_saida(pasta_pdfs, nome), formato_arquivo)
+
+def _nome_arquivo_saida(pasta_pdfs, nome=None):
+    if nome:
+        return f"gabaritos_{nome}.json"
+    try:
+        caminho_abs = os.path.abspath(pasta_pdfs)
+        if os.path.basename(caminho_abs).lower() == 'fonts':
+            nome_base = os.path.basename(os.path.dirname(caminho_abs))
         else:
-            qtd_fora_padrao += 1
+            nome_base = os.path.basename(caminho_abs)
+        nome_limpo = nome_base.replace(" ", "").lower()
+        return f"gabaritos_{nome_limpo}.json"
+    except Exception:
+        return "gabaritos_extraidos.json"
 
-    print(f"   ------------------------------------------------")
-    print(f"   Total de IDs únicos encontrados:      {len(ids_encontrados)}")
-    print(f"   Total de gabaritos 'Certo ou Errado': {qtd_padrao}")
-    print(f"   Total de gabaritos fora do padrão:    {qtd_fora_padrao}")
-    print(f"   ------------------------------------------------")
-    
-    return len(ids_encontrados)
+def gravar_questoes(questoes, arquivo_saida, estatistica):
+    """
+    Grava item a item (lista JSON ou JSON Lines, pela extensão), contando os
+    gabaritos em estatistica. Escreve num .tmp e troca no final.
+    """
+    with EscritorRegistros(arquivo_saida) as escritor:
+        for q in questoes:
+            contar(estatistica, q)
+            escritor.escrever(q)
 
 # ==============================================================================
-# MAIN
+# ESTATÍSTICA
 # ==============================================================================
-def main():
-    parser = argparse.ArgumentParser(description="Extrai IDs e Gabaritos de PDFs.")
-    parser.add_argument("pasta_alvo", help="Caminho da pasta com PDFs")
-    parser.add_argument("-n", "--nome", help="Nome do arquivo de saída", default=None)
-    parser.add_argument("-d", "--debug", help="Apenas exibe contagem estatística", action="store_true")
-    
-    args = parser.parse_args()
-    pasta_pdfs = args.pasta_alvo
+def nova_estatistica():
+    return {"total": 0, "Certo": 0, "Errado": 0, "Anulada": 0, "outros": 0}
 
-    if not os.path.exists(pasta_pdfs):
-        print(f"❌ Erro: Caminho '{pasta_pdfs}' não encontrado.")
-        return
+def contar(estatistica, q):
+    estatistica["total"] += 1
+    chave = q["gabarito"] if q["gabarito"] in ("Certo", "Errado", "Anulada") else "outros"
+    estatistica[chave] += 1
+
+def imprimir_estatistica(estatistica, debug=False):
+    fora_padrao = estatistica["total"] - estatistica["Certo"] - estatistica["Errado"]
+    if debug:
+        print("\n🕵️  DIAGNÓSTICO DETALHADO...")
+        print(f"   ------------------------------------------------")
+        print(f"   Total de IDs únicos encontrados:      {estatistica['total']}")
+        print(f"   Total de gabaritos 'Certo ou Errado': {estatistica['Certo'] + estatistica['Errado']}")
+        print(f"   Total de gabaritos fora do padrão:    {fora_padrao}")
+        print(f"   ------------------------------------------------")
+    else:
+        print("-" * 50)
+        print(f"📊 RELATÓRIO FINAL:")
+        print(f"   Total de Questões Salvas: {estatistica['total']}")
+        # Pequena verificação interna
+        print(f"   (Incluindo {fora_padrao} questões anuladas ou sem gabarito)")
+    print(f"   Certo: {estatistica['Certo']} | Errado: {estatistica['Errado']} | "
+          f"Anulada: {estatistica['Anulada']} | Outros/N/A: {estatistica['outros']}")
 
+# ==============================================================================
+# PASTA
+# ==============================================================================
+def processar_pasta(pasta_pdfs, nome=None, debug=False, usar_cache=True, backend=BACKEND_PADRAO,
+                    formato_arquivo=FORMATO_PADRAO):
+    """
+    Lê os PDFs da pasta numa passada só. Retorna (estatistica, arquivo_saida),
+    com arquivo_saida None no modo debug; (None, None) quando não há PDFs.
+    """
     print(f"📂 Lendo pasta: {pasta_pdfs}")
     arquivos_pdf = glob.glob(os.path.join(pasta_pdfs, "*.pdf"))
-    
     if not arquivos_pdf:
         print("❌ Nenhum PDF encontrado.")
-        return
+        return None, None
 
-    texto_total_acumulado = ""
+    estatistica = nova_estatistica()
+    questoes = iterar_questoes(iterar_blocos(iterar_textos_pasta(arquivos_pdf, usar_cache, backend)))
+    if debug:
+        for q in questoes:
+            contar(estatistica, q)
+        return estatistica, None
 
-    # 1. Leitura de Todos os PDFs
-    for caminho_pdf in arquivos_pdf:
-        print(f"📖 Lendo {os.path.basename(caminho_pdf)}...", end="", flush=True)
-        try:
-            with pdfplumber.open(caminho_pdf) as pdf:
-                for pagina in pdf.pages:
-                    texto_total_acumulado += "\n" + (pagina.extract_text() or "")
-            print(" OK")
-        except Exception as e:
-            print(f" ❌ Erro: {e}")
+    arquivo_saida = nome_arquivo_saida(pasta_pdfs, nome, formato_arquivo)
+    gravar_questoes(questoes, arquivo_saida, estatistica)
+    return estatistica, arquivo_saida
 
-    # 2. Decisão: Debug ou Extração Real
-    if args.debug:
-        diagnosticar_detalhado(texto_total_acumulado)
-    else:
-        # Extração Real (Agora salvando tudo)
-        dados = processar_texto_bruto(texto_total_acumulado)
-        
-        # Definição do nome do arquivo
-        if args.nome:
-            arquivo_saida = f"gabaritos_{args.nome}.json"
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Extrai IDs e Gabaritos de PDFs.")
+    parser.add_argument("pastas_alvo", nargs="+", help="Caminho da(s) pasta(s) com PDFs")
+    parser.add_argument("-n", "--nome", help="Nome do arquivo de saída (só com uma pasta)", default=None)
+    parser.add_argument("-d", "--debug", help="Apenas exibe contagem estatística", action="store_true")
+    parser.add_argument("-w", "--workers", help="Pastas processadas em paralelo (Padrão: 1)", type=int, default=1)
+    parser.add_argument("--no-cache", help="Ignora o cache de páginas e relê os PDFs", action="store_true")
+    parser.add_argument("--backend", help="Leitor de PDF (Padrão: pdfplumber)", choices=sorted(BACKENDS), default=BACKEND_PADRAO)
+    parser.add_argument("--formato", help="Lista JSON ou JSON Lines (Padrão: json)", choices=FORMATOS, default=FORMATO_PADRAO)
+
+    args = parser.parse_args()
+
+    pastas = []
+    for pasta_pdfs in args.pastas_alvo:
+        if not os.path.exists(pasta_pdfs):
+            print(f"❌ Erro: Caminho '{pasta_pdfs}' não encontrado.")
         else:
-            try:
-                caminho_abs = os.path.abspath(pasta_pdfs)
-                if os.path.basename(caminho_abs).lower() == 'fonts':
-                    nome_base = os.path.basename(os.path.dirname(caminho_abs))
-                else:
-                    nome_base = os.path.basename(caminho_abs)
-                nome_limpo = nome_base.replace(" ", "").lower()
-                arquivo_saida = f"gabaritos_{nome_limpo}.json"
-            except:
-                arquivo_saida = "gabaritos_extraidos.json"
+            pastas.append(pasta_pdfs)
+    if not pastas:
+        return
+    if args.nome and len(pastas) > 1:
+        print("❌ Erro: --nome só pode ser usado com uma pasta.")
+        return
 
-        print("-" * 50)
-        print(f"📊 RELATÓRIO FINAL:")
-        print(f"   Total de Questões Salvas: {len(dados)}")
-        
-        # Pequena verificação interna
-        anuladas = sum(1 for q in dados if q['gabarito'] not in ['Certo', 'Errado'])
-        print(f"   (Incluindo {anuladas} questões anuladas ou sem gabarito)")
-        
-        with open(arquivo_saida, 'w', encoding='utf-8') as f:
-            json.dump(dados, f, indent=4)
-        print(f"💾 Salvo em: {arquivo_saida}")
+    parametros = dict(nome=args.nome, debug=args.debug, usar_cache=not args.no_cache, backend=args.backend,
+                      formato_arquivo=args.formato)
+    if args.workers > 1 and len(pastas) > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futuros = [executor.submit(processar_pasta, pasta, **parametros) for pasta in pastas]
+            resultados = [f.result() for f in futuros]
+    else:
+        resultados = [processar_pasta(pasta, **parametros) for pasta in pastas]
+
+    for pasta_pdfs, (estatistica, arquivo_saida) in zip(pastas, resultados):
+        if estatistica is None:
+            continue
+        if len(pastas) > 1:
+            print(f"\n=== {pasta_pdfs} ===")
+        imprimir_estatistica(estatistica, args.debug)
+        if arquivo_saida:
+            print(f"💾 Salvo em: {arquivo_saida}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,408 @@
+"""
+Extrator único de todas as matérias, dirigido pelos perfis em
+perfis_materias.json.
+
+Os extratores de cada matéria só diferiam em dados: padrões dos PDFs, matéria,
+banca padrão, regex de gabarito, gatilhos do segmentador, limite do fallback
+e arquivos de saída. Esses dados agora vivem no perfil; o código é um só.
+
+Formatos de saída (campo "formato", com "saida" na ordem das listas que
+processar_pdf devolve):
+    simples   só Certo/Errado                       [final]
+    anuladas  Certo/Errado + o resto                [final, anuladas]
+    imagens   texto + com imagem + o resto          [final, imagens, anuladas]
+              (imagens reais do PDF, textos associados compactados)
+    mapa      só IDs e metadados, sem separação     [mapa]
+
+Os padrões (gabaritos e gatilhos) ficam no REGISTRO, compilados uma vez na
+importação e compartilhados entre as matérias; o da URL é o do motor, usado
+também pelo imagens_pdf. Uma execução com várias matérias reaproveita o
+processo, os regexes e o cache de páginas.
+
+Os PDFs de uma matéria dividem um IdsVistos: vale a primeira cópia que
+passa pelo filtro do perfil. A questão que já entrou no dataset por um
+caderno é pulada nos seguintes antes da segmentação, e o resumo diz quantas
+cópias foram puladas e de onde. O extrator_paralelo e o --incremental chegam
+às mesmas cópias.
+
+Uso:
+    python extrator_materias.py                          # todas as matérias
+    python extrator_materias.py -m "Informática" -m "Língua Inglesa"
+    python extrator_materias.py --listar
+    python extrator_materias.py --formato jsonl          # datasets em JSON Lines
+"""
+import os
+import re
+import json
+import glob
+import argparse
+
+from motor_extracao import (
+    iterar_questoes_pdf, abrir_executor, IdsVistos, REGEX_GABARITO_CE, REGEX_GABARITO_LIVRE,
+    BACKENDS, BACKEND_PADRAO,
+)
+from segmentador import separar_comando_enunciado, compilar_gatilhos, GATILHOS_PT, GATILHOS_EN
+from incremental import (
+    selecionar_alterados, mesclar_com_anteriores, salvar_manifesto, donos_anteriores, registrar_donos,
+)
+from textos_associados import compactar_datasets
+from imagens_pdf import mapear_imagens
+from registros_json import gravar_registros, caminho_no_formato, FORMATOS as FORMATOS_ARQUIVO, FORMATO_PADRAO
+from memoria import zerar_pico_rss, pico_rss_mb
+from memo_segmentacao import memo_segmentacao
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+ARQUIVO_PERFIS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perfis_materias.json")
+
+# Quantidade de arquivos em "saida" por formato
+FORMATOS = {"simples": 1, "anuladas": 2, "imagens": 3, "mapa": 1}
+GABARITOS_VALIDOS = ["Certo", "Errado"]
+
+# ==============================================================================
+# REGISTRO DE PADRÕES (compilados uma vez por processo)
+# ==============================================================================
+REGISTRO = {
+    "gabarito": {"ce": REGEX_GABARITO_CE, "livre": REGEX_GABARITO_LIVRE},
+    "gatilhos": {"pt": GATILHOS_PT, "en": GATILHOS_EN},
+}
+for _gatilhos in REGISTRO["gatilhos"].values():
+    compilar_gatilhos(_gatilhos)
+
+# ==============================================================================
+# PERFIS
+# ==============================================================================
+def carregar_perfis(caminho=ARQUIVO_PERFIS):
+    """
+    Lê e valida os perfis. Retorna {materia: perfil}, com perfil["materia"]
+    preenchido. Um perfil inválido interrompe com ValueError (melhor falhar
+    antes de ler 70 PDFs).
+    """
+    with open(caminho, 'r', encoding='utf-8') as f:
+        perfis = json.load(f)
+
+    for materia, perfil in perfis.items():
+        perfil["materia"] = materia
+        formato = perfil.get("formato")
+        if formato not in FORMATOS:
+            raise ValueError(f"{materia}: formato '{formato}' desconhecido (use {', '.join(FORMATOS)})")
+        if len(perfil.get("saida", [])) != FORMATOS[formato]:
+            raise ValueError(f"{materia}: o formato '{formato}' grava {FORMATOS[formato]} arquivo(s) em 'saida'")
+        if perfil.get("gabarito") not in REGISTRO["gabarito"]:
+            raise ValueError(f"{materia}: gabarito '{perfil.get('gabarito')}' fora do registro")
+        if formato != "mapa" and perfil.get("gatilhos") not in REGISTRO["gatilhos"]:
+            raise ValueError(f"{materia}: gatilhos '{perfil.get('gatilhos')}' fora do registro")
+        perfil.setdefault("banca_padrao", "")
+        perfil.setdefault("limite_fallback", 600)
+    return perfis
+
+def selecionar_perfis(perfis, materias=None):
+    """Perfis das matérias pedidas (todas se materias for vazio), na ordem do arquivo."""
+    if not materias:
+        return list(perfis.values())
+    desconhecidas = [m for m in materias if m not in perfis]
+    if desconhecidas:
+        print(f"⚠️  Matérias sem perfil: {', '.join(desconhecidas)}")
+    return [perfil for materia, perfil in perfis.items() if materia in materias]
+
+def pasta_materia(perfil):
+    return os.path.join(RAIZ_PROJETO, perfil["materia"])
+
+def pasta_saida(perfil):
+    return os.path.join(pasta_materia(perfil), "datasets")
+
+def listar_pdfs(perfil):
+    """PDFs de <matéria>/fonts, padrão por padrão, na ordem dos padrões do perfil."""
+    pasta_fonts = os.path.join(pasta_materia(perfil), "fonts")
+    arquivos = []
+    for padrao in perfil["padroes_pdf"]:
+        arquivos += glob.glob(os.path.join(pasta_fonts, padrao))
+    return arquivos
+
+# ==============================================================================
+# INTELIGÊNCIA DE TEXTO
+# ==============================================================================
+def limpar_texto(texto):
+    if not texto: return ""
+    return re.sub(r'\n{3,}', '\n\n', texto).strip()
+
+# ==============================================================================
+# MOTOR DE EXTRAÇÃO
+# ==============================================================================
+def parametros_leitura(perfil):
+    """materia, banca_padrao e regex_gabarito do perfil, para o extrair_questoes/iterar_questoes_pdf."""
+    return {"materia": perfil["materia"], "banca_padrao": perfil["banca_padrao"],
+            "regex_gabarito": REGISTRO["gabarito"][perfil["gabarito"]]}
+
+def separar_questoes(perfil, questoes_pdf, imagens=None, usar_cache=True):
+    """Comando/enunciado de cada (questao, texto) com os gatilhos do perfil (e as imagens, no formato imagens)."""
+    gatilhos = REGISTRO["gatilhos"][perfil["gatilhos"]]
+    # Texto já separado antes (mesmos gatilhos e motor) sai do memo
+    memo = memo_segmentacao(separar_comando_enunciado, gatilhos, perfil["limite_fallback"], usar=usar_cache)
+    questoes = []
+    for q, full in questoes_pdf:
+        cmd, enun = memo.calcular(full)
+        q['comando'] = limpar_texto(cmd)
+        q['enunciado'] = limpar_texto(enun)
+        if perfil["formato"] == "imagens":
+            # Imagens reais do PDF (objetos de imagem na região da questão)
+            q['imagens'] = imagens.get(q['id_tec'], [])
+            q['maybe_image'] = bool(q['imagens'])
+        questoes.append(q)
+    memo.gravar()
+    return questoes
+
+def filtrar_por_perfil(perfil, questoes):
+    """Separa as questões nas listas de perfil["saida"] (lista única nos formatos de um arquivo)."""
+    formato = perfil["formato"]
+    validas = []
+    com_imagem = []
+    anuladas = []
+    for q in questoes:
+        if q.get('gabarito', '').capitalize() not in GABARITOS_VALIDOS:
+            anuladas.append(q)
+        elif q.get('maybe_image'):
+            com_imagem.append(q)
+        else:
+            validas.append(q)
+
+    if formato == "simples":
+        print(f"      🗑️ Excluídas (Gabarito inválido/anulada): {len(anuladas)}")
+        return validas
+    if formato == "anuladas":
+        print(f"      ✅ Válidas: {len(validas)} | 🗑️  Anuladas: {len(anuladas)}")
+        return validas, anuladas
+    print(f"      ✅ Texto: {len(validas)} | 🖼️  Imagens: {len(com_imagem)} | 🗑️  Anuladas: {len(anuladas)}")
+    return validas, com_imagem, anuladas
+
+def processar_pdf(perfil, caminho_pdf, usar_cache=True, backend=BACKEND_PADRAO, executor=None, vistos=None):
+    """
+    Extrai um PDF segundo o perfil. Retorna o que o consolidar() espera: uma
+    lista (simples/mapa) ou uma tupla de listas na ordem de perfil["saida"].
+    Com vistos (IdsVistos), as questões que outro PDF já deu ao dataset são
+    puladas na leitura, e as que saem do filtro passam a ser deste PDF.
+    """
+    formato = perfil["formato"]
+    nome_pdf = os.path.basename(caminho_pdf)
+    print(f"   📄 Processando: {nome_pdf}...")
+    zerar_pico_rss()
+
+    try:
+        imagens = mapear_imagens(caminho_pdf) if formato == "imagens" else {}
+        questoes_pdf = iterar_questoes_pdf(caminho_pdf, **parametros_leitura(perfil),
+                                           usar_cache=usar_cache, backend=backend, executor=executor,
+                                           pular=vistos.pular_em(nome_pdf) if vistos else None)
+        if formato == "mapa":
+            resultado = _mapear(questoes_pdf)
+            imprimir_pico()
+        else:
+            questoes = separar_questoes(perfil, questoes_pdf, imagens, usar_cache)
+            imprimir_pico()
+            resultado = filtrar_por_perfil(perfil, questoes)
+    except Exception as e:
+        print(f"      ❌ Erro ao ler PDF: {e}")
+        if vistos:
+            vistos.descartar(nome_pdf)
+        return tuple([] for _ in perfil["saida"]) if FORMATOS[formato] > 1 else []
+
+    # Só o que ficou depois do filtro conta como primeira cópia
+    return pular_repetidas(resultado, nome_pdf, vistos) if vistos else resultado
+
+def imprimir_pico():
+    # Com -w, as fatias são lidas em outros processos: aqui conta só este
+    print(f"      🧠 Pico de memória: {pico_rss_mb():.0f} MB")
+
+def _mapear(questoes_pdf):
+    # Ignoramos todo o resto do texto! Só entra quem tem gabarito válido
+    mapa_questoes = []
+    for q, _ in questoes_pdf:
+        if not q['gabarito']:
+            continue
+        mapa_questoes.append({
+            "id_tec": q['id_tec'],
+            "url_direta": f"https://{q['link']}",
+            "banca_orgao": q['banca_orgao'],
+            "materia": q['materia'],
+            "assunto": q['assunto'],
+            "gabarito": q['gabarito'].capitalize()
+        })
+    return mapa_questoes
+
+# ==============================================================================
+# CONSOLIDAÇÃO
+# ==============================================================================
+def pular_repetidas(resultado, nome_pdf, vistos):
+    """
+    O filtro do IdsVistos sobre um resultado de processar_pdf já filtrado
+    pelo perfil: as cópias de IDs já vistos saem e os demais passam a ser de
+    nome_pdf. O processar_pdf o aplica no fim de cada PDF; o
+    extrator_paralelo, na ordem dos arquivos, depois que todos voltam.
+    """
+    if isinstance(resultado, tuple):
+        return tuple(pular_repetidas(lista, nome_pdf, vistos) for lista in resultado)
+    return [q for q in resultado if not vistos.pular(q['id_tec'], nome_pdf)]
+
+def imprimir_repetidas(vistos):
+    total = vistos.total_puladas()
+    if not total:
+        return
+    print(f"♻️  Repetidas puladas (já capturadas antes): {total}")
+    for (pdf, origem), quantidade in sorted(vistos.puladas.items(), key=lambda x: (-x[1], x[0])):
+        print(f"   {pdf}: {quantidade} já lidas em {origem}")
+
+def deduplicar(lista, ordenar=True):
+    """Uma questão por id_tec (a última vence), ordenada pelo ID numérico."""
+    unicas = {q['id_tec']: q for q in lista if q.get('id_tec')}
+    final = list(unicas.values())
+    if ordenar:
+        final.sort(key=lambda x: int(x['id_tec']) if x['id_tec'].isdigit() else 0)
+    return final
+
+def _gravar(lista, pasta, nome, formato_arquivo):
+    caminho = caminho_no_formato(os.path.join(pasta, nome), formato_arquivo)
+    gravar_registros(lista, caminho)
+    return caminho
+
+def juntar(perfil, resultados):
+    """
+    Junta os resultados de processar_pdf (um por PDF, na ordem dos arquivos)
+    e deduplica por id_tec: uma lista por arquivo de perfil["saida"].
+    """
+    listas = [[] for _ in perfil["saida"]]
+    for resultado in resultados:
+        for todas, lista in zip(listas, resultado if isinstance(resultado, tuple) else (resultado,)):
+            todas.extend(lista)
+
+    # As anuladas do formato "anuladas" sempre saíram na ordem de leitura
+    return [deduplicar(lista, ordenar=not (perfil["formato"] == "anuladas" and i == 1))
+            for i, lista in enumerate(listas)]
+
+def gravar_saidas(perfil, finais, pasta_saida="", formato_arquivo=FORMATO_PADRAO):
+    """
+    Grava as listas do juntar() nos arquivos de perfil["saida"] em pasta_saida
+    (.json ou, com formato_arquivo="jsonl", .jsonl). Os arquivos extras
+    (imagens/anuladas) só são gravados se tiverem questões.
+    """
+    saida = perfil["saida"]
+    if perfil["formato"] == "imagens":
+        # Texto de leitura repetido no bloco vira referência (textos_associados.json)
+        compactar_datasets(finais, pasta_saida)
+
+    print(f"💾 Salvo em: {_gravar(finais[0], pasta_saida, saida[0], formato_arquivo)}")
+    for lista, nome in zip(finais[1:], saida[1:]):
+        if lista:
+            print(f"💾 Salvo em: {_gravar(lista, pasta_saida, nome, formato_arquivo)}")
+
+def consolidar(perfil, resultados, pasta_saida="", formato_arquivo=FORMATO_PADRAO):
+    """Junta, deduplica e grava os resultados de processar_pdf (juntar + gravar_saidas)."""
+    formato = perfil["formato"]
+    finais = juntar(perfil, resultados)
+
+    print("-" * 50)
+    if formato == "simples":
+        print(f"Total Válido (Certo/Errado): {len(finais[0])}")
+    elif formato == "anuladas":
+        print(f"TOTAL VÁLIDO: {len(finais[0])}")
+        print(f"TOTAL ANULADO: {len(finais[1])}")
+    elif formato == "imagens":
+        print(f"✅ TEXTO PURO (P/ DB): {len(finais[0])}")
+        print(f"🖼️  COM IMAGEM (Revisão): {len(finais[1])}")
+        print(f"🗑️  ANULADAS: {len(finais[2])}")
+    else:
+        print(f"📋 Total de IDs Válidos (Certo/Errado): {len(finais[0])}")
+    print("-" * 50)
+
+    gravar_saidas(perfil, finais, pasta_saida, formato_arquivo)
+
+# ==============================================================================
+# EXECUÇÃO
+# ==============================================================================
+def extrair_materia(perfil, usar_cache=True, backend=BACKEND_PADRAO, executor=None, incremental=False,
+                    formato_arquivo=FORMATO_PADRAO):
+    """Extrai e consolida uma matéria. Retorna quantos PDFs foram lidos."""
+    print(f"\n--- {perfil['titulo']} ---")
+    arquivos = listar_pdfs(perfil)
+    if not arquivos:
+        print(f"Nenhum PDF encontrado com padrão: {', '.join(perfil['padroes_pdf'])}")
+        return 0
+
+    destino = pasta_saida(perfil)
+    os.makedirs(destino, exist_ok=True)
+    todos = arquivos
+    if incremental:
+        arquivos, manifesto = selecionar_alterados(todos, destino)
+        if not arquivos:
+            salvar_manifesto(manifesto, destino)
+            print("✅ Nenhum PDF novo ou alterado.")
+            return 0
+
+    vistos = IdsVistos()
+    resultados = []
+    # No incremental, os PDFs não alterados entram na ordem com os IDs que já
+    # deram ao dataset: a primeira cópia é a mesma da extração completa
+    plano = donos_anteriores(todos, arquivos, manifesto) if incremental else [(arq, None) for arq in todos]
+    for arq, ids in plano:
+        if ids is None:
+            resultados.append(processar_pdf(perfil, arq, usar_cache=usar_cache, backend=backend,
+                                            executor=executor, vistos=vistos))
+        else:
+            vistos.registrar(ids, os.path.basename(arq))
+    imprimir_repetidas(vistos)
+
+    if incremental:
+        consolidar(perfil, mesclar_com_anteriores(resultados, perfil["saida"], destino), destino, formato_arquivo)
+        salvar_manifesto(registrar_donos(manifesto, todos, vistos), destino)
+    else:
+        consolidar(perfil, resultados, destino, formato_arquivo)
+    return len(arquivos)
+
+def adicionar_argumentos(parser):
+    """Opções comuns a este extrator e aos atalhos de cada matéria."""
+    parser.add_argument("--no-cache", action="store_true", help="Ignora os caches (páginas e separação) e relê os PDFs")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=BACKEND_PADRAO,
+                        help="Leitor de PDF (Padrão: pdfplumber)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="Processos por PDF, cada um lendo uma fatia de páginas (Padrão: 1)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Só extrai PDFs novos/alterados e mescla no dataset existente")
+    parser.add_argument("--formato", choices=FORMATOS_ARQUIVO, default=FORMATO_PADRAO,
+                        help="Formato dos datasets: lista JSON ou JSON Lines (Padrão: json)")
+    parser.add_argument("--memoria-max", type=int, default=None, metavar="MB",
+                        help="Teto suave de memória (MB) para os processos do -w: passando dele, "
+                             "menos fatias rodam ao mesmo tempo")
+
+def executar(materias, args):
+    perfis = selecionar_perfis(carregar_perfis(), materias)
+    if not perfis:
+        print("❌ Nenhuma matéria para extrair.")
+        return
+    with abrir_executor(args.workers, args.memoria_max) as executor:
+        for perfil in perfis:
+            extrair_materia(perfil, usar_cache=not args.no_cache, backend=args.backend,
+                            executor=executor, incremental=args.incremental, formato_arquivo=args.formato)
+
+def main_materia(materia):
+    """main() dos extratores de cada matéria (tools/extractor_*.py)."""
+    parser = argparse.ArgumentParser(description=f"Extrator de {materia} (perfil em perfis_materias.json)")
+    adicionar_argumentos(parser)
+    executar([materia], parser.parse_args())
+
+def main():
+    parser = argparse.ArgumentParser(description="Extrai as matérias de perfis_materias.json num processo só.")
+    parser.add_argument("-m", "--materia", action="append", default=None,
+                        help="Restringe a uma matéria (nome da pasta). Pode repetir.")
+    parser.add_argument("--listar", action="store_true", help="Lista os perfis e sai")
+    adicionar_argumentos(parser)
+    args = parser.parse_args()
+
+    if args.listar:
+        for materia, perfil in carregar_perfis().items():
+            print(f"{materia}: {perfil['formato']} | {', '.join(perfil['padroes_pdf'])} -> {', '.join(perfil['saida'])}")
+        return
+
+    executar(args.materia, args)
+
+if __name__ == "__main__":
+    main()
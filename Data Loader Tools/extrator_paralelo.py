@@ -0,0 +1,130 @@
+import os
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from motor_extracao import BACKENDS, BACKEND_PADRAO, PAGINAS_POR_FATIA, IdsVistos
+from incremental import (
+    selecionar_alterados, mesclar_com_anteriores, salvar_manifesto, donos_anteriores, registrar_donos,
+)
+from registros_json import FORMATOS as FORMATOS_ARQUIVO, FORMATO_PADRAO
+from memoria import PoolComTeto
+from extrator_materias import (
+    carregar_perfis, selecionar_perfis, listar_pdfs, pasta_saida, processar_pdf, consolidar,
+    pular_repetidas, imprimir_repetidas,
+)
+
+# ==============================================================================
+# TRABALHO DE CADA PROCESSO
+# ==============================================================================
+def _processar(perfil, caminho_pdf, usar_cache, backend, executor=None):
+    # Com executor, roda numa thread do processo principal: as fatias de
+    # páginas vão para o pool e aqui ficam só a costura e a separação
+    return processar_pdf(perfil, caminho_pdf, usar_cache=usar_cache, backend=backend, executor=executor)
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Roda todos os extratores em paralelo (um PDF por tarefa).")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="Quantidade de processos (Padrão: número de núcleos)")
+    parser.add_argument("-m", "--materia", action="append", default=None,
+                        help="Restringe a uma matéria (nome da pasta). Pode repetir.")
+    parser.add_argument("--no-cache", action="store_true", help="Ignora os caches (páginas e separação) e relê os PDFs")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default=BACKEND_PADRAO,
+                        help="Leitor de PDF (Padrão: pdfplumber)")
+    parser.add_argument("--fatiar", action="store_true",
+                        help=f"Divide cada PDF em fatias de {PAGINAS_POR_FATIA} páginas, distribuídas entre os workers")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Só extrai PDFs novos/alterados e mescla nos datasets existentes")
+    parser.add_argument("--formato", choices=FORMATOS_ARQUIVO, default=FORMATO_PADRAO,
+                        help="Formato dos datasets: lista JSON ou JSON Lines (Padrão: json)")
+    parser.add_argument("--memoria-max", type=int, default=None, metavar="MB",
+                        help="Teto suave de memória (MB): passando dele, menos PDFs/fatias rodam ao mesmo tempo")
+    args = parser.parse_args()
+
+    perfis = selecionar_perfis(carregar_perfis(), args.materia)
+    if not perfis:
+        print(f"❌ Nenhuma matéria conhecida em: {args.materia}")
+        return
+
+    print("--- EXTRATOR PARALELO (Todas as Matérias) ---")
+
+    # 1. Levantamento das tarefas
+    tarefas = []   # (materia, indice, perfil, pdf)
+    planos = {}    # materia -> (perfil, pasta_saida, arquivos, todos os PDFs da matéria)
+    manifestos = {}
+    for perfil in perfis:
+        pasta = perfil["materia"]
+        arquivos = listar_pdfs(perfil)
+        if not arquivos:
+            print(f"⚠️  {pasta}: nenhum PDF em fonts/")
+            continue
+
+        destino = pasta_saida(perfil)
+        todos = arquivos
+        if args.incremental:
+            arquivos, manifestos[pasta] = selecionar_alterados(todos, destino)
+            if not arquivos:
+                salvar_manifesto(manifestos[pasta], destino)
+                print(f"✅ {pasta}: nenhum PDF novo ou alterado")
+                continue
+
+        planos[pasta] = (perfil, destino, arquivos, todos)
+        for idx, arq in enumerate(arquivos):
+            tarefas.append((pasta, idx, perfil, arq))
+
+    if not tarefas:
+        print("Nenhum PDF para extrair.")
+        return
+
+    # Os maiores primeiro: o tempo total tende ao do maior PDF, não à soma
+    tarefas.sort(key=lambda t: os.path.getsize(t[3]), reverse=True)
+    print(f"📦 {len(tarefas)} PDFs de {len(planos)} matérias | Workers: {args.workers} | Backend: {args.backend}"
+          + (f" | Fatias de {PAGINAS_POR_FATIA} páginas" if args.fatiar else "")
+          + (f" | Teto de memória: {args.memoria_max} MB" if args.memoria_max else ""))
+
+    # 2. Extração em paralelo
+    inicio = time.time()
+    resultados = {pasta: [None] * len(plano[2]) for pasta, plano in planos.items()}
+    if args.memoria_max:
+        pool = PoolComTeto(args.workers, args.memoria_max)
+    else:
+        pool = ProcessPoolExecutor(max_workers=args.workers)
+    n = len(tarefas)
+    perfis_pdfs = ([t[2] for t in tarefas], [t[3] for t in tarefas], [not args.no_cache] * n, [args.backend] * n)
+    with pool as executor, ThreadPoolExecutor(max_workers=n) as costura:
+        if args.fatiar:
+            obtidos = costura.map(_processar, *perfis_pdfs, [executor] * n)
+        else:
+            obtidos = executor.map(_processar, *perfis_pdfs)
+        for (pasta, idx, _, _), resultado in zip(tarefas, obtidos):
+            resultados[pasta][idx] = resultado
+
+    print(f"⏱️  Extração concluída em {time.time() - inicio:.1f}s")
+
+    # 3. Dedup/filtro final de cada matéria, na ordem original dos arquivos
+    #    (no incremental, os PDFs não alterados entram com os IDs que já deram)
+    for pasta, (perfil, destino, arquivos, todos) in planos.items():
+        print(f"\n=== {pasta} ===")
+        os.makedirs(destino, exist_ok=True)
+        vistos = IdsVistos()
+        extraidos = iter(resultados[pasta])
+        plano = donos_anteriores(todos, arquivos, manifestos[pasta]) if args.incremental else [(a, None) for a in todos]
+        resultados[pasta] = []
+        for arq, ids in plano:
+            if ids is None:
+                resultados[pasta].append(pular_repetidas(next(extraidos), os.path.basename(arq), vistos))
+            else:
+                vistos.registrar(ids, os.path.basename(arq))
+        imprimir_repetidas(vistos)
+        if args.incremental:
+            mesclados = mesclar_com_anteriores(resultados[pasta], perfil["saida"], destino)
+            consolidar(perfil, mesclados, destino, args.formato)
+            salvar_manifesto(registrar_donos(manifestos[pasta], todos, vistos), destino)
+        else:
+            consolidar(perfil, resultados[pasta], destino, args.formato)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Gera um corpus sintético de PDFs no layout do TEC Concursos, para testar
+extratores, analisadores e loaders em 10x-100x o volume real sem dados reais.
+
+Cada questão sai como nos cadernos exportados:
+
+    www.tecconcursos.com.br/questoes/<id>
+    CEBRASPE (CESPE) - <cargo>/<órgão>/<ano>
+    <Matéria> - <Assunto>
+    N) <comando>
+    <enunciado>
+    Certo
+    Errado
+    Gabarito: Certo|Errado|Anulada
+
+com taxas controláveis de textos longos ("N) Texto CB..A1" + passagem),
+IDs repetidos (a mesma questão de novo, em qualquer PDF do corpus) e anuladas.
+O conteúdo de cada questão é derivado de (seed, id), então uma duplicada é
+cópia exata da original e o corpus inteiro se repete com a mesma --seed.
+
+O PDF é escrito direto (fonte Courier, WinAnsiEncoding, streams com zlib),
+sem dependências, página a página: a memória não cresce com o tamanho do
+corpus além do conjunto de IDs.
+
+Na pasta de saída ficam também:
+    gabaritos_sintetico.json   (id_tec, gabarito) na ordem da 1ª ocorrência,
+                               o formato do extrator_id_gabarito.py
+    corpus_sintetico.json      parâmetros e contagens por PDF
+
+Hoje são ~71 PDFs com ~150 questões cada; os padrões reproduzem isso.
+
+Uso:
+    python gerador_corpus.py -o /tmp/corpus                      # ~1x
+    python gerador_corpus.py -o /tmp/corpus --pdfs 710           # ~10x
+    python gerador_corpus.py -o /tmp/corpus --pdfs 20 --questoes 1500 --taxa-duplicadas 0.05
+"""
+import os
+import json
+import zlib
+import random
+import argparse
+import textwrap
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+PDFS_PADRAO = 71
+QUESTOES_POR_PDF_PADRAO = 150
+TAXA_LONGOS_PADRAO = 0.10
+TAXA_DUPLICADAS_PADRAO = 0.02
+TAXA_ANULADAS_PADRAO = 0.03
+
+# Página A4 em Courier 9pt: largura fixa (0.6 em), então a quebra por
+# caracteres nunca passa da margem.
+LARGURA_PAGINA = 595
+ALTURA_PAGINA = 842
+MARGEM = 40
+TAMANHO_FONTE = 9
+ENTRELINHA = 11
+COLUNAS = 90
+LINHAS_POR_PAGINA = (ALTURA_PAGINA - 2 * MARGEM) // ENTRELINHA
+
+FAIXA_IDS = (1_000_000, 4_000_000)
+
+BANCAS = ["CEBRASPE (CESPE)", "CEBRASPE (CESPE)", "CEBRASPE (CESPE)", "FGV", "FCC"]
+CARGOS = ["AJ", "TJ", "Analista Legislativo", "Consultor Legislativo", "Técnico Legislativo",
+          "Auditor", "ATI", "Esp GT", "APC", "Tec Amb"]
+ORGAOS = ["TSE", "TCU", "TCE AC", "TJ PA", "IBAMA", "TELEBRAS", "Câmara dos Deputados",
+          "Senado Federal", "STM", "FUNPRESP-EXE"]
+AREAS = ["", "", "Judiciária", "Apoio Especializado", "Gestão de Dados", "Jurídica", "Tecnologia da Informação"]
+ASSUNTOS = ["Princípios", "Organização", "Atos e Procedimentos", "Controle", "Responsabilidade",
+            "Agentes e Servidores", "Contratos", "Licitações", "Processo", "Conceitos Gerais",
+            "Competências", "Direitos e Garantias"]
+
+COMANDOS = [
+    "Julgue o item subsequente.",
+    "Julgue o item a seguir.",
+    "Julgue o próximo item.",
+    "Acerca do tema, julgue o item que se segue.",
+    "Com relação ao assunto, julgue o item seguinte.",
+    "Considerando a legislação vigente, julgue o item subsequente.",
+]
+
+PALAVRAS = (
+    "administração pública órgão entidade servidor ato processo controle princípio legalidade "
+    "eficiência moralidade publicidade interesse competência delegação avocação licitação contrato "
+    "prazo recurso decisão autoridade poder dever responsabilidade dano lei norma regulamento "
+    "constituição federal direito garantia fundamental cidadão estado união município função "
+    "cargo emprego concurso estabilidade remuneração sanção infração penalidade ação omissão "
+    "informação dados acesso proteção tratamento segurança gestão planejamento orçamento despesa "
+    "receita patrimônio bem serviço concessão permissão autorização fiscalização tribunal contas"
+).split()
+
+# ==============================================================================
+# TEXTO DAS QUESTÕES
+# ==============================================================================
+def _frase(rng, minimo=8, maximo=22):
+    palavras = [rng.choice(PALAVRAS) for _ in range(rng.randint(minimo, maximo))]
+    return (" ".join(palavras)).capitalize() + "."
+
+def _paragrafo(rng, frases_min=1, frases_max=4):
+    return " ".join(_frase(rng) for _ in range(rng.randint(frases_min, frases_max)))
+
+def _quebrar(texto):
+    return textwrap.wrap(texto, COLUNAS) or [""]
+
+def gerar_questao(seed, id_tec, numero, materia, taxas):
+    """
+    Linhas de uma questão e seu gabarito. Tudo, exceto o número, vem de
+    (seed, id_tec): a mesma questão repetida sai idêntica.
+
+    Retorna (linhas, gabarito, longo).
+    """
+    rng = random.Random(seed * 10_000_019 + id_tec)
+
+    banca = rng.choice(BANCAS)
+    cargo = f"{rng.choice(CARGOS)} ({rng.choice(ORGAOS)})"
+    orgao = rng.choice(ORGAOS)
+    area = rng.choice(AREAS)
+    partes = [cargo, orgao] + ([area] if area else []) + [str(rng.randint(2015, 2025))]
+    assunto = rng.choice(ASSUNTOS)
+
+    longo = rng.random() < taxas["longos"]
+    gabarito = "Anulada" if rng.random() < taxas["anuladas"] else rng.choice(["Certo", "Errado"])
+
+    linhas = [
+        f"www.tecconcursos.com.br/questoes/{id_tec}",
+        f"{banca} - {'/'.join(partes)}",
+        f"{materia} - {assunto}",
+    ]
+    if longo:
+        linhas.append(f"{numero}) Texto CB{rng.randint(1, 9)}A{rng.randint(1, 9)}")
+        for _ in range(rng.randint(4, 8)):
+            linhas.extend(_quebrar(_paragrafo(rng, 2, 5)))
+        linhas.extend(_quebrar(rng.choice(COMANDOS)))
+    else:
+        linhas.extend(_quebrar(f"{numero}) {rng.choice(COMANDOS)}"))
+    linhas.extend(_quebrar(_paragrafo(rng)))
+    linhas += ["Certo", "Errado", f"Gabarito: {gabarito}"]
+    return linhas, gabarito, longo
+
+# ==============================================================================
+# ESCRITOR DE PDF MÍNIMO
+# ==============================================================================
+def _literal(texto):
+    """String literal PDF em WinAnsiEncoding (cp1252)."""
+    dados = texto.encode("cp1252", errors="replace")
+    dados = dados.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+    return b"(" + dados + b")"
+
+class EscritorPDF:
+    """
+    Escreve um PDF página a página. Objetos fixos: 1 catálogo, 2 árvore de
+    páginas (gravada no fechamento, quando as páginas são conhecidas), 3 fonte.
+    """
+
+    def __init__(self, caminho):
+        self.arquivo = open(caminho, "wb")
+        self.offsets = {}
+        self.paginas = []
+        self.proximo = 4
+        self.arquivo.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._objeto(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        self._objeto(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>")
+
+    def _objeto(self, numero, corpo):
+        self.offsets[numero] = self.arquivo.tell()
+        self.arquivo.write(b"%d 0 obj\n" % numero + corpo + b"\nendobj\n")
+
+    def adicionar_pagina(self, linhas):
+        topo = ALTURA_PAGINA - MARGEM - TAMANHO_FONTE
+        partes = [b"BT /F1 %d Tf %d TL %d %d Td" % (TAMANHO_FONTE, ENTRELINHA, MARGEM, topo)]
+        for linha in linhas:
+            partes.append(_literal(linha) + b" Tj T*")
+        partes.append(b"ET")
+        conteudo = zlib.compress(b"\n".join(partes))
+
+        num_conteudo, num_pagina = self.proximo, self.proximo + 1
+        self.proximo += 2
+        self._objeto(num_conteudo, b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(conteudo)
+                     + conteudo + b"\nendstream")
+        self._objeto(num_pagina, b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+                     b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+                     % (LARGURA_PAGINA, ALTURA_PAGINA, num_conteudo))
+        self.paginas.append(num_pagina)
+
+    def fechar(self):
+        filhos = b" ".join(b"%d 0 R" % n for n in self.paginas)
+        self._objeto(2, b"<< /Type /Pages /Kids [" + filhos + b"] /Count %d >>" % len(self.paginas))
+
+        inicio_xref = self.arquivo.tell()
+        total = self.proximo
+        self.arquivo.write(b"xref\n0 %d\n0000000000 65535 f \n" % total)
+        for numero in range(1, total):
+            self.arquivo.write(b"%010d 00000 n \n" % self.offsets[numero])
+        self.arquivo.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                           % (total, inicio_xref))
+        self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+# ==============================================================================
+# CORPUS
+# ==============================================================================
+def gerar_pdf(caminho_pdf, estado, materia, qtd_questoes, taxas, seed):
+    """
+    Grava um PDF com qtd_questoes questões. estado guarda o que atravessa os
+    PDFs: rng do corpus, IDs já emitidos, numeração e o arquivo de gabaritos.
+    """
+    rng = estado["rng"]
+    contagem = {"arquivo": os.path.basename(caminho_pdf), "paginas": 0, "questoes": 0,
+                "duplicadas": 0, "anuladas": 0, "longos": 0}
+
+    with EscritorPDF(caminho_pdf) as pdf:
+        pagina = [
+            f"{materia} para Câmara dos Deputados - 2026",
+            f"https://www.tecconcursos.com.br/s/{''.join(rng.choices('abcdefghkmnpqrstuvwxyzQWXY0123456789', k=6))}",
+            "Ordenação: Por Matéria e Assunto",
+        ]
+        for _ in range(qtd_questoes):
+            ids = estado["ids"]
+            if ids and rng.random() < taxas["duplicadas"]:
+                id_tec = rng.choice(ids)
+                duplicada = True
+            else:
+                id_tec = rng.randint(*FAIXA_IDS)
+                while id_tec in estado["vistos"]:
+                    id_tec = rng.randint(*FAIXA_IDS)
+                estado["vistos"].add(id_tec)
+                ids.append(id_tec)
+                duplicada = False
+
+            estado["numero"] += 1
+            linhas, gabarito, longo = gerar_questao(seed, id_tec, estado["numero"], materia, taxas)
+
+            contagem["questoes"] += 1
+            contagem["duplicadas"] += duplicada
+            contagem["anuladas"] += gabarito == "Anulada"
+            contagem["longos"] += longo
+            if not duplicada:
+                estado["gravar_gabarito"](str(id_tec), gabarito)
+
+            for linha in linhas:
+                if len(pagina) == LINHAS_POR_PAGINA:
+                    pdf.adicionar_pagina(pagina)
+                    contagem["paginas"] += 1
+                    pagina = []
+                pagina.append(linha)
+        pdf.adicionar_pagina(pagina)
+        contagem["paginas"] += 1
+
+    return contagem
+
+def gerar_corpus(pasta_saida, qtd_pdfs=PDFS_PADRAO, questoes_por_pdf=QUESTOES_POR_PDF_PADRAO,
+                 materia="Direito Administrativo", prefixo="SINT", taxa_longos=TAXA_LONGOS_PADRAO,
+                 taxa_duplicadas=TAXA_DUPLICADAS_PADRAO, taxa_anuladas=TAXA_ANULADAS_PADRAO, seed=0):
+    """Gera o corpus em pasta_saida e retorna o resumo gravado em corpus_sintetico.json."""
+    os.makedirs(pasta_saida, exist_ok=True)
+    taxas = {"longos": taxa_longos, "duplicadas": taxa_duplicadas, "anuladas": taxa_anuladas}
+
+    caminho_gabaritos = os.path.join(pasta_saida, "gabaritos_sintetico.json")
+    with open(caminho_gabaritos, "w", encoding="utf-8") as f_gab:
+        separador = ["[\n"]
+
+        def gravar_gabarito(id_tec, gabarito):
+            f_gab.write(f'{separador[0]}    {{\n        "id_tec": {json.dumps(id_tec)},\n'
+                        f'        "gabarito": {json.dumps(gabarito)}\n    }}')
+            separador[0] = ",\n"
+
+        estado = {"rng": random.Random(seed), "ids": [], "vistos": set(), "numero": 0,
+                  "gravar_gabarito": gravar_gabarito}
+        pdfs = []
+        digitos = len(str(qtd_pdfs))
+        for i in range(1, qtd_pdfs + 1):
+            caminho_pdf = os.path.join(pasta_saida, f"{prefixo}{i:0{digitos}d}.pdf")
+            contagem = gerar_pdf(caminho_pdf, estado, materia, questoes_por_pdf, taxas, seed)
+            pdfs.append(contagem)
+            print(f"   📄 {contagem['arquivo']}: {contagem['paginas']} pág, {contagem['questoes']} questões")
+
+        f_gab.write("[]" if separador[0] == "[\n" else "\n]")
+
+    totais = {chave: sum(p[chave] for p in pdfs) for chave in ("paginas", "questoes", "duplicadas", "anuladas", "longos")}
+    totais["ids_unicos"] = len(estado["ids"])
+    resumo = {
+        "parametros": {"pdfs": qtd_pdfs, "questoes_por_pdf": questoes_por_pdf, "materia": materia,
+                       "prefixo": prefixo, "taxas": taxas, "seed": seed},
+        "totais": totais,
+        "pdfs": pdfs,
+    }
+    with open(os.path.join(pasta_saida, "corpus_sintetico.json"), "w", encoding="utf-8") as f:
+        json.dump(resumo, f, indent=4, ensure_ascii=False)
+    return resumo
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def _taxa(valor):
+    taxa = float(valor)
+    if not 0 <= taxa <= 1:
+        raise argparse.ArgumentTypeError("a taxa deve estar entre 0 e 1")
+    return taxa
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera PDFs sintéticos no layout do TEC Concursos.")
+    parser.add_argument("-o", "--saida", required=True, help="Pasta onde os PDFs serão gravados")
+    parser.add_argument("--pdfs", type=int, default=PDFS_PADRAO, help=f"Quantidade de PDFs (Padrão: {PDFS_PADRAO})")
+    parser.add_argument("--questoes", type=int, default=QUESTOES_POR_PDF_PADRAO,
+                        help=f"Questões por PDF (Padrão: {QUESTOES_POR_PDF_PADRAO})")
+    parser.add_argument("--materia", default="Direito Administrativo", help="Matéria da linha 'Matéria - Assunto'")
+    parser.add_argument("--prefixo", default="SINT", help="Prefixo dos arquivos, ex: DA para casar com ../DA*.pdf")
+    parser.add_argument("--taxa-longos", type=_taxa, default=TAXA_LONGOS_PADRAO,
+                        help=f"Fração de questões com texto longo (Padrão: {TAXA_LONGOS_PADRAO})")
+    parser.add_argument("--taxa-duplicadas", type=_taxa, default=TAXA_DUPLICADAS_PADRAO,
+                        help=f"Fração de questões que repetem um ID já emitido (Padrão: {TAXA_DUPLICADAS_PADRAO})")
+    parser.add_argument("--taxa-anuladas", type=_taxa, default=TAXA_ANULADAS_PADRAO,
+                        help=f"Fração de IDs com gabarito Anulada (Padrão: {TAXA_ANULADAS_PADRAO})")
+    parser.add_argument("--seed", type=int, default=0, help="Semente (o mesmo valor gera o mesmo corpus)")
+    args = parser.parse_args()
+
+    print("--- GERADOR DE CORPUS SINTÉTICO ---")
+    resumo = gerar_corpus(args.saida, args.pdfs, args.questoes, args.materia, args.prefixo,
+                          args.taxa_longos, args.taxa_duplicadas, args.taxa_anuladas, args.seed)
+    totais = resumo["totais"]
+    print("-" * 50)
+    print(f"📦 {args.pdfs} PDFs, {totais['paginas']} páginas, {totais['questoes']} questões")
+    print(f"   IDs únicos: {totais['ids_unicos']} | Duplicadas: {totais['duplicadas']} | "
+          f"Anuladas: {totais['anuladas']} | Textos longos: {totais['longos']}")
+    print(f"💾 Salvo em: {args.saida}")
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ import os
 import random
 from collections import defaultdict
 
+from textos_associados import buscar_textos_banco, carregar_textos, salvar_textos, compactar_questoes, questoes_simulado
+from banca_orgao import normalizar_banca
+
 # =============================================================================
 # 1. CONFIGURAÇÕES E MAPEAMENTO (O "DE-PARA")
 # =============================================================================
@@ -57,9 +60,11 @@ MAPA_DB = {
 # =============================================================================
 # 2. MOTOR DE BUSCA NO BANCO (ALEATÓRIO)
 # =============================================================================
-def buscar_questoes(cursor, materias_db, limite, tipo_filtro=None):
+def buscar_questoes(cursor, materias_db, limite, tipo_filtro=None, ano_minimo=None, banca=None):
     """
     Busca questões aleatórias no banco baseadas na matéria e num filtro de assunto.
+    ano_minimo e banca usam as colunas indexadas questao.ano/questao.banca
+    (banca normalizada: "cespe" -> "CEBRASPE").
     """
     if not materias_db or limite == 0:
         return []
@@ -68,7 +73,7 @@ def buscar_questoes(cursor, materias_db, limite, tipo_filtro=None):
     parametros = list(materias_db)
 
     query = f"""
-        SELECT q.id_tec, m.nome as materia, a.nome as assunto, q.comando, q.enunciado, q.gabarito, q.imagem_url
+        SELECT q.id_tec, m.nome as materia, a.nome as assunto, q.texto_associado, q.comando, q.enunciado, q.gabarito, q.imagem_url
         FROM questao q
         JOIN materia m ON q.id_materia = m.id
         JOIN assunto a ON q.id_assunto = a.id
@@ -82,6 +87,13 @@ def buscar_questoes(cursor, materias_db, limite, tipo_filtro=None):
         query += " AND a.nome NOT ILIKE %s "
         parametros.append('%Interpretação%')
 
+    if banca:
+        query += " AND q.banca = %s "
+        parametros.append(normalizar_banca(banca))
+    if ano_minimo:
+        query += " AND q.ano >= %s "
+        parametros.append(ano_minimo)
+
     query += " ORDER BY RANDOM() LIMIT %s;"
     parametros.append(limite)
 
@@ -90,17 +102,22 @@ def buscar_questoes(cursor, materias_db, limite, tipo_filtro=None):
     colunas = [desc[0] for desc in cursor.description]
     resultados = []
     for row in cursor.fetchall():
-        resultados.append(dict(zip(colunas, row)))
+        q = dict(zip(colunas, row))
+        if not q['texto_associado']:
+            del q['texto_associado']
+        resultados.append(q)
         
     return resultados
 
 # =============================================================================
 # 3. ALGORITMO GERADOR DO SIMULADO
 # =============================================================================
-def gerar_simulado(numero_simulado, pasta_saida):
+def gerar_simulado(numero_simulado, pasta_saida, ano_minimo=None, banca=None):
     """
     Gera um único simulado e salva na pasta de saída com o número indicado.
+    ano_minimo/banca restringem todas as buscas (ver buscar_questoes).
     """
+    filtros = {"ano_minimo": ano_minimo, "banca": banca}
     print(f"🔄 Gerando Simulado #{numero_simulado}...")
     simulado = {
         "metadados": {
@@ -123,20 +140,29 @@ def gerar_simulado(numero_simulado, pasta_saida):
                     questoes_temp = []
 
                     if "interpretacao" in regras:
-                        q_int = buscar_questoes(cursor, materias_alvo, regras["interpretacao"], 'interpretacao')
-                        q_gram = buscar_questoes(cursor, materias_alvo, regras["gramatica"], 'gramatica')
+                        q_int = buscar_questoes(cursor, materias_alvo, regras["interpretacao"], 'interpretacao', **filtros)
+                        q_gram = buscar_questoes(cursor, materias_alvo, regras["gramatica"], 'gramatica', **filtros)
                         questoes_temp.extend(q_int + q_gram)
                     else:
-                        questoes_temp.extend(buscar_questoes(cursor, materias_alvo, regras["total"]))
+                        questoes_temp.extend(buscar_questoes(cursor, materias_alvo, regras["total"], **filtros))
 
                     simulado["caderno_basico"].extend(questoes_temp)
 
                 # --- PARTE 2: CONHECIMENTOS ESPECÍFICOS ---
                 for disciplina, regras in DISTRIBUICAO["especificos"].items():
                     materias_alvo = MAPA_DB.get(disciplina, [])
-                    questoes_temp = buscar_questoes(cursor, materias_alvo, regras["total"])
+                    questoes_temp = buscar_questoes(cursor, materias_alvo, regras["total"], **filtros)
                     simulado["caderno_especifico"].extend(questoes_temp)
 
+                # --- TEXTOS ASSOCIADOS: uma vez só, em generated_simulados/textos_associados.json ---
+                questoes = questoes_simulado(simulado)
+                textos = carregar_textos(pasta_saida)
+                faltando = [q['texto_associado'] for q in questoes
+                            if q.get('texto_associado') and q['texto_associado'] not in textos]
+                textos.update(buscar_textos_banco(cursor, faltando))
+                compactar_questoes(questoes, textos)
+                salvar_textos(textos, pasta_saida)
+
         # --- FINALIZAÇÃO ---
         simulado["metadados"]["basicos"] = len(simulado["caderno_basico"])
         simulado["metadados"]["especificos"] = len(simulado["caderno_especifico"])
@@ -161,16 +187,24 @@ def gerar_simulado(numero_simulado, pasta_saida):
 # =============================================================================
 if __name__ == "__main__":
     # 1. Identificar quantidade de simulados via argumento (ex: --30)
+    #    e os filtros opcionais (ex: --ano-min=2020 --banca=CEBRASPE)
     qtd_simulados = 1 # Valor padrão
+    ano_minimo = None
+    banca = None
     
     for arg in sys.argv:
         if arg.startswith("--") and arg[2:].isdigit():
             qtd_simulados = int(arg[2:])
-            break
+        elif arg.startswith("--ano-min="):
+            ano_minimo = int(arg.split("=", 1)[1])
+        elif arg.startswith("--banca="):
+            banca = arg.split("=", 1)[1]
             
     print("=" * 60)
     print(f"🚀 INICIANDO GERAÇÃO EM LOTE")
     print(f"   Quantidade solicitada: {qtd_simulados}")
+    if ano_minimo or banca:
+        print(f"   Filtros: banca {normalizar_banca(banca) or 'todas'} | a partir de {ano_minimo or 'qualquer ano'}")
     print("=" * 60)
 
     # 2. Criar pasta de saída se não existir
@@ -183,7 +217,7 @@ if __name__ == "__main__":
 
     # 3. Loop de geração
     for i in range(1, qtd_simulados + 1):
-        gerar_simulado(i, PASTA_SAIDA)
+        gerar_simulado(i, PASTA_SAIDA, ano_minimo, banca)
 
     print("=" * 60)
     print("🏁 PROCESSO CONCLUÍDO.")
\ No newline at end of file
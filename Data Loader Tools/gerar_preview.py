@@ -1,8 +1,9 @@
-import json
 import os
 import argparse
 import webbrowser
 
+from registros_json import iterar_registros, localizar
+
 # ==============================================================================
 # CONFIGURAÇÃO VISUAL (CSS)
 # ==============================================================================
@@ -118,23 +119,13 @@ def main():
 
     args = parser.parse_args()
 
-    # Validação
-    if not os.path.exists(args.arquivo_json):
+    # Validação (.json ou .jsonl)
+    arquivo_json = localizar(args.arquivo_json)
+    if not os.path.exists(arquivo_json):
         print(f"❌ Erro: O arquivo '{args.arquivo_json}' não foi encontrado.")
         return
 
-    print(f"📂 Lendo: {args.arquivo_json}")
-    
-    try:
-        with open(args.arquivo_json, 'r', encoding='utf-8') as f:
-            dados = json.load(f)
-    except Exception as e:
-        print(f"❌ Erro ao ler JSON: {e}")
-        return
-
-    # Filtra apenas questões capturadas (HTML Rico)
-    questoes_ricas = [q for q in dados if q.get('capturado')]
-    total_ricas = len(questoes_ricas)
+    print(f"📂 Lendo: {arquivo_json}")
 
     # Aplica Limites
     limite = 0
@@ -147,20 +138,30 @@ def main():
         limite = args.limit
         modo_texto = f"Limitado ({limite} itens)"
 
-    if limite > 0:
-        questoes_exibicao = questoes_ricas[:limite]
-    else:
-        questoes_exibicao = questoes_ricas
+    # Filtra apenas questões capturadas (HTML Rico), lendo uma por vez:
+    # além do limite só conta, sem guardar
+    questoes_exibicao = []
+    total_ricas = 0
+    try:
+        for q in iterar_registros(arquivo_json):
+            if not q.get('capturado'):
+                continue
+            total_ricas += 1
+            if limite == 0 or len(questoes_exibicao) < limite:
+                questoes_exibicao.append(q)
+    except Exception as e:
+        print(f"❌ Erro ao ler JSON: {e}")
+        return
 
     print(f"📊 Questões com HTML: {total_ricas}")
     print(f"🚀 Gerando preview: {len(questoes_exibicao)} questões ({modo_texto})")
 
     # Gera Nome de Saída
-    nome_base = os.path.basename(args.arquivo_json).replace(".json", "")
+    nome_base = os.path.splitext(os.path.basename(arquivo_json))[0]
     arquivo_saida = f"preview_{nome_base}.html"
 
     # MONTAGEM DO HTML
-    html = HTML_TEMPLATE_START.format(nome_arquivo=os.path.basename(args.arquivo_json))
+    html = HTML_TEMPLATE_START.format(nome_arquivo=os.path.basename(arquivo_json))
     
     html += f"""
         <div class="header">
@@ -0,0 +1,193 @@
+"""
+Imagens embutidas nos PDFs do TEC, lidas direto dos objetos de imagem de cada
+página (sem adivinhar por palavras como "charge" e sem passar pelo navegador).
+
+Cada imagem pertence à questão cuja região a contém: da URL
+tecconcursos.com.br/questoes/<id> até a URL seguinte, atravessando páginas.
+O que vem antes da primeira URL (o logo da capa) não tem dona e é ignorado.
+
+Os bytes vão para um armazém endereçado pelo conteúdo:
+
+    imagens/<sha256[:16]>.<ext>      (na raiz do projeto, fora do git)
+
+e a questão recebe a lista dos nomes ("imagens": ["3f2a....png"]). A mesma
+imagem em várias questões ou PDFs é gravada uma vez só. A pasta não vai para
+o git: publique-a (servidor estático, bucket) e carregue com
+data_loader_v3.py --url-imagens <endereço>, que monta o imagem_url.
+
+A leitura usa o pypdfium2 quando instalado (rápido, sem montar layout de
+texto) e o pdfplumber caso contrário. O nome depende do leitor: o pdfium
+mantém os JPEG e grava o resto em PNG; o pdfplumber usa o ImageWriter do
+pdfminer.
+
+Uso direto (lista as imagens por questão):
+    python imagens_pdf.py "../Língua Inglesa/fonts/ING2.pdf"
+"""
+import os
+import io
+import re
+import glob
+import hashlib
+import argparse
+import tempfile
+
+import pdfplumber
+
+from motor_extracao import REGEX_URL
+
+try:
+    import pypdfium2
+    import pypdfium2.raw as pdfium_c
+except ImportError:
+    pypdfium2 = None
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+PASTA_IMAGENS = os.path.join(RAIZ_PROJETO, "imagens")
+TAMANHO_CHAVE = 16
+
+TEXTO_URL = "tecconcursos.com.br/questoes/"
+REGEX_ID = re.compile(r'\d+')
+
+# Assinatura -> extensão, para nomear o que os extratores devolvem em memória
+ASSINATURAS = (
+    (b"\xff\xd8", "jpg"),
+    (b"\x89PNG", "png"),
+    (b"\x00\x00\x00\x0cjP  ", "jp2"),
+    (b"II*\x00", "tiff"),
+    (b"MM\x00*", "tiff"),
+    (b"BM", "bmp"),
+)
+
+# ==============================================================================
+# OBJETOS DE CADA PÁGINA
+# ==============================================================================
+# Cada leitor gera, por página, a lista de eventos (topo, tipo, valor) com o
+# topo medido de cima para baixo: ("url", id_tec) ou ("imagem", extrair), onde
+# extrair() devolve os bytes da imagem só se ela tiver dona.
+
+def _paginas_pdfium(caminho_pdf):
+    pdf = pypdfium2.PdfDocument(caminho_pdf)
+    try:
+        for i in range(len(pdf)):
+            page = pdf[i]
+            altura = page.get_height()
+            textpage = page.get_textpage()
+            try:
+                eventos = []
+                busca = textpage.search(TEXTO_URL)
+                while True:
+                    achado = busca.get_next()
+                    if not achado:
+                        break
+                    indice, qtd = achado
+                    match_id = REGEX_ID.match(textpage.get_text_range(indice + qtd, 12))
+                    if match_id:
+                        topo = altura - textpage.get_charbox(indice)[3]
+                        eventos.append((topo, "url", match_id.group(0)))
+                busca.close()
+
+                for obj in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_IMAGE], max_depth=3):
+                    topo = altura - obj.get_bounds()[3]
+                    eventos.append((topo, "imagem", lambda obj=obj: _bytes_pdfium(obj)))
+                yield eventos
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+def _bytes_pdfium(obj):
+    buffer = io.BytesIO()
+    obj.extract(buffer)
+    return buffer.getvalue()
+
+def _paginas_pdfplumber(caminho_pdf):
+    with pdfplumber.open(caminho_pdf) as pdf:
+        for page in pdf.pages:
+            eventos = [(m["top"], "url", m["groups"][0])
+                       for m in page.search(REGEX_URL.pattern, regex=True, return_chars=False)]
+            for img in page.images:
+                eventos.append((img["top"], "imagem", lambda img=img: _bytes_pdfplumber(img)))
+            yield eventos
+            page.close()
+
+def _bytes_pdfplumber(img):
+    # O ImageWriter do pdfminer escolhe o formato (jpg/png/bmp...) pelo filtro do stream
+    from pdfminer.image import ImageWriter
+    from pdfminer.layout import LTImage
+
+    lt = LTImage(img.get("name", "imagem"), img["stream"], (img["x0"], img["y0"], img["x1"], img["y1"]))
+    with tempfile.TemporaryDirectory() as pasta:
+        nome = ImageWriter(pasta).export_image(lt)
+        with open(os.path.join(pasta, nome), "rb") as f:
+            return f.read()
+
+# ==============================================================================
+# ARMAZÉM
+# ==============================================================================
+def _extensao(dados):
+    for assinatura, extensao in ASSINATURAS:
+        if dados.startswith(assinatura):
+            return extensao
+    return "bin"
+
+def gravar_imagem(dados, pasta_imagens=PASTA_IMAGENS):
+    """Grava os bytes (se ainda não existirem) e retorna o nome no armazém."""
+    nome = f"{hashlib.sha256(dados).hexdigest()[:TAMANHO_CHAVE]}.{_extensao(dados)}"
+    caminho = os.path.join(pasta_imagens, nome)
+    if not os.path.exists(caminho):
+        os.makedirs(pasta_imagens, exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as f:
+            f.write(dados)
+        os.replace(temporario, caminho)
+    return nome
+
+# ==============================================================================
+# MAPEAMENTO
+# ==============================================================================
+def mapear_imagens(caminho_pdf, pasta_imagens=PASTA_IMAGENS):
+    """
+    Lê as imagens do PDF, grava no armazém e retorna {id_tec: [nomes]}, na
+    ordem em que aparecem. Questões sem imagem não entram no dicionário.
+    """
+    paginas = _paginas_pdfium if pypdfium2 is not None else _paginas_pdfplumber
+    imagens = {}
+    dona = None
+    for eventos in paginas(caminho_pdf):
+        # Mesma ordem de leitura das linhas: de cima para baixo; no mesmo topo, a URL antes
+        for _, tipo, valor in sorted(eventos, key=lambda e: (e[0], e[1] != "url")):
+            if tipo == "url":
+                dona = valor
+            elif dona is not None:
+                nome = gravar_imagem(valor(), pasta_imagens)
+                lista = imagens.setdefault(dona, [])
+                if nome not in lista:
+                    lista.append(nome)
+    return imagens
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Extrai as imagens dos PDFs e mostra a questão de cada uma.")
+    parser.add_argument("pdfs", nargs="+", help="PDFs ou pastas com PDFs")
+    parser.add_argument("--pasta-imagens", default=PASTA_IMAGENS, help="Armazém das imagens")
+    args = parser.parse_args()
+
+    arquivos = []
+    for caminho in args.pdfs:
+        arquivos.extend(sorted(glob.glob(os.path.join(caminho, "*.pdf"))) if os.path.isdir(caminho) else [caminho])
+
+    for caminho_pdf in arquivos:
+        imagens = mapear_imagens(caminho_pdf, args.pasta_imagens)
+        total = sum(len(nomes) for nomes in imagens.values())
+        print(f"📄 {os.path.basename(caminho_pdf)}: {total} imagens em {len(imagens)} questões")
+        for id_tec, nomes in imagens.items():
+            print(f"   {id_tec}: {', '.join(nomes)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Extração incremental: manifesto dos PDFs já processados + mescla no dataset.
+
+O manifesto (manifesto_extracao.json, ao lado dos datasets) guarda, para cada
+PDF, caminho, tamanho, mtime, SHA-256 e os id_tec que ele deu ao dataset
+(a primeira cópia de cada questão, como no IdsVistos). Só os PDFs novos ou
+alterados são extraídos. Os demais entram na ordem dos arquivos só com os
+seus IDs, então a cópia pulada num PDF novo ou alterado é a mesma da
+extração completa; o resultado é mesclado ao dataset existente pelas regras
+de dedup/ordenação do consolidar().
+
+PDFs removidos da pasta (ou questões que saíram de um PDF alterado) não
+apagam questões do dataset.
+"""
+import os
+import json
+
+from cache_paginas import hash_arquivo
+from registros_json import iterar_registros, localizar
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+RAIZ_PROJETO = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+ARQUIVO_MANIFESTO = "manifesto_extracao.json"
+
+def _chave(caminho_pdf):
+    # Relativo à raiz: o extrator (rodado de tools/) e o extrator_paralelo
+    # enxergam o mesmo PDF com a mesma chave.
+    return os.path.relpath(os.path.abspath(caminho_pdf), RAIZ_PROJETO)
+
+# ==============================================================================
+# MANIFESTO
+# ==============================================================================
+def carregar_manifesto(pasta_saida=""):
+    caminho = os.path.join(pasta_saida, ARQUIVO_MANIFESTO)
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def salvar_manifesto(manifesto, pasta_saida=""):
+    caminho = os.path.join(pasta_saida, ARQUIVO_MANIFESTO)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, indent=4, ensure_ascii=False, sort_keys=True)
+
+def selecionar_alterados(arquivos, pasta_saida=""):
+    """
+    Retorna (arquivos_novos_ou_alterados, manifesto_atualizado).
+
+    Tamanho + mtime iguais bastam para pular o PDF. Se mudaram, o hash decide
+    (um "touch" ou cópia não força reextração). Uma entrada sem os IDs (de
+    um manifesto antigo) é extraída de novo uma vez. O manifesto devolvido
+    já traz as entradas novas; grave-o só depois que o dataset for salvo.
+    """
+    manifesto = carregar_manifesto(pasta_saida)
+    alterados = []
+
+    for arq in arquivos:
+        chave = _chave(arq)
+        info = os.stat(arq)
+        anterior = manifesto.get(chave)
+
+        if anterior and "ids" not in anterior:
+            anterior = None
+        if anterior and anterior['tamanho'] == info.st_size and anterior['mtime'] == info.st_mtime:
+            continue
+
+        sha = hash_arquivo(arq)
+        entrada = {"caminho": chave, "tamanho": info.st_size, "mtime": info.st_mtime, "sha256": sha}
+        if not anterior or anterior['sha256'] != sha:
+            alterados.append(arq)
+        else:
+            entrada["ids"] = anterior["ids"]
+        manifesto[chave] = entrada
+
+    return alterados, manifesto
+
+def donos_anteriores(arquivos, alterados, manifesto):
+    """
+    [(arquivo, ids)] na ordem de arquivos: ids são os id_tec que um PDF não
+    alterado já deu ao dataset (para o IdsVistos.registrar) e None nos
+    alterados, que são extraídos nesse ponto da ordem.
+    """
+    a_extrair = set(alterados)
+    return [(arq, None if arq in a_extrair else manifesto[_chave(arq)]["ids"]) for arq in arquivos]
+
+def registrar_donos(manifesto, arquivos, vistos):
+    """Grava no manifesto os IDs de cada PDF segundo o IdsVistos da execução."""
+    por_pdf = {}
+    for id_tec, pdf in vistos.origem.items():
+        por_pdf.setdefault(pdf, []).append(id_tec)
+    for arq in arquivos:
+        manifesto[_chave(arq)]["ids"] = sorted(por_pdf.get(os.path.basename(arq), []))
+    return manifesto
+
+# ==============================================================================
+# MESCLA
+# ==============================================================================
+def _listas(resultado):
+    return resultado if isinstance(resultado, tuple) else (resultado,)
+
+def mesclar_com_anteriores(resultados, arquivos_saida, pasta_saida=""):
+    """
+    Coloca o conteúdo atual dos datasets na frente dos resultados novos, no
+    mesmo formato que processar_pdf devolve (lista ou tupla de listas, na
+    ordem de arquivos_saida). Como o consolidar() deduplica com "o último
+    vence", as questões reextraídas substituem as antigas. Os resultados
+    novos já vêm sem as cópias de IDs de PDFs anteriores (donos_anteriores),
+    então só substituem o que na extração completa também viria deles.
+
+    IDs que aparecem nos resultados novos saem de todos os arquivos antigos,
+    assim uma questão que mudou de categoria (ex: virou anulada) não fica
+    duplicada.
+    """
+    ids_novos = set()
+    for resultado in resultados:
+        for lista in _listas(resultado):
+            ids_novos.update(q.get('id_tec') for q in lista)
+
+    anteriores = []
+    for nome in arquivos_saida:
+        # O dataset anterior pode estar em .json ou .jsonl
+        caminho = localizar(os.path.join(pasta_saida, nome))
+        lista = []
+        if os.path.exists(caminho):
+            lista = [q for q in iterar_registros(caminho) if q.get('id_tec') not in ids_novos]
+        anteriores.append(lista)
+
+    if len(arquivos_saida) == 1:
+        return [anteriores[0]] + list(resultados)
+    return [tuple(anteriores)] + list(resultados)
@@ -0,0 +1,242 @@
+"""
+Memo em disco da separação Comando/Enunciado (e de outras funções de texto).
+
+Chave: (SHA-256 do texto, versão). A versão é o hash do código do módulo da
+função e dos módulos do projeto que ele importa (segmentador.py,
+busca_padroes.py...), do nome da função e dos parâmetros da chamada
+(gatilhos, limite de fallback). Mexer num gatilho ou no motor muda a versão:
+os resultados antigos deixam de valer sozinhos e são apagados na próxima vez
+que a função abrir o memo. O texto entra exato no hash, sem normalizar: a
+separação devolve pedaços dele, então só o mesmo texto dá o mesmo resultado.
+
+Um memo carrega de uma vez os resultados da sua versão e grava os novos numa
+transação só (gravar()), então cada consulta é um dicionário em memória; com
+~50 us por separação, um SELECT por questão não compensaria.
+
+Uso:
+    memo = memo_segmentacao(separar_comando_enunciado, GATILHOS_PT, 800)
+    cmd, enun = memo.calcular(texto)
+    enunciados = memo.calcular_lote(comandos, extrair_perguntas_ingles)
+    memo.gravar()
+
+    python memo_segmentacao.py --status
+    python memo_segmentacao.py --limpar
+"""
+import os
+import sys
+import json
+import sqlite3
+import hashlib
+import inspect
+import argparse
+
+from cache_paginas import PASTA_CACHE
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+ARQUIVO_MEMO = os.path.join(PASTA_CACHE, "segmentacao.sqlite")
+
+# ==============================================================================
+# CONEXÃO (uma por processo, como no cache de páginas)
+# ==============================================================================
+_conexao = None
+_pid_conexao = None
+
+def _conectar():
+    global _conexao, _pid_conexao
+    if _conexao is not None and _pid_conexao == os.getpid():
+        return _conexao
+
+    os.makedirs(PASTA_CACHE, exist_ok=True)
+    conn = sqlite3.connect(ARQUIVO_MEMO, timeout=60)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS resultados (
+            versao TEXT NOT NULL,
+            sha256 TEXT NOT NULL,
+            funcao TEXT NOT NULL,
+            codigo TEXT NOT NULL,
+            resultado TEXT NOT NULL,
+            PRIMARY KEY (versao, sha256)
+        )
+    """)
+    conn.commit()
+
+    _conexao = conn
+    _pid_conexao = os.getpid()
+    return conn
+
+def _hash(*partes):
+    h = hashlib.sha256()
+    for parte in partes:
+        h.update(parte.encode('utf-8') if isinstance(parte, str) else parte)
+        h.update(b"\0")
+    return h.hexdigest()
+
+def _modulo(valor):
+    if inspect.ismodule(valor):
+        return valor
+    return sys.modules.get(getattr(valor, "__module__", None) or "")
+
+def _arquivos_do_projeto(modulo, pastas, vistos):
+    """O arquivo do módulo e, recursivamente, os dos módulos do projeto que ele importa."""
+    arquivo = getattr(modulo, "__file__", None)
+    if not arquivo or not arquivo.endswith(".py"):
+        return
+    arquivo = os.path.abspath(arquivo)
+    if arquivo in vistos or os.path.dirname(arquivo) not in pastas:
+        return
+    vistos.add(arquivo)
+    for valor in list(vars(modulo).values()):
+        dependencia = _modulo(valor)
+        if dependencia is not None:
+            _arquivos_do_projeto(dependencia, pastas, vistos)
+
+def _codigo(funcao):
+    # O que a função executa: o módulo dela e os módulos do projeto que ele
+    # importa (segmentador, busca_padroes...), nas pastas da função e deste
+    # arquivo; bibliotecas instaladas ficam de fora
+    modulo = inspect.getmodule(funcao)
+    pastas = {os.path.dirname(os.path.abspath(inspect.getsourcefile(funcao))),
+              os.path.dirname(os.path.abspath(__file__))}
+    arquivos = set()
+    _arquivos_do_projeto(modulo, pastas, arquivos)
+    conteudos = []
+    for arquivo in sorted(arquivos):
+        with open(arquivo, 'rb') as f:
+            conteudos.append(f.read())
+    return _hash(*conteudos)
+
+# ==============================================================================
+# MEMO
+# ==============================================================================
+class MemoSegmentacao:
+    """
+    funcao(texto, *config) com os resultados guardados por (texto, versão).
+    Com persistente=False só calcula (para o --no-cache dos extratores).
+    """
+
+    def __init__(self, funcao, config=(), persistente=True):
+        self.funcao = funcao
+        self.config = tuple(config)
+        self.persistente = persistente
+        self.nome = f"{os.path.basename(inspect.getsourcefile(funcao))}:{funcao.__qualname__}"
+        self.codigo = _codigo(funcao)
+        self.versao = _hash(self.nome, self.codigo, repr(self.config))
+        self.acertos = 0
+        self.calculados = 0
+        self._resultados = {}
+        self._novos = {}
+        if persistente:
+            self._carregar()
+
+    def _carregar(self):
+        conn = _conectar()
+        # Versões de um código que não existe mais não voltam a ser usadas
+        conn.execute("DELETE FROM resultados WHERE funcao = ? AND codigo != ?", (self.nome, self.codigo))
+        conn.commit()
+        cursor = conn.execute("SELECT sha256, resultado FROM resultados WHERE versao = ?", (self.versao,))
+        for sha, resultado in cursor:
+            self._resultados[sha] = _decodificar(json.loads(resultado))
+
+    def calcular(self, texto):
+        if not self.persistente:
+            self.calculados += 1
+            return self.funcao(texto, *self.config)
+
+        sha = hashlib.sha256((texto or "").encode('utf-8')).hexdigest()
+        if sha in self._resultados:
+            self.acertos += 1
+            return self._resultados[sha]
+
+        resultado = self.funcao(texto, *self.config)
+        self._resultados[sha] = resultado
+        self._novos[sha] = resultado
+        self.calculados += 1
+        return resultado
+
+    def calcular_lote(self, textos, funcao_lote):
+        """
+        Resultados de vários textos; os que não estão no memo são calculados
+        numa chamada só de funcao_lote(textos, *config), que devolve a lista
+        com o mesmo resultado de funcao para cada texto.
+        """
+        if not self.persistente:
+            self.calculados += len(textos)
+            return list(funcao_lote(list(textos), *self.config))
+
+        shas = [hashlib.sha256((t or "").encode('utf-8')).hexdigest() for t in textos]
+        faltando = {}
+        for sha, texto in zip(shas, textos):
+            if sha in self._resultados or sha in faltando:
+                self.acertos += 1
+            else:
+                faltando[sha] = texto
+
+        if faltando:
+            for sha, resultado in zip(faltando, funcao_lote(list(faltando.values()), *self.config)):
+                self._resultados[sha] = resultado
+                self._novos[sha] = resultado
+            self.calculados += len(faltando)
+        return [self._resultados[sha] for sha in shas]
+
+    def gravar(self):
+        """Grava os resultados novos (uma transação). Retorna quantos."""
+        if not self._novos:
+            return 0
+        conn = _conectar()
+        conn.executemany(
+            "INSERT OR REPLACE INTO resultados (versao, sha256, funcao, codigo, resultado) VALUES (?, ?, ?, ?, ?)",
+            [(self.versao, sha, self.nome, self.codigo, json.dumps(r, ensure_ascii=False))
+             for sha, r in self._novos.items()]
+        )
+        conn.commit()
+        total = len(self._novos)
+        self._novos = {}
+        return total
+
+def _decodificar(valor):
+    # O JSON devolve listas; as funções memorizadas devolvem tuplas
+    return tuple(valor) if isinstance(valor, list) else valor
+
+_memos = {}
+
+def memo_segmentacao(funcao, *config, usar=True):
+    """O memo de funcao com estes parâmetros, carregado uma vez por processo."""
+    if not usar:
+        return MemoSegmentacao(funcao, config, persistente=False)
+    chave = (funcao, config)
+    if chave not in _memos:
+        _memos[chave] = MemoSegmentacao(funcao, config)
+    return _memos[chave]
+
+# ==============================================================================
+# MAIN (manutenção)
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Manutenção do memo da separação Comando/Enunciado.")
+    parser.add_argument("--status", action="store_true", help="Mostra os resultados guardados por função")
+    parser.add_argument("--limpar", action="store_true", help="Apaga o memo")
+    args = parser.parse_args()
+
+    if args.limpar:
+        for sufixo in ("", "-wal", "-shm"):
+            if os.path.exists(ARQUIVO_MEMO + sufixo):
+                os.remove(ARQUIVO_MEMO + sufixo)
+        print("🧹 Memo apagado.")
+        return
+
+    conn = _conectar()
+    linhas = conn.execute(
+        "SELECT funcao, COUNT(DISTINCT versao), COUNT(*) FROM resultados GROUP BY funcao ORDER BY funcao"
+    ).fetchall()
+    print(f"📂 Memo: {ARQUIVO_MEMO}")
+    if not linhas:
+        print("   (vazio)")
+    for funcao, versoes, total in linhas:
+        print(f"   {funcao}: {total} resultados em {versoes} versões")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Medição de memória (RSS) e teto "suave" para os pools de processos.
+
+Pico por PDF: zerar_pico_rss() antes e pico_rss_mb() depois. No Linux o pico
+é zerado via /proc/self/clear_refs, então mede só o intervalo (incluindo o que
+o processo já ocupava); fora dele vale o pico do processo inteiro.
+
+Teto suave (PoolComTeto): as tarefas entram no pool aos poucos, no máximo
+uma por worker. Enquanto elas rodam, o RSS do processo e dos filhos é
+conferido; passando do teto, o paralelismo cai (nenhuma tarefa nova entra até
+sobrarem menos em andamento) e não volta a subir. Nada é interrompido: uma
+tarefa sozinha pode passar do teto, por isso "suave".
+"""
+import os
+import re
+import sys
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+# De quanto em quanto tempo o RSS é conferido enquanto as tarefas rodam
+INTERVALO_S = 0.5
+
+_PAGINA_KB = os.sysconf("SC_PAGE_SIZE") // 1024 if hasattr(os, "sysconf") else 4
+
+# ==============================================================================
+# MEDIÇÃO
+# ==============================================================================
+def zerar_pico_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def pico_rss_mb():
+    """Pico de RSS do processo (desde o último zerar_pico_rss, no Linux)."""
+    try:
+        with open("/proc/self/status") as f:
+            return int(re.search(r'VmHWM:\s+(\d+)', f.read()).group(1)) / 1024
+    except (OSError, AttributeError):
+        pass
+    if resource is None:
+        return 0.0
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss vem em KB no Linux e em bytes no macOS
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+def _rss_kb(pid):
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * _PAGINA_KB
+
+def _filhos(pid):
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(p) for p in f.read().split()]
+    except OSError:
+        return []
+
+def rss_arvore_mb():
+    """RSS atual deste processo somado ao dos descendentes (só Linux; fora dele, 0)."""
+    total = 0
+    pendentes = [os.getpid()]
+    while pendentes:
+        pid = pendentes.pop()
+        try:
+            total += _rss_kb(pid)
+        except (OSError, ValueError, IndexError):
+            continue
+        pendentes += _filhos(pid)
+    return total / 1024
+
+# ==============================================================================
+# TETO SUAVE
+# ==============================================================================
+class PoolComTeto:
+    """
+    ProcessPoolExecutor com teto suave de memória. map() entrega na ordem, como
+    o do executor, mas submete aos poucos: no máximo `limite` tarefas em
+    andamento no pool inteiro (somando todas as threads que usam o mesmo
+    pool). O limite começa em workers e cai quando o RSS do processo com os
+    filhos passa de teto_mb.
+
+    Cada processo do pool atende uma tarefa só e sai, devolvendo a memória
+    (Python 3.11+; antes disso o pool reaproveita os processos).
+    """
+
+    def __init__(self, workers, teto_mb):
+        self.workers = max(1, workers)
+        self.teto_mb = teto_mb
+        self.limite = self.workers
+        self._andamento = set()
+        self._trava = threading.Lock()
+        if sys.version_info >= (3, 11):
+            # max_tasks_per_child não aceita o início por fork
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, max_tasks_per_child=1,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    def submit(self, funcao, *args, **kwargs):
+        return self._pool.submit(funcao, *args, **kwargs)
+
+    def _tentar_submeter(self, funcao, args):
+        with self._trava:
+            self._andamento = {f for f in self._andamento if not f.done()}
+            if len(self._andamento) >= self.limite:
+                return None
+            futuro = self._pool.submit(funcao, *args)
+            self._andamento.add(futuro)
+            return futuro
+
+    def _conferir_memoria(self):
+        rss = rss_arvore_mb()
+        with self._trava:
+            em_andamento = sum(1 for f in self._andamento if not f.done())
+            novo = max(1, em_andamento - 1)
+            if rss <= self.teto_mb or novo >= self.limite:
+                return
+            self.limite = novo
+        print(f"⚠️  Memória em {rss:.0f} MB (teto {self.teto_mb} MB): paralelismo reduzido para {novo}")
+
+    def map(self, funcao, *iteraveis):
+        argumentos = list(zip(*iteraveis))
+        futuros = []
+        entregue = 0
+        while entregue < len(argumentos):
+            while len(futuros) < len(argumentos):
+                futuro = self._tentar_submeter(funcao, argumentos[len(futuros)])
+                if futuro is None:
+                    break
+                futuros.append(futuro)
+
+            if entregue == len(futuros) or not futuros[entregue].done():
+                with self._trava:
+                    andamento = list(self._andamento)
+                wait(andamento, timeout=INTERVALO_S, return_when=FIRST_COMPLETED)
+                self._conferir_memoria()
+
+            while entregue < len(futuros) and futuros[entregue].done():
+                yield futuros[entregue].result()
+                futuros[entregue] = None
+                entregue += 1
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
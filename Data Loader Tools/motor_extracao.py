@@ -0,0 +1,537 @@
+"""
+Motor de extração compartilhado pelos extratores de cada matéria.
+
+O PDF é lido em streaming: as páginas viram linhas, as linhas alimentam a
+máquina de estados (URL -> metadados por lookahead -> buffer -> Gabarito) e
+cada questão sai assim que a próxima URL (ou o fim do arquivo) a fecha.
+Em memória fica apenas a página atual e o buffer da questão em andamento.
+
+O texto das páginas vem de um dos BACKENDS: pdfplumber (padrão, referência
+dos datasets) ou pdfium (pypdfium2, bem mais rápido, com as linhas remontadas
+pelo mesmo algoritmo do pdfplumber). Use bench_backends.py para conferir.
+
+PDFs grandes podem ser divididos em fatias de páginas processadas em paralelo
+(iterar_questoes_pdf com executor); a costura das bordas pela URL da questão
+garante a mesma saída da leitura serial.
+
+Os cadernos exportados se sobrepõem (a mesma questão em DC3 e DC7). Com um
+IdsVistos compartilhado entre os PDFs da matéria, a cópia de um id_tec já
+capturado é reconhecida na linha da URL e o texto dela é descartado sem
+buffer nem segmentação; vale a primeira cópia lida.
+"""
+import re
+from collections import deque, Counter
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+try:
+    import pypdfium2
+    import pypdfium2.raw as pdfium_c
+except ImportError:
+    pypdfium2 = None
+
+from cache_paginas import iterar_paginas_com_cache, iterar_intervalo_com_cache
+from memoria import PoolComTeto
+from banca_orgao import eh_linha_banca, termina_com_ano, separar_banca_orgao
+
+# ==============================================================================
+# PADRÕES
+# ==============================================================================
+REGEX_URL = re.compile(r'tecconcursos\.com\.br/questoes/(\d+)')
+REGEX_INICIO = re.compile(r'^(\d+)\)\s*(.*)')
+# REGEX BLINDADO: Apenas Certo ou Errado. Ignora 'A', 'B', 'Anulada', etc.
+REGEX_GABARITO_CE = re.compile(r'^Gabarito:\s*(Certo|Errado)', re.IGNORECASE)
+# Captura qualquer gabarito (para segregar anuladas depois)
+REGEX_GABARITO_LIVRE = re.compile(r'^Gabarito:\s*(.*)', re.IGNORECASE)
+
+# Quantas linhas depois da URL procuramos banca/assunto/"N)"
+JANELA_METADADOS = 5
+
+# Mesmas tolerâncias (em pontos) do extract_text() do pdfplumber
+TOLERANCIA_X = 3
+TOLERANCIA_Y = 3
+
+# Sobe quando a montagem de linhas do pdfium mudar (invalida o cache dele)
+VERSAO_LAYOUT_PDFIUM = 1
+
+# Tamanho das fatias quando um PDF é dividido entre processos
+PAGINAS_POR_FATIA = 20
+
+# ==============================================================================
+# LEITURA DO PDF (BACKENDS)
+# ==============================================================================
+def _paginas_pdfplumber(caminho_pdf, inicio=0, fim=None):
+    with pdfplumber.open(caminho_pdf) as pdf:
+        for page in pdf.pages[inicio:fim]:
+            texto = page.extract_text() or ""
+            # A página guarda o layout e os objetos já lidos até o PDF fechar;
+            # solta já, senão o RSS cresce com o PDF inteiro (ING3: 1,2 GB -> 60 MB)
+            page.close()
+            yield texto
+
+def _caracteres_pdfium(textpage, altura):
+    """
+    Caracteres da página como (top, x0, x1, texto, bloco).
+
+    O pdfium descarta alguns espaços reais do PDF (fim de trecho, troca de
+    fonte) e põe no lugar um espaço/quebra "gerado", com posição sem sentido.
+    O gerado não entra na lista: só incrementa "bloco", e a montagem das
+    palavras quebra onde o bloco muda.
+    """
+    caracteres = []
+    bloco = 0
+    caixa = pdfium_c.FS_RECTF()
+    matriz = pdfium_c.FS_MATRIX()
+    pendente = None  # metade alta de um par surrogate
+
+    for i in range(textpage.count_chars()):
+        codigo = pdfium_c.FPDFText_GetUnicode(textpage, i)
+        if pdfium_c.FPDFText_IsGenerated(textpage, i) == 1:
+            if codigo in (0x20, 0x0D, 0x0A):
+                bloco += 1
+            continue
+        if codigo in (0x00, 0x0D, 0x0A):
+            continue
+        if 0xD800 <= codigo < 0xDC00:
+            pendente = codigo
+            continue
+        if 0xDC00 <= codigo < 0xE000:
+            if pendente is None:
+                continue
+            codigo = 0x10000 + ((pendente - 0xD800) << 10) + (codigo - 0xDC00)
+            pendente = None
+        # Hífen de fim de linha vem como STX
+        texto = "-" if codigo == 0x02 else chr(codigo)
+
+        # Caixa "solta" (métrica da fonte), a mesma do pdfminer: x0/x1 pelo
+        # avanço do glifo e topo = base da caixa menos o tamanho efetivo da fonte
+        pdfium_c.FPDFText_GetLooseCharBox(textpage, i, caixa)
+        pdfium_c.FPDFText_GetMatrix(textpage, i, matriz)
+        tamanho = pdfium_c.FPDFText_GetFontSize(textpage, i) * abs(matriz.d)
+        caracteres.append((altura - caixa.bottom - tamanho, caixa.left, caixa.right, texto, bloco))
+    return caracteres
+
+def _grupos_de_topo(topos):
+    """
+    Como o cluster_list do pdfplumber: topos encadeados a até TOLERANCIA_Y
+    um do outro caem no mesmo grupo. Retorna {topo: índice do grupo}.
+    """
+    grupos = {}
+    grupo = -1
+    ultimo = None
+    for t in sorted(set(topos)):
+        if ultimo is None or t > ultimo + TOLERANCIA_Y:
+            grupo += 1
+        grupos[t] = grupo
+        ultimo = t
+    return grupos
+
+def _montar_texto(caracteres):
+    """
+    Mesmo algoritmo do extract_text() do pdfplumber: caracteres agrupados em
+    linhas pelo topo, ordenados em x e cortados em palavras; as palavras, na
+    ordem em que saíram, são reagrupadas pelo topo de cada uma (palavras
+    seguidas no mesmo grupo formam uma linha do texto).
+    """
+    grupos = _grupos_de_topo(c[0] for c in caracteres)
+    linhas = [[] for _ in range(len(set(grupos.values())))]
+    for c in caracteres:
+        linhas[grupos[c[0]]].append(c)
+
+    palavras = []  # (topo, texto)
+    for linha in linhas:
+        linha.sort(key=lambda c: c[1])
+        atual = []
+        for c in linha + [None]:
+            if atual and (c is None or c[3].isspace() or c[1] < atual[-1][1]
+                          or c[1] > atual[-1][2] + TOLERANCIA_X
+                          or abs(c[0] - atual[-1][0]) > TOLERANCIA_Y or c[4] != atual[-1][4]):
+                palavras.append((min(x[0] for x in atual), "".join(x[3] for x in atual)))
+                atual = []
+            if c is not None and not c[3].isspace():
+                atual.append(c)
+
+    grupos = _grupos_de_topo(p[0] for p in palavras)
+    saida = []
+    grupo_anterior = None
+    for topo, texto in palavras:
+        if grupos[topo] != grupo_anterior:
+            saida.append([])
+            grupo_anterior = grupos[topo]
+        saida[-1].append(texto)
+    return "\n".join(" ".join(linha) for linha in saida)
+
+def _paginas_pdfium(caminho_pdf, inicio=0, fim=None):
+    """
+    Texto via PDFium (C++). Remonta as linhas pela posição dos caracteres,
+    imitando o extract_text() do pdfplumber, porque a ordem nativa do pdfium
+    segue os objetos do PDF (ex: o "1801)" sai antes do cabeçalho da página).
+    """
+    pdf = pypdfium2.PdfDocument(caminho_pdf)
+    try:
+        for i in range(inicio, len(pdf) if fim is None else min(fim, len(pdf))):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                yield _montar_texto(_caracteres_pdfium(textpage, page.get_height()))
+            finally:
+                textpage.close()
+                page.close()
+    finally:
+        pdf.close()
+
+# nome -> (gerador de textos por página, identificador na chave do cache).
+# O gerador recebe (caminho_pdf, inicio=0, fim=None) e lê as páginas [inicio, fim).
+BACKENDS = {
+    "pdfplumber": (_paginas_pdfplumber, f"pdfplumber-{pdfplumber.__version__}"),
+}
+if pypdfium2 is not None:
+    BACKENDS["pdfium"] = (
+        _paginas_pdfium,
+        f"pdfium-{pypdfium2.version.PYPDFIUM_INFO}-layout{VERSAO_LAYOUT_PDFIUM}",
+    )
+BACKEND_PADRAO = "pdfplumber"
+
+def _backend(backend):
+    if backend not in BACKENDS:
+        if backend == "pdfium":
+            raise RuntimeError("pypdfium2 não instalado. Execute: pip install pypdfium2")
+        raise ValueError(f"Backend de PDF desconhecido: {backend}")
+    return BACKENDS[backend]
+
+def iterar_textos_paginas(caminho_pdf, usar_cache=True, backend=BACKEND_PADRAO):
+    """Gera o texto de cada página ("" quando vazia), via cache em disco."""
+    extrair, chave = _backend(backend)
+    if usar_cache:
+        return iterar_paginas_com_cache(caminho_pdf, chave, extrair)
+    return extrair(caminho_pdf)
+
+def _linhas(textos):
+    for t in textos:
+        if t:
+            yield from t.split('\n')
+
+def linhas_das_paginas(textos):
+    """Linhas dos textos de página, na ordem, com o "" do fim do documento."""
+    yield from _linhas(textos)
+    # Equivale ao "\n" final que o antigo texto_bruto sempre carregava
+    yield ""
+
+def iterar_linhas_pdf(caminho_pdf, usar_cache=True, backend=BACKEND_PADRAO):
+    """Gera as linhas do PDF página a página, sem acumular o texto inteiro."""
+    return linhas_das_paginas(iterar_textos_paginas(caminho_pdf, usar_cache, backend))
+
+def contar_paginas(caminho_pdf):
+    if pypdfium2 is not None:
+        pdf = pypdfium2.PdfDocument(caminho_pdf)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+    with pdfplumber.open(caminho_pdf) as pdf:
+        return len(pdf.pages)
+
+# ==============================================================================
+# MÁQUINA DE ESTADOS
+# ==============================================================================
+def _assunto_adiante(janela):
+    # O fim de uma banca quebrada pode ter " - " ("Textos - Técnico/2025"); só é
+    # continuação se a linha "Matéria - Assunto" ainda estiver por vir
+    seguinte = next((linha.strip() for _, linha in janela if linha.strip()), "")
+    return " - " in seguinte and not REGEX_INICIO.match(seguinte)
+
+def extrair_questoes(linhas, materia, banca_padrao="", regex_gabarito=REGEX_GABARITO_LIVRE, ancoras=None,
+                     pular=None):
+    """
+    Consome um iterável de linhas e gera tuplas (questao, texto_completo)
+    conforme cada questão é fechada.
+
+    - materia: valor usado quando o PDF não traz a linha "Matéria - Assunto".
+    - banca_padrao: fallback de banca (ex: "Questões Inéditas"); "" mantém vazio.
+    - regex_gabarito: REGEX_GABARITO_CE (filtro rígido) ou REGEX_GABARITO_LIVRE.
+    - ancoras: lista opcional; recebe o índice de cada linha de URL que abriu
+      uma questão (as engolidas pelo lookahead de metadados não entram).
+    - pular: função opcional id_tec -> bool (ex: IdsVistos.pular_em). Quando
+      True, a questão não sai e o texto até a próxima URL não é guardado.
+
+    Além do banca_orgao (texto da linha), cada questão traz banca, cargo,
+    orgao e ano já separados (banca_orgao.py).
+    """
+    fonte = enumerate(linhas)
+    pendentes = deque()  # (índice, linha) lidas no lookahead e ainda não consumidas
+
+    def proxima():
+        if pendentes:
+            return pendentes.popleft()
+        return next(fonte, (None, None))
+
+    q_atual = None
+    buffer_texto = []
+
+    while True:
+        indice, linha = proxima()
+        if linha is None:
+            break
+        linha = linha.strip()
+
+        # 1. LINK ID (Início de nova questão)
+        match_id = REGEX_URL.search(linha)
+        if match_id:
+            if q_atual:
+                yield q_atual, "\n".join(buffer_texto)
+                q_atual = None
+                buffer_texto = []
+            if ancoras is not None:
+                ancoras.append(indice)
+
+            novo_id = match_id.group(1)
+            banca = ""
+            materia_q = materia
+            assunto = ""
+
+            # Lookahead para metadados. Se o "N)" não aparecer, a lógica
+            # original ainda descartava uma linha além da janela.
+            janela = []
+            while len(janela) <= JANELA_METADADOS:
+                item = proxima()
+                if item[1] is None:
+                    break
+                janela.append(item)
+            consumidas = len(janela)
+
+            banca_quebrada = False
+            for offset, (_, prox) in enumerate(janela[:JANELA_METADADOS], 1):
+                prox = prox.strip()
+                if not prox:
+                    continue
+
+                continuacao = banca_quebrada and termina_com_ano(prox) and (
+                    " - " not in prox or _assunto_adiante(janela[offset:JANELA_METADADOS]))
+                banca_quebrada = False
+                if not banca and eh_linha_banca(prox):
+                    banca = prox
+                    banca_quebrada = not termina_com_ano(prox)
+                elif continuacao:
+                    # Linha da banca quebrada pelo PDF: o fim (com o ano) vem logo abaixo
+                    banca = f"{banca} {prox}"
+                elif not assunto and " - " in prox and prox != banca:
+                    parts = prox.split(" - ", 1)
+                    if len(parts) > 1:
+                        assunto = parts[1].strip()
+                        materia_q = parts[0].strip()
+                    else:
+                        assunto = prox
+
+                match_num = REGEX_INICIO.match(prox)
+                if match_num:
+                    if not banca: banca = banca_padrao
+                    q_atual = {
+                        "numero": int(match_num.group(1)),
+                        "id_tec": novo_id,
+                        "link": f"www.tecconcursos.com.br/questoes/{novo_id}",
+                        "banca_orgao": banca,
+                        **separar_banca_orgao(banca),
+                        "materia": materia_q,
+                        "assunto": assunto,
+                        "gabarito": ""
+                    }
+                    if match_num.group(2): buffer_texto.append(match_num.group(2))
+                    consumidas = offset
+                    break
+
+            if q_atual is None:
+                if not banca: banca = banca_padrao
+                q_atual = {
+                    "numero": 0, "id_tec": novo_id,
+                    "link": f"www.tecconcursos.com.br/questoes/{novo_id}",
+                    "banca_orgao": banca, **separar_banca_orgao(banca),
+                    "materia": materia_q, "assunto": assunto, "gabarito": ""
+                }
+
+            # Devolve para a fila o que foi só espiado
+            pendentes.extendleft(reversed(janela[consumidas:]))
+            if pular is not None and pular(novo_id):
+                # Cópia de uma questão já capturada: sem q_atual, as linhas até a
+                # próxima URL não entram no buffer
+                q_atual = None
+                buffer_texto = []
+            continue
+
+        # 2. GABARITO
+        match_gab = regex_gabarito.search(linha)
+        if match_gab and q_atual:
+            q_atual['gabarito'] = match_gab.group(1).strip()
+
+        # 3. TEXTO
+        elif q_atual and "www.tecconcursos" not in linha:
+            buffer_texto.append(linha)
+
+    if q_atual:
+        yield q_atual, "\n".join(buffer_texto)
+
+# ==============================================================================
+# FATIAS (um PDF dividido entre processos)
+# ==============================================================================
+# Cada processo lê um intervalo de páginas e roda a máquina de estados a partir
+# de uma URL "segura"; o que fica antes dela (prefixo) e depois da última
+# questão aberta (sufixo) volta para o processo principal, que costura as
+# bordas. A saída é idêntica à leitura serial.
+
+def planejar_fatias(total_paginas, paginas_por_fatia=PAGINAS_POR_FATIA):
+    """Intervalos [inicio, fim) de páginas."""
+    return [(i, min(i + paginas_por_fatia, total_paginas))
+            for i in range(0, total_paginas, paginas_por_fatia)]
+
+def _primeira_ancora_segura(linhas):
+    """
+    Índice da primeira URL que o lookahead de uma URL anterior não alcança,
+    nem uma URL da fatia anterior. A partir dela a máquina de estados da
+    fatia anda junto com a da leitura serial. None se não houver.
+    """
+    alcance = JANELA_METADADOS + 1
+    ultima_url = None
+    for i, linha in enumerate(linhas):
+        if REGEX_URL.search(linha):
+            if i >= alcance and (ultima_url is None or i - ultima_url > alcance):
+                return i
+            ultima_url = i
+    return None
+
+def dividir_fatia(linhas, materia, banca_padrao="", regex_gabarito=REGEX_GABARITO_LIVRE):
+    """
+    Processa as linhas de uma fatia. Retorna um dict com:
+    - prefixo: linhas antes da âncora segura (continuação da fatia anterior);
+    - questoes: (questao, texto_completo) fechadas dentro da fatia;
+    - sufixo: linhas a partir da última questão aberta, ou None quando a
+      fatia inteira é continuação (nenhuma âncora segura).
+    """
+    inicio = _primeira_ancora_segura(linhas)
+    if inicio is None:
+        return {"prefixo": linhas, "questoes": [], "sufixo": None}
+
+    ancoras = []
+    questoes = list(extrair_questoes(linhas[inicio:], materia, banca_padrao, regex_gabarito, ancoras))
+    # A última questão só fecha na próxima fatia
+    return {
+        "prefixo": linhas[:inicio],
+        "questoes": questoes[:-1],
+        "sufixo": linhas[inicio + ancoras[-1]:],
+    }
+
+def extrair_fatia(caminho_pdf, inicio, fim, total_paginas, materia, banca_padrao="",
+                  regex_gabarito=REGEX_GABARITO_LIVRE, usar_cache=True, backend=BACKEND_PADRAO):
+    """Tarefa de um processo: lê as páginas [inicio, fim) e chama dividir_fatia."""
+    extrair, chave = _backend(backend)
+    if usar_cache:
+        textos = iterar_intervalo_com_cache(caminho_pdf, chave, extrair, inicio, fim, total_paginas)
+    else:
+        textos = extrair(caminho_pdf, inicio, fim)
+    return dividir_fatia(list(_linhas(textos)), materia, banca_padrao, regex_gabarito)
+
+def costurar_fatias(fatias, materia, banca_padrao="", regex_gabarito=REGEX_GABARITO_LIVRE):
+    """
+    Junta os resultados de dividir_fatia (na ordem das páginas) e gera as
+    mesmas (questao, texto_completo) da leitura serial. As bordas (sufixo de
+    uma fatia + prefixo das seguintes) passam de novo pela máquina de estados.
+    """
+    borda = []
+    for fatia in fatias:
+        borda += fatia["prefixo"]
+        if fatia["sufixo"] is None:
+            continue
+        yield from extrair_questoes(borda, materia, banca_padrao, regex_gabarito)
+        yield from fatia["questoes"]
+        borda = list(fatia["sufixo"])
+
+    borda.append("")  # o mesmo "" final do iterar_linhas_pdf
+    yield from extrair_questoes(borda, materia, banca_padrao, regex_gabarito)
+
+def iterar_questoes_pdf(caminho_pdf, materia, banca_padrao="", regex_gabarito=REGEX_GABARITO_LIVRE,
+                        usar_cache=True, backend=BACKEND_PADRAO, executor=None,
+                        paginas_por_fatia=PAGINAS_POR_FATIA, pular=None):
+    """
+    Gera (questao, texto_completo) de um PDF.
+
+    Sem executor a leitura é serial, em streaming. Com um executor (ex:
+    ProcessPoolExecutor), o PDF é dividido em fatias de paginas_por_fatia
+    páginas, extraídas em paralelo e costuradas na ordem. pular é o mesmo do
+    extrair_questoes; nas fatias ele é aplicado na costura, na mesma ordem.
+    """
+    if executor is None:
+        linhas = iterar_linhas_pdf(caminho_pdf, usar_cache, backend)
+        yield from extrair_questoes(linhas, materia, banca_padrao, regex_gabarito, pular=pular)
+        return
+
+    total = contar_paginas(caminho_pdf)
+    fatias = planejar_fatias(total, paginas_por_fatia)
+    n = len(fatias)
+    # map entrega na ordem; com PoolComTeto as fatias entram aos poucos
+    resultados = executor.map(extrair_fatia, [caminho_pdf] * n, [i for i, _ in fatias], [f for _, f in fatias],
+                              [total] * n, [materia] * n, [banca_padrao] * n, [regex_gabarito] * n,
+                              [usar_cache] * n, [backend] * n)
+    questoes = costurar_fatias(resultados, materia, banca_padrao, regex_gabarito)
+    if pular is None:
+        yield from questoes
+        return
+    for q, texto in questoes:
+        if not pular(q["id_tec"]):
+            yield q, texto
+
+# ==============================================================================
+# IDS JÁ CAPTURADOS (cadernos sobrepostos)
+# ==============================================================================
+class IdsVistos:
+    """
+    id_tec já capturados numa execução (id -> PDF de origem) e as cópias
+    puladas, contadas por (PDF em que a cópia apareceu, PDF de origem).
+
+    Vale a primeira cópia que entra no dataset: um ID só passa a ser de um
+    PDF depois do filtro do perfil (pular_repetidas), então uma cópia
+    descartada (anulada, sem gabarito) não impede a dos PDFs seguintes.
+    """
+
+    def __init__(self):
+        self.origem = {}
+        self.puladas = Counter()
+
+    def pular(self, id_tec, pdf):
+        """False na primeira vez (o ID passa a ser do pdf); True nas cópias, que são contadas."""
+        if id_tec not in self.origem:
+            self.origem[id_tec] = pdf
+            return False
+        self.puladas[(pdf, self.origem[id_tec])] += 1
+        return True
+
+    def pular_em(self, pdf):
+        """
+        O pular do extrair_questoes para as questões lidas de pdf: só as
+        cópias de IDs que um PDF anterior já deu ao dataset, antes da separação.
+        """
+        return lambda id_tec: id_tec in self.origem and self.pular(id_tec, pdf)
+
+    def registrar(self, ids, pdf):
+        """IDs que o pdf já deu ao dataset sem ser lido de novo (extração incremental)."""
+        for id_tec in ids:
+            self.origem.setdefault(id_tec, pdf)
+
+    def descartar(self, pdf):
+        """Esquece o que veio do pdf (leitura com erro, que não entra no dataset)."""
+        self.origem = {id_tec: origem for id_tec, origem in self.origem.items() if origem != pdf}
+        for chave in [chave for chave in self.puladas if chave[0] == pdf]:
+            del self.puladas[chave]
+
+    def total_puladas(self):
+        return sum(self.puladas.values())
+
+def abrir_executor(workers, teto_mb=None):
+    """
+    Pool de processos para as fatias, ou um contexto vazio (None) se
+    workers <= 1. Com teto_mb, um PoolComTeto (memoria.py).
+    """
+    if workers and workers > 1:
+        if teto_mb:
+            return PoolComTeto(workers, teto_mb)
+        return ProcessPoolExecutor(max_workers=workers)
+    return nullcontext()
@@ -0,0 +1,223 @@
+"""
+Leitura e gravação de datasets (listas de questões) registro a registro.
+
+Dois formatos, escolhidos pela extensão:
+
+    dataset_x_final.json    lista JSON, igual ao json.dump(indent=4) de sempre
+    dataset_x_final.jsonl   JSON Lines: uma questão por linha (opcional)
+
+Os leitores aceitam os dois e nunca montam a lista inteira: o .jsonl é lido
+linha a linha e o .json é decodificado item a item direto do arquivo. Quem
+pede "dataset_x_final.json" recebe o .jsonl se só ele existir (localizar),
+então as ferramentas seguintes da cadeia não precisam saber o formato.
+
+A gravação também é em streaming (EscritorRegistros), num .tmp trocado no
+final, e apaga a versão do outro formato: um dataset existe num formato só.
+
+Uso direto (converte entre os formatos):
+    python registros_json.py "../Informática/datasets/dataset_informatica_final.json" --formato jsonl
+"""
+import os
+import json
+import argparse
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+FORMATOS = ("json", "jsonl")
+FORMATO_PADRAO = "json"
+# Quanto do .json é lido por vez ao decodificar item a item
+TAMANHO_BLOCO = 1 << 16
+
+_decodificador = json.JSONDecoder()
+
+# ==============================================================================
+# CAMINHOS
+# ==============================================================================
+def formato_do_caminho(caminho):
+    return "jsonl" if str(caminho).endswith(".jsonl") else "json"
+
+def caminho_no_formato(caminho, formato):
+    """Mesmo caminho com a extensão do formato ("x.json" <-> "x.jsonl")."""
+    caminho = str(caminho)
+    base = caminho[:-1] if caminho.endswith(".jsonl") else caminho
+    if base.endswith(".json"):
+        base = base[:-len(".json")]
+    return f"{base}.{formato}"
+
+def _outro_formato(caminho):
+    return caminho_no_formato(caminho, "json" if formato_do_caminho(caminho) == "jsonl" else "jsonl")
+
+def localizar(caminho):
+    """O caminho pedido, ou o mesmo dataset no outro formato se só ele existir."""
+    caminho = str(caminho)
+    if not os.path.exists(caminho) and os.path.exists(_outro_formato(caminho)):
+        return _outro_formato(caminho)
+    return caminho
+
+# ==============================================================================
+# LEITURA
+# ==============================================================================
+def _iterar_jsonl(f):
+    for numero, linha in enumerate(f, 1):
+        linha = linha.strip()
+        if not linha:
+            continue
+        try:
+            yield json.loads(linha)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{f.name}, linha {numero}: {e}") from None
+
+def _iterar_lista_json(f):
+    # Decodifica um item por vez de um buffer que só guarda o item atual
+    buffer = ""
+    pos = 0
+    fim_arquivo = False
+
+    def proximo_caractere():
+        nonlocal buffer, pos, fim_arquivo
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos < len(buffer) or fim_arquivo:
+                return buffer[pos] if pos < len(buffer) else ""
+            bloco = f.read(TAMANHO_BLOCO)
+            buffer, pos = bloco, 0
+            fim_arquivo = not bloco
+
+    if proximo_caractere() != "[":
+        raise ValueError(f"{f.name}: o dataset deve ser uma lista JSON")
+    pos += 1
+
+    primeiro = True
+    while True:
+        c = proximo_caractere()
+        if c == "]":
+            return
+        if not c:
+            raise ValueError(f"{f.name}: lista JSON incompleta")
+        if not primeiro:
+            if c != ",":
+                raise ValueError(f"{f.name}: esperava ',' entre os itens")
+            pos += 1
+            proximo_caractere()
+        primeiro = False
+
+        while True:
+            try:
+                item, fim = _decodificador.raw_decode(buffer, pos)
+                # Um número no fim do buffer pode estar cortado; só vale com algo depois
+                if fim < len(buffer) or fim_arquivo:
+                    break
+            except json.JSONDecodeError:
+                if fim_arquivo:
+                    raise
+            bloco = f.read(TAMANHO_BLOCO)
+            buffer, pos = buffer[pos:] + bloco, 0
+            fim_arquivo = not bloco
+        pos = fim
+        yield item
+
+def iterar_registros(caminho):
+    """Gera os registros do dataset (.json ou .jsonl) um a um."""
+    caminho = localizar(caminho)
+    with open(caminho, 'r', encoding='utf-8') as f:
+        if formato_do_caminho(caminho) == "jsonl":
+            yield from _iterar_jsonl(f)
+        else:
+            yield from _iterar_lista_json(f)
+
+def carregar_registros(caminho):
+    """Lista completa, para quem precisa de acesso aleatório."""
+    return list(iterar_registros(caminho))
+
+# ==============================================================================
+# GRAVAÇÃO
+# ==============================================================================
+class EscritorRegistros:
+    """
+    Grava registros um a um em caminho (formato pela extensão). O arquivo só
+    aparece no fechar(); com gravar_vazio=False, um escritor sem registros não
+    cria nem apaga nada.
+    """
+
+    def __init__(self, caminho, gravar_vazio=True):
+        self.caminho = str(caminho)
+        self.formato = formato_do_caminho(self.caminho)
+        self.gravar_vazio = gravar_vazio
+        self.total = 0
+        self._temporario = f"{self.caminho}.{os.getpid()}.tmp"
+        self._f = None
+
+    def _abrir(self):
+        self._f = open(self._temporario, 'w', encoding='utf-8')
+
+    def escrever(self, registro):
+        if self._f is None:
+            self._abrir()
+        if self.formato == "jsonl":
+            self._f.write(json.dumps(registro, ensure_ascii=False))
+            self._f.write("\n")
+        else:
+            # Mesmo texto do json.dump(lista, indent=4): cada item recuado um nível
+            texto = json.dumps(registro, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+            self._f.write(("[\n    " if self.total == 0 else ",\n    ") + texto)
+        self.total += 1
+
+    def fechar(self):
+        if self._f is None:
+            if not self.gravar_vazio:
+                return
+            self._abrir()
+        if self.formato == "json":
+            self._f.write("[]" if self.total == 0 else "\n]")
+        self._f.close()
+        os.replace(self._temporario, self.caminho)
+        outro = _outro_formato(self.caminho)
+        if os.path.exists(outro):
+            os.remove(outro)
+
+    def descartar(self):
+        if self._f is not None:
+            self._f.close()
+            os.remove(self._temporario)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, tb):
+        if tipo is None:
+            self.fechar()
+        else:
+            self.descartar()
+
+def gravar_registros(registros, caminho, gravar_vazio=True):
+    """Grava um iterável de registros; retorna quantos foram gravados."""
+    with EscritorRegistros(caminho, gravar_vazio) as escritor:
+        for registro in registros:
+            escritor.escrever(registro)
+    return escritor.total
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Converte datasets entre JSON (lista) e JSON Lines.")
+    parser.add_argument("arquivos", nargs="+", help="Datasets .json ou .jsonl")
+    parser.add_argument("--formato", choices=FORMATOS, required=True, help="Formato de destino")
+    args = parser.parse_args()
+
+    for caminho in args.arquivos:
+        origem = localizar(caminho)
+        if not os.path.exists(origem):
+            print(f"❌ Arquivo {caminho} não encontrado.")
+            continue
+        destino = caminho_no_formato(origem, args.formato)
+        if destino == origem:
+            print(f"✅ {origem} já está em {args.formato}")
+            continue
+        total = gravar_registros(iterar_registros(origem), destino)
+        print(f"💾 {origem} -> {destino} ({total} registros)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Ressegmentação em lote das questões com separação Comando/Enunciado falha.
+
+Vale para qualquer dataset_*.json (ou .jsonl) dos extratores. Só entram as
+questões com o enunciado vazio, com "[Enunciado não separado
+automaticamente]" ou com a flag FALHA_SEPARACAO dos analyzers; nelas o
+comando guarda o texto inteiro, que passa de novo pelo
+separar_comando_enunciado com os gatilhos e o limite de fallback do perfil
+da matéria (perfis_materias.json), num pool de processos.
+
+Nos datasets compactados o texto associado (textos_associados.json da
+pasta) é resolvido antes da separação. No patch o comando volta a ser só o
+resto depois do texto, com a mesma referência; se a nova separação cortar
+dentro do texto, o patch leva o comando inteiro e tira a referência.
+
+O dataset não é reescrito: as questões que agora separam vão para um patch
+ao lado dele (<dataset>_patch_segmentacao.json), com id_tec, a posição no
+dataset e o novo comando/enunciado. Confira o patch e aplique com --aplicar;
+as questões corrigidas perdem a flag FALHA_SEPARACAO.
+
+A matéria vem da pasta do dataset (<Matéria>/datasets/) ou de --materia.
+Matérias sem gatilhos no perfil (Raciocínio Lógico) usam os do combiner
+(português, fallback de 600).
+
+Uso:
+    python ressegmentar.py "../Direito Administrativo/datasets/dataset_administrativo_final.json"
+    python ressegmentar.py "../Regimentos e Código de Ética/datasets/dataset_regimentos_final.json" --aplicar
+"""
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from extrator_materias import carregar_perfis, limpar_texto, REGISTRO
+from segmentador import separar_comando_enunciado
+from memo_segmentacao import memo_segmentacao
+from registros_json import iterar_registros, localizar, gravar_registros, EscritorRegistros
+from textos_associados import carregar_textos, expandir_comando
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+MARCA_FALHA = "[Enunciado não separado automaticamente]"
+FLAG_FALHA = "FALHA_SEPARACAO"
+STATUS_REVISAR = "REVISAR"
+STATUS_APROVADA = "APROVADA"
+SUFIXO_PATCH = "_patch_segmentacao"
+# Gatilhos do combiner, para perfis sem "gatilhos" (formato mapa)
+GATILHOS_PADRAO = "pt"
+LIMITE_PADRAO = 600
+# Abaixo disto por processo, o pool custa mais do que a separação
+MIN_POR_PROCESSO = 500
+
+# ==============================================================================
+# SELEÇÃO
+# ==============================================================================
+def separacao_falhou(q):
+    enunciado = (q.get('enunciado') or "").strip()
+    return not enunciado or MARCA_FALHA in enunciado or FLAG_FALHA in (q.get('qa_flags') or [])
+
+def _comando(q, textos):
+    try:
+        return expandir_comando(q, textos), q.get('texto_associado')
+    except KeyError:
+        return q.get('comando') or "", None
+
+def texto_completo(q, textos):
+    """
+    (texto antes da separação, chave do texto associado resolvido ou None).
+    Numa separação falha, tudo ficou no comando.
+    """
+    comando, chave = _comando(q, textos)
+    enunciado = (q.get('enunciado') or "").strip()
+    if not enunciado or MARCA_FALHA in enunciado:
+        return comando, chave
+    return f"{comando}\n\n{enunciado}", chave
+
+def selecionar_falhas(caminho, textos):
+    """[(indice, id_tec, texto, chave)] das questões com a separação falha."""
+    return [(indice, q.get('id_tec'), *texto_completo(q, textos))
+            for indice, q in enumerate(iterar_registros(caminho))
+            if 'comando' in q and separacao_falhou(q)]
+
+def perfil_do_dataset(caminho, perfis, materia=None):
+    materia = materia or os.path.basename(os.path.dirname(os.path.dirname(os.path.abspath(caminho))))
+    return perfis.get(materia)
+
+# ==============================================================================
+# RESSEGMENTAÇÃO (um lote por processo)
+# ==============================================================================
+def _separar_lote(chave_gatilhos, limite_fallback, textos):
+    memo = memo_segmentacao(separar_comando_enunciado, REGISTRO["gatilhos"][chave_gatilhos], limite_fallback)
+    resultado = [memo.calcular(texto) for texto in textos]
+    memo.gravar()
+    return resultado
+
+def ressegmentar(falhas, chave_gatilhos, limite_fallback, workers):
+    """Novo (comando, enunciado) de cada falha, na mesma ordem."""
+    textos = [texto for _, _, texto, _ in falhas]
+    processos = max(1, min(workers, len(textos) // MIN_POR_PROCESSO))
+    if processos == 1:
+        return _separar_lote(chave_gatilhos, limite_fallback, textos)
+
+    tamanho = -(-len(textos) // processos)
+    lotes = [textos[i:i + tamanho] for i in range(0, len(textos), tamanho)]
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        partes = executor.map(_separar_lote, [chave_gatilhos] * len(lotes), [limite_fallback] * len(lotes), lotes)
+        return [par for parte in partes for par in parte]
+
+def recompactar(comando, chave, textos):
+    """
+    (comando, texto_associado) do patch: o resto depois do texto associado,
+    como no dataset compactado, ou o comando inteiro com a referência None
+    quando a separação cortou dentro do texto.
+    """
+    texto = textos[chave].rstrip()
+    if comando.startswith(texto):
+        return comando[len(texto):].lstrip(), chave
+    return comando, None
+
+def montar_patch(falhas, separados, textos):
+    """Só as questões que agora separam; as que continuam falhando ficam de fora."""
+    patch = []
+    for (indice, id_tec, _, chave), (comando, enunciado) in zip(falhas, separados):
+        comando, enunciado = limpar_texto(comando), limpar_texto(enunciado)
+        if not enunciado or MARCA_FALHA in enunciado:
+            continue
+        item = {"indice": indice, "id_tec": id_tec}
+        if chave:
+            comando, item["texto_associado"] = recompactar(comando, chave, textos)
+        patch.append({**item, "comando": comando, "enunciado": enunciado})
+    return patch
+
+def caminho_patch(caminho):
+    base, extensao = os.path.splitext(caminho)
+    return f"{base}{SUFIXO_PATCH}{extensao}"
+
+# ==============================================================================
+# APLICAÇÃO DO PATCH
+# ==============================================================================
+def _limpar_flag_falha(q):
+    # Sem a flag, a questão deixa de ser selecionada e de constar como falha;
+    # sem nenhuma flag, volta ao status de aprovada dos analyzers
+    if FLAG_FALHA not in (q.get('qa_flags') or []):
+        return
+    q['qa_flags'] = [flag for flag in q['qa_flags'] if flag != FLAG_FALHA]
+    if not q['qa_flags'] and q.get('qa_status') == STATUS_REVISAR:
+        q['qa_status'] = STATUS_APROVADA
+
+def aplicar_patch(caminho, caminho_do_patch):
+    """Reescreve o dataset com o patch aplicado (por id_tec; sem id, pela posição)."""
+    por_id = {}
+    por_indice = {}
+    for item in iterar_registros(caminho_do_patch):
+        if item.get('id_tec'):
+            por_id[item['id_tec']] = item
+        else:
+            por_indice[item['indice']] = item
+
+    aplicados = 0
+    with EscritorRegistros(caminho) as escritor:
+        for indice, q in enumerate(iterar_registros(caminho)):
+            item = por_id.get(q.get('id_tec')) if q.get('id_tec') else por_indice.get(indice)
+            if item and separacao_falhou(q):
+                if 'texto_associado' in item and not item['texto_associado']:
+                    q.pop('texto_associado', None)
+                q['comando'] = item['comando']
+                q['enunciado'] = item['enunciado']
+                _limpar_flag_falha(q)
+                aplicados += 1
+            escritor.escrever(q)
+    return aplicados
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def processar_dataset(caminho, perfis, args):
+    perfil = perfil_do_dataset(caminho, perfis, args.materia)
+    if perfil is None:
+        print(f"❌ {caminho}: matéria não identificada (use --materia)")
+        return
+
+    patch = caminho_patch(caminho)
+    if args.aplicar:
+        if not os.path.exists(localizar(patch)):
+            print(f"❌ Patch {patch} não encontrado. Rode sem --aplicar antes.")
+            return
+        aplicados = aplicar_patch(caminho, localizar(patch))
+        print(f"💾 {caminho}: {aplicados} questões corrigidas pelo patch")
+        return
+
+    chave_gatilhos = perfil.get("gatilhos", GATILHOS_PADRAO)
+    limite = perfil.get("limite_fallback", LIMITE_PADRAO) if "gatilhos" in perfil else LIMITE_PADRAO
+
+    textos = carregar_textos(os.path.dirname(caminho))
+    falhas = selecionar_falhas(caminho, textos)
+    print(f"🔎 {caminho}: {len(falhas)} questões com separação falha "
+          f"(gatilhos: {chave_gatilhos} | fallback: {limite})")
+    if not falhas:
+        return
+
+    itens = montar_patch(falhas, ressegmentar(falhas, chave_gatilhos, limite, args.workers), textos)
+    print(f"   ✅ Separadas agora: {len(itens)} | ⚠️  Continuam falhando: {len(falhas) - len(itens)}")
+    if itens:
+        gravar_registros(itens, patch)
+        print(f"   💾 Patch salvo: {patch}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Refaz a separação Comando/Enunciado das questões que falharam.")
+    parser.add_argument("arquivos", nargs="+", help="Datasets .json ou .jsonl")
+    parser.add_argument("-m", "--materia", default=None,
+                        help="Perfil da matéria (Padrão: a pasta do dataset)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="Processos para a separação (Padrão: número de núcleos)")
+    parser.add_argument("--aplicar", action="store_true",
+                        help="Aplica o patch já gerado ao dataset, em vez de gerar um novo")
+    args = parser.parse_args()
+
+    perfis = carregar_perfis()
+    for caminho in args.arquivos:
+        caminho = localizar(caminho)
+        if not os.path.exists(caminho):
+            print(f"❌ Arquivo {caminho} não encontrado.")
+            continue
+        processar_dataset(caminho, perfis, args)
+
+if __name__ == "__main__":
+    main()
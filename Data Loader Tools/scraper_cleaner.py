@@ -1,4 +1,3 @@
-import json
 import time
 import random
 import re
@@ -11,6 +10,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 
+from segmentador import inicio_ultimo_gatilho
+from registros_json import carregar_registros, gravar_registros, localizar
+
 # ==============================================================================
 # CONFIGURAÇÃO
 # ==============================================================================
@@ -96,21 +98,11 @@ def separar_comando_enunciado(html_completo):
     # Extrai texto puro para achar o enunciado
     texto_puro = BeautifulSoup(html_completo, "html.parser").get_text("\n")
     
-    gatilhos = [
-        r'(julgue\s+o(s)?\s+.*?(item|itens)\s+(a\s+seguir|seguintes?|subsequentes?|próximos?|abaixo).*)',
-        r'(julgue\s+o(s)?\s+(seguintes?|próximos?|subsequentes?)\s+(item|itens).*)',
-        r'(julgue\s+o(s)?\s+.*?(item|itens).*)',
-        r'(assinale\s+a\s+opção\s+correta.*)',
-        r'(com\s+relação\s+a.*?julgue\s+o\s+item.*)'
-    ]
+    # Gatilho que aparece mais tarde no texto; o enunciado vai dele até o fim
+    inicio = inicio_ultimo_gatilho(texto_puro)
     enunciado_extraido = ""
-    match_pos = -1
-    for g in gatilhos:
-        iterator = re.finditer(g, texto_puro, re.IGNORECASE | re.DOTALL)
-        for match in iterator:
-            if match.start() > match_pos:
-                match_pos = match.start()
-                enunciado_extraido = match.group(0) # Pega o match bruto primeiro
+    if inicio is not None:
+        enunciado_extraido = texto_puro[inicio:]  # Pega o match bruto primeiro
     
     # LIMPEZA DO ENUNCIADO (NOVO)
     if enunciado_extraido:
@@ -154,14 +146,15 @@ def main():
     parser.add_argument("--preview", action="store_true", help="Processa apenas as 10 primeiras questões para teste.")
     
     args = parser.parse_args()
+    # O mapa de gabaritos pode estar em .json ou .jsonl
+    args.arquivo_json = localizar(args.arquivo_json)
 
     if not os.path.exists(args.arquivo_json):
         print(f"❌ Arquivo {args.arquivo_json} não encontrado.")
         return
 
     # 1. Carrega Mapa
-    with open(args.arquivo_json, 'r', encoding='utf-8') as f:
-        questoes_map = json.load(f)
+    questoes_map = carregar_registros(args.arquivo_json)
     
     db_questoes = {q['id_tec']: q for q in questoes_map}
     total_questoes = len(questoes_map)
@@ -246,8 +239,7 @@ def main():
             if capturadas_sessao % 20 == 0 and capturadas_sessao > 0:
                 print(f"💾 Salvando progresso...")
                 lista_final = list(db_questoes.values())
-                with open(nome_saida, 'w', encoding='utf-8') as f:
-                    json.dump(lista_final, f, indent=4, ensure_ascii=False)
+                gravar_registros(lista_final, nome_saida)
 
             # 4. Navega para Próxima
             tempo_espera = random.uniform(1.0, 1.5)
@@ -273,8 +265,7 @@ def main():
     
     total_ricos = sum(1 for q in lista_final if q.get('capturado'))
     
-    with open(nome_saida, 'w', encoding='utf-8') as f:
-        json.dump(lista_final, f, indent=4, ensure_ascii=False)
+    gravar_registros(lista_final, nome_saida)
         
     print(f"📊 Relatório Final:")
     print(f"   Enriquecidos: {total_ricos}")
@@ -0,0 +1,171 @@
+"""
+Separação Comando/Enunciado compartilhada pelos extratores, combiner e scrapers.
+
+Cada gatilho é escrito em partes: um prefixo e os trechos que o regex antigo
+procurava com ".*?" entre eles. Ex: o antigo
+    julgue\\s+o(s)?\\s+.*?(item|itens).*?(:|\\.)
+vira
+    (r'julgue\\s+o(s)?\\s+', r'(item|itens)')
+e o terminador (":" ou ".") é implícito.
+
+O motor resolve cada parte com uma busca só para frente a partir do cursor
+(pattern.search(texto, pos)), sem o backtracking do ".*?" com DOTALL que fazia
+os finditer antigos reescanearem o texto inteiro a cada "julgue" sem "item".
+O custo fica linear no tamanho do texto, e as posições encontradas são as
+mesmas do re.finditer(g, texto, IGNORECASE | DOTALL) de cada gatilho.
+
+Alterar um gatilho aqui altera todos os extratores do mesmo idioma.
+"""
+import re
+from functools import lru_cache
+
+# ==============================================================================
+# GATILHOS
+# ==============================================================================
+FLAGS = re.IGNORECASE | re.DOTALL
+TERMINADOR = r'(:|\.)'
+
+# Extratores de PDF (Português)
+GATILHOS_PT = (
+    # julgue o(s) ... item(s) a seguir/seguintes/subsequentes/próximos ... (:|.)
+    (r'julgue\s+o(s)?\s+', r'(item|itens)\s+(a\s+seguir|seguintes?|subsequentes?|próximos?)'),
+    # julgue os seguintes itens ... (:|.)
+    (r'julgue\s+o(s)?\s+(seguintes?|próximos?|subsequentes?)\s+(item|itens)',),
+    # julgue o item ... de acordo ... (:|.)
+    (r'julgue\s+o(s)?\s+(item|itens)', r'de\s+acordo'),
+    # julgue o(s) ... item(s) ... (:|.)
+    (r'julgue\s+o(s)?\s+', r'(item|itens)'),
+    (r'assinale\s+a\s+opção\s+correta',),
+)
+
+# Língua Inglesa
+GATILHOS_EN = (
+    # Ex: "Judge the following item concerning the ideas..."
+    (r'Judge\s+the\s+(following|next|subsequent)?\s*items?',),
+    (r'Judge\s+the\s+', r'items?'),
+    # Ex: "Based on the infographic presented, judge the following item."
+    (r'Based\s+on\s+the\s+', r'judge'),
+    (r'Considering\s+the\s+', r'judge'),
+    (r'Choose\s+the\s+correct\s+option',),
+)
+
+# Scrapers (texto puro do HTML): o enunciado vai do gatilho até o fim do texto
+GATILHOS_WEB = (
+    (r'julgue\s+o(s)?\s+', r'(item|itens)\s+(a\s+seguir|seguintes?|subsequentes?|próximos?|abaixo)'),
+    (r'julgue\s+o(s)?\s+(seguintes?|próximos?|subsequentes?)\s+(item|itens)',),
+    (r'julgue\s+o(s)?\s+', r'(item|itens)'),
+    (r'assinale\s+a\s+opção\s+correta',),
+    (r'com\s+relação\s+a', r'julgue\s+o\s+item'),
+)
+
+# ==============================================================================
+# MOTOR
+# ==============================================================================
+@lru_cache(maxsize=None)
+def compilar_gatilhos(gatilhos):
+    """Regexes das partes de cada gatilho, compilados uma vez por processo."""
+    return tuple(tuple(re.compile(p, FLAGS) for p in gatilho) for gatilho in gatilhos)
+
+_TERMINADOR = re.compile(TERMINADOR, FLAGS)
+
+def _ocorrencias(texto, partes, terminador):
+    """
+    Gera (inicio, fim) de cada ocorrência do gatilho, na mesma sequência do
+    re.finditer do regex equivalente. Sem terminador, a ocorrência vai até o
+    fim do texto (o ".*" guloso dos scrapers).
+    """
+    prefixo = partes[0]
+    passos = partes[1:] + ((terminador,) if terminador else ())
+    # Última busca de cada passo: (desde, match). Um None vale para qualquer
+    # cursor >= desde, assim um gatilho sem fecho não reescaneia o texto.
+    ultima = [None] * len(passos)
+
+    def buscar(i, pos):
+        memo = ultima[i]
+        if memo and memo[0] <= pos and (memo[1] is None or pos <= memo[1].start()):
+            return memo[1]
+        achado = passos[i].search(texto, pos)
+        ultima[i] = (pos, achado)
+        return achado
+
+    pos = 0
+    while True:
+        m = prefixo.search(texto, pos)
+        if not m:
+            return
+
+        cursor = m.end()
+        for i in range(len(passos)):
+            achado = buscar(i, cursor)
+            if not achado:
+                cursor = None
+                break
+            cursor = achado.end()
+
+        if cursor is None:
+            # Como no regex: tenta o próximo início possível
+            pos = m.start() + 1
+            continue
+
+        fim = cursor if terminador else len(texto)
+        yield m.start(), fim
+        pos = fim
+
+def fim_do_comando(texto, gatilhos=GATILHOS_PT):
+    """
+    Posição logo após o ÚLTIMO gatilho válido (o que termina mais adiante sem
+    encostar no fim do texto), ou None se nenhum casar.
+    """
+    limite = len(texto) - 2
+    melhor = None
+    for partes in compilar_gatilhos(gatilhos):
+        for _, fim in _ocorrencias(texto, partes, _TERMINADOR):
+            if fim >= limite:
+                break  # os fins só crescem
+            if melhor is None or fim > melhor:
+                melhor = fim
+    return melhor
+
+def inicio_ultimo_gatilho(texto, gatilhos=GATILHOS_WEB):
+    """
+    Versão dos scrapers: início do gatilho que aparece mais tarde no texto,
+    considerando a primeira ocorrência de cada um (o ".*" consome o resto).
+    """
+    melhor = None
+    for partes in compilar_gatilhos(gatilhos):
+        for inicio, _ in _ocorrencias(texto, partes, None):
+            if melhor is None or inicio > melhor:
+                melhor = inicio
+    return melhor
+
+# ==============================================================================
+# SEPARAÇÃO
+# ==============================================================================
+def separar_comando_enunciado(texto_completo, gatilhos=GATILHOS_PT, limite_fallback=600):
+    """
+    Separa o Comando (Contexto/Instrução) do Enunciado (Assertiva).
+
+    - gatilhos: GATILHOS_PT ou GATILHOS_EN.
+    - limite_fallback: tamanho máximo do último parágrafo para ser aceito como
+      enunciado quando nenhum gatilho casa (varia por matéria).
+    """
+    if not texto_completo: return "", ""
+
+    fim = fim_do_comando(texto_completo, gatilhos)
+    if fim is not None:
+        comando = texto_completo[:fim].strip()
+        enunciado = texto_completo[fim:].strip()
+        enunciado = re.sub(r'^[\.\:\-\s]+', '', enunciado)
+        # Limpa o gabarito que vaza no final (no Inglês o TEC mantém em PT)
+        enunciado = re.sub(r'\s+(Certo|Errado)$', '', enunciado, flags=re.IGNORECASE)
+        return comando, enunciado
+
+    # Fallback estrutural
+    partes = texto_completo.split('\n\n')
+    if len(partes) >= 2:
+        enunciado_cand = partes[-1].strip()
+        if len(enunciado_cand) < limite_fallback:
+            comando = "\n\n".join(partes[:-1]).strip()
+            return comando, enunciado_cand
+
+    return texto_completo, "[Enunciado não separado automaticamente]"
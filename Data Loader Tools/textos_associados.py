@@ -0,0 +1,264 @@
+"""
+Repositório de "textos associados" (os textos de leitura que o TEC repete no
+comando de cada item do mesmo bloco, ex: "Texto CG1A1-I ...").
+
+O texto é guardado uma vez só, endereçado pelo conteúdo, num arquivo por
+pasta (ao lado dos datasets da matéria, ou dos simulados gerados):
+
+    textos_associados.json   {"<sha256[:16]>": "Texto CG1A1-I\\n...", ...}
+
+A questão fica com a referência e só o resto do comando (a instrução):
+
+    {"texto_associado": "<chave>", "comando": "Considerando ..., julgue o item a seguir.", ...}
+
+O comando original é sempre texto + comando, sem perda. Só viram referência
+os textos longos repetidos em mais de uma questão, ou que já estão no
+repositório. No banco o mesmo vale para a tabela texto_associado e a coluna
+questao.texto_associado.
+
+Dois formatos de comando:
+    - texto dos PDFs: o texto vai até a quebra de linha antes da instrução;
+    - HTML dos scrapers: o texto é o quadro <div> do TEC (com o título
+      "<p><strong>Texto CG4A1</strong></p>" antes dele, se houver).
+
+Uso direto (compacta/expande datasets ou simulados já gravados):
+    python textos_associados.py "../Língua Portuguesa/datasets/dataset_portugues_final.json"
+    python textos_associados.py generated_simulados/*.json
+    python textos_associados.py dataset.json --expandir
+    python textos_associados.py dataset_x_final.jsonl
+"""
+import os
+import re
+import json
+import hashlib
+import argparse
+from collections import Counter, defaultdict
+
+from registros_json import carregar_registros, gravar_registros, formato_do_caminho, localizar
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+ARQUIVO_TEXTOS = "textos_associados.json"
+TAMANHO_CHAVE = 16
+# Textos menores que isto continuam inline (não compensa a referência)
+TAMANHO_MINIMO = 200
+# No HTML, o quadro do texto tem que começar até aqui (depois só cabe o título)
+INICIO_MAXIMO_QUADRO = 300
+CADERNOS_SIMULADO = ("caderno_basico", "caderno_especifico")
+
+REGEX_DIV = re.compile(r'<(/?)div\b[^>]*>', re.IGNORECASE)
+
+# ==============================================================================
+# SEPARAÇÃO
+# ==============================================================================
+def chave_texto(texto):
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()[:TAMANHO_CHAVE]
+
+def _fim_texto_html(comando):
+    primeiro = REGEX_DIV.search(comando)
+    if not primeiro or primeiro.group(1) or primeiro.start() > INICIO_MAXIMO_QUADRO:
+        return None
+    profundidade = 0
+    for m in REGEX_DIV.finditer(comando, primeiro.start()):
+        profundidade += -1 if m.group(1) else 1
+        if profundidade == 0:
+            return m.end()
+    return None
+
+def _fim_texto_pdf(comando):
+    # Linhas que começam em minúscula são continuação da instrução quebrada pelo PDF
+    pos = comando.rfind("\n")
+    while pos > 0 and comando[pos + 1:pos + 2].islower():
+        pos = comando.rfind("\n", 0, pos)
+    return pos + 1 if pos > 0 else None
+
+def separar_texto_associado(comando):
+    """
+    Divide o comando em (texto, resto), com texto + resto == comando.
+    Retorna (None, comando) quando não há texto longo.
+    """
+    if not comando:
+        return None, comando
+    if comando.lstrip().startswith("<"):
+        fim = _fim_texto_html(comando)
+    else:
+        fim = _fim_texto_pdf(comando)
+    if fim is None or fim < TAMANHO_MINIMO:
+        return None, comando
+    return comando[:fim], comando[fim:]
+
+def expandir_comando(q, textos):
+    """Comando completo da questão, com o texto associado resolvido."""
+    chave = q.get("texto_associado")
+    if not chave:
+        return q.get("comando") or ""
+    if chave not in textos:
+        raise KeyError(f"texto associado {chave} não encontrado (id_tec {q.get('id_tec')})")
+    return textos[chave] + (q.get("comando") or "")
+
+def expandir_questao(q, textos):
+    """Cópia da questão no formato antigo (comando completo, sem referência)."""
+    nova = {k: v for k, v in q.items() if k != "texto_associado"}
+    nova["comando"] = expandir_comando(q, textos)
+    return nova
+
+def compactar_questoes(questoes, textos):
+    """
+    Troca o texto associado das questões por referência, in-place. textos é o
+    repositório (chave -> texto), atualizado com os textos novos. Questões já
+    compactadas ficam como estão. Retorna quantas questões foram compactadas.
+    """
+    questoes = [q for q in questoes if not q.get("texto_associado")]
+    partes = [separar_texto_associado(q.get("comando") or "") for q in questoes]
+
+    # Conta questões distintas: a mesma questão em final/aprovado não é repetição
+    repeticoes = Counter(texto for texto, id_tec in
+                         {(texto, q.get("id_tec")) for q, (texto, _) in zip(questoes, partes) if texto})
+    compactadas = 0
+    for q, (texto, resto) in zip(questoes, partes):
+        if not texto:
+            continue
+        chave = chave_texto(texto)
+        if repeticoes[texto] < 2 and chave not in textos:
+            continue
+        textos[chave] = texto
+        _referenciar(q, chave, resto)
+        compactadas += 1
+    return compactadas
+
+def _referenciar(q, chave, resto):
+    # Mantém a ordem dos campos, com a referência logo antes do comando
+    campos = list(q.items())
+    q.clear()
+    for campo, valor in campos:
+        if campo == "comando":
+            q["texto_associado"] = chave
+            valor = resto
+        q[campo] = valor
+
+def questoes_simulado(simulado):
+    return [q for caderno in CADERNOS_SIMULADO for q in simulado.get(caderno, [])]
+
+# ==============================================================================
+# REPOSITÓRIO EM DISCO
+# ==============================================================================
+def carregar_textos(pasta=""):
+    caminho = os.path.join(pasta, ARQUIVO_TEXTOS)
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def salvar_textos(textos, pasta=""):
+    with open(os.path.join(pasta, ARQUIVO_TEXTOS), 'w', encoding='utf-8') as f:
+        json.dump(textos, f, indent=4, ensure_ascii=False, sort_keys=True)
+
+def compactar_datasets(listas, pasta_saida=""):
+    """
+    Para o consolidar() dos extratores: compacta as listas de questões que vão
+    para pasta_saida (um texto compartilhado entre elas entra uma vez) e grava
+    o repositório, mantendo as entradas já existentes.
+    """
+    textos = carregar_textos(pasta_saida)
+    total = compactar_questoes((q for lista in listas for q in lista), textos)
+    if textos:
+        salvar_textos(textos, pasta_saida)
+    print(f"📚 Textos associados: {total} questões referenciando {len(textos)} textos")
+    return total
+
+# ==============================================================================
+# BANCO (tabela texto_associado + coluna questao.texto_associado)
+# ==============================================================================
+SQL_TABELA_TEXTOS = f"""
+    CREATE TABLE IF NOT EXISTS texto_associado (
+        hash VARCHAR({TAMANHO_CHAVE}) PRIMARY KEY,
+        texto TEXT NOT NULL,
+        created_at TIMESTAMP NOT NULL DEFAULT NOW()
+    )
+"""
+SQL_COLUNA_QUESTAO = f"""
+    ALTER TABLE questao ADD COLUMN IF NOT EXISTS
+        texto_associado VARCHAR({TAMANHO_CHAVE}) REFERENCES texto_associado (hash)
+"""
+
+def preparar_banco(cursor):
+    cursor.execute(SQL_TABELA_TEXTOS)
+    cursor.execute(SQL_COLUNA_QUESTAO)
+
+def gravar_texto_banco(cursor, chave, textos, gravados):
+    """Insere o texto da chave uma vez por carga (gravados: set de chaves)."""
+    if chave in gravados:
+        return
+    if chave not in textos:
+        raise KeyError(f"texto associado {chave} não encontrado em {ARQUIVO_TEXTOS}")
+    cursor.execute(
+        "INSERT INTO texto_associado (hash, texto) VALUES (%s, %s) ON CONFLICT (hash) DO NOTHING",
+        (chave, textos[chave])
+    )
+    gravados.add(chave)
+
+def buscar_textos_banco(cursor, chaves):
+    """chave -> texto das chaves pedidas, numa consulta só."""
+    chaves = sorted(set(chaves))
+    if not chaves:
+        return {}
+    cursor.execute("SELECT hash, texto FROM texto_associado WHERE hash = ANY(%s)", (chaves,))
+    return dict(cursor.fetchall())
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def processar_pasta(pasta, caminhos, expandir=False):
+    """Compacta (ou expande) juntos os arquivos de uma pasta, com o repositório dela."""
+    textos = carregar_textos(pasta)
+    arquivos = {}
+    for caminho in caminhos:
+        if formato_do_caminho(caminho) == "jsonl":
+            arquivos[caminho] = carregar_registros(caminho)
+        else:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                arquivos[caminho] = json.load(f)
+
+    if expandir:
+        for caminho, dados in arquivos.items():
+            if isinstance(dados, dict):  # simulado
+                for caderno in CADERNOS_SIMULADO:
+                    dados[caderno] = [expandir_questao(q, textos) for q in dados.get(caderno, [])]
+            else:
+                arquivos[caminho] = [expandir_questao(q, textos) for q in dados]
+    else:
+        questoes = []
+        for dados in arquivos.values():
+            questoes.extend(questoes_simulado(dados) if isinstance(dados, dict) else dados)
+        total = compactar_questoes(questoes, textos)
+        salvar_textos(textos, pasta)
+        print(f"📚 {pasta or '.'}: {total} questões referenciando {len(textos)} textos")
+
+    for caminho, dados in arquivos.items():
+        antes = os.path.getsize(caminho)
+        if isinstance(dados, dict):  # simulado
+            with open(caminho, 'w', encoding='utf-8') as f:
+                json.dump(dados, f, indent=4, ensure_ascii=False)
+        else:
+            gravar_registros(dados, caminho)
+        print(f"   📄 {os.path.basename(caminho)}: {antes / 1024:.0f} KB -> {os.path.getsize(caminho) / 1024:.0f} KB")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compacta/expande textos associados de datasets e simulados.")
+    parser.add_argument("arquivos", nargs="+", help="Datasets (lista de questões) ou simulados JSON")
+    parser.add_argument("--expandir", action="store_true", help="Volta ao formato com o texto dentro do comando")
+    args = parser.parse_args()
+
+    por_pasta = defaultdict(list)
+    for caminho in map(localizar, args.arquivos):
+        if not os.path.exists(caminho):
+            print(f"❌ Arquivo {caminho} não encontrado.")
+        elif os.path.basename(caminho) != ARQUIVO_TEXTOS:
+            por_pasta[os.path.dirname(caminho)].append(caminho)
+
+    for pasta, caminhos in por_pasta.items():
+        processar_pasta(pasta, caminhos, args.expandir)
+
+if __name__ == "__main__":
+    main()
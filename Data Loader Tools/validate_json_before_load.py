@@ -4,11 +4,12 @@ Script de validação do JSON de questões (sem conexão ao banco).
 Útil para verificar a integridade dos dados antes da carga.
 """
 
-import json
 import sys
 from pathlib import Path
 from collections import Counter
 
+from registros_json import iterar_registros, localizar
+
 # Mapeamento de gabaritos aceitos
 GABARITO_MAP = {
     'CERTO': 'CERTO', 'C': 'CERTO', 'V': 'CERTO', 'VERDADEIRO': 'CERTO', 'TRUE': 'CERTO',
@@ -39,7 +40,7 @@ def main():
         print("Uso: python validar_json.py arquivo.json")
         sys.exit(1)
     
-    arquivo = Path(sys.argv[1])
+    arquivo = Path(localizar(sys.argv[1]))
     if not arquivo.exists():
         print(f"Erro: Arquivo não encontrado: {arquivo}")
         sys.exit(1)
@@ -49,13 +50,6 @@ def main():
     print(f"{'='*60}")
     print(f"Arquivo: {arquivo.name}\n")
     
-    # Carregar JSON
-    with open(arquivo, 'r', encoding='utf-8') as f:
-        questoes = json.load(f)
-    
-    total = len(questoes)
-    print(f"Total de questões: {total}\n")
-    
     # Estatísticas
     materias = Counter()
     assuntos = Counter()
@@ -63,8 +57,11 @@ def main():
     ids_tec = set()
     duplicados = []
     erros = []
+    total = 0
     
-    for i, q in enumerate(questoes, 1):
+    # Uma passada só, registro a registro (.json ou .jsonl)
+    for i, q in enumerate(iterar_registros(arquivo), 1):
+        total = i
         # Verificar duplicados
         id_tec = q.get('id_tec')
         if id_tec in ids_tec:
@@ -80,6 +77,8 @@ def main():
         assuntos[q.get('assunto', 'N/A')] += 1
         gabaritos[q.get('gabarito', 'N/A').upper()] += 1
     
+    print(f"Total de questões: {total}\n")
+    
     # Relatório
     print(f"{'='*60}")
     print("MATÉRIAS ENCONTRADAS")
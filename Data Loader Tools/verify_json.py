@@ -7,14 +7,17 @@ MODO 1: Validação (Gera arquivo de erros)
 
 MODO 2: Correção (Aplica correções manuais)
     python validate_json_before_load.py dataset.json fix_dataset.json --fixer
+
+O dataset pode ser .json ou .jsonl; é lido e regravado registro a registro.
 """
 
-import json
 import sys
 import os
 import argparse
 from pathlib import Path
 
+from registros_json import iterar_registros, carregar_registros, gravar_registros, EscritorRegistros, localizar, caminho_no_formato
+
 # Mapeamento de gabaritos aceitos
 GABARITO_MAP = {
     'CERTO': 'CERTO', 'C': 'CERTO', 'V': 'CERTO', 'VERDADEIRO': 'CERTO', 'TRUE': 'CERTO',
@@ -22,21 +25,24 @@ GABARITO_MAP = {
     'ANULADA': 'ANULADA', 'ANULADO': 'ANULADA', 'X': 'ANULADA'
 }
 
-def carregar_json(caminho):
+def localizar_json(caminho):
+    caminho = localizar(caminho)
     if not os.path.exists(caminho):
         print(f"❌ Erro: Arquivo '{caminho}' não encontrado.")
         sys.exit(1)
+    return caminho
+
+def carregar_json(caminho):
+    caminho = localizar_json(caminho)
     try:
-        with open(caminho, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return carregar_registros(caminho)
     except Exception as e:
         print(f"❌ Erro ao ler JSON: {e}")
         sys.exit(1)
 
 def salvar_json(dados, caminho):
     try:
-        with open(caminho, 'w', encoding='utf-8') as f:
-            json.dump(dados, f, indent=4, ensure_ascii=False)
+        gravar_registros(dados, caminho)
         print(f"💾 Arquivo salvo: {caminho}")
     except Exception as e:
         print(f"❌ Erro ao salvar JSON: {e}")
@@ -77,16 +83,15 @@ def validar_questao(q):
 def modo_validacao(arquivo_entrada):
     print(f"🕵️  MODO AUDITORIA: Analisando '{arquivo_entrada}'...")
     
-    dados = carregar_json(arquivo_entrada)
+    arquivo_entrada = localizar_json(arquivo_entrada)
     questoes_com_erro = []
     ids_com_erro = set()
     
-    total = len(dados)
+    total = 0
     validos = 0
 
-    print(f"📦 Total de registros: {total}")
-
-    for q in dados:
+    for q in iterar_registros(arquivo_entrada):
+        total += 1
         # Só valida se foi marcado como capturado (se tiver essa flag)
         # Se não tiver a flag 'capturado', assume que é pra validar tudo
         if 'capturado' in q and not q['capturado']:
@@ -104,6 +109,7 @@ def modo_validacao(arquivo_entrada):
         else:
             validos += 1
 
+    print(f"📦 Total de registros: {total}")
     print("-" * 50)
     print(f"✅ Questões Válidas: {validos}")
     print(f"❌ Questões com Problemas: {len(questoes_com_erro)}")
@@ -113,7 +119,8 @@ def modo_validacao(arquivo_entrada):
         # Gera o nome do arquivo fix_
         pasta = os.path.dirname(arquivo_entrada)
         nome_arquivo = os.path.basename(arquivo_entrada)
-        caminho_fix = os.path.join(pasta, f"fix_{nome_arquivo}")
+        # O fix_ é editado à mão: sempre lista JSON, mesmo vindo de um .jsonl
+        caminho_fix = caminho_no_formato(os.path.join(pasta, f"fix_{nome_arquivo}"), "json")
         
         print(f"⚠️  Problemas detectados! Gerando arquivo para correção manual...")
         salvar_json(questoes_com_erro, caminho_fix)
@@ -124,7 +131,7 @@ def modo_validacao(arquivo_entrada):
 def modo_fixer(arquivo_original, arquivo_correcao):
     print(f"🛠️  MODO CORREÇÃO: Aplicando fixes de '{arquivo_correcao}' em '{arquivo_original}'...")
     
-    dataset = carregar_json(arquivo_original)
+    arquivo_original = localizar_json(arquivo_original)
     correcoes = carregar_json(arquivo_correcao)
     
     # Cria um dicionário das correções para acesso rápido por ID
@@ -143,20 +150,21 @@ def modo_fixer(arquivo_original, arquivo_correcao):
     substituidos = 0
     nao_encontrados = 0
     
-    # Itera sobre o dataset original e substitui
-    novo_dataset = []
-    for q in dataset:
+    # Itera sobre o dataset original e substitui. O novo dataset vai para um
+    # .tmp que só troca o original no final, então dá para ler e gravar o mesmo arquivo
+    novo_dataset = EscritorRegistros(arquivo_original)
+    for q in iterar_registros(arquivo_original):
         id_tec = q.get('id_tec')
         
         if id_tec in mapa_correcoes:
             # Substitui pelo objeto corrigido
-            novo_dataset.append(mapa_correcoes[id_tec])
+            novo_dataset.escrever(mapa_correcoes[id_tec])
             substituidos += 1
             # Remove do mapa para saber se sobrou algo
             del mapa_correcoes[id_tec]
         else:
             # Mantém o original
-            novo_dataset.append(q)
+            novo_dataset.escrever(q)
             
     # Verifica se sobraram correções (IDs que não existiam no original)
     sobras = len(mapa_correcoes)
@@ -169,7 +177,8 @@ def modo_fixer(arquivo_original, arquivo_correcao):
     
     # Salva o arquivo original sobrescrevendo-o (ou cria um _FINAL se preferir segurança)
     # Por segurança, vamos salvar no original mesmo conforme o fluxo pedido
-    salvar_json(novo_dataset, arquivo_original)
+    novo_dataset.fechar()
+    print(f"💾 Arquivo salvo: {arquivo_original}")
     print(f"🎉 Dataset original atualizado com sucesso!")
 
 def main():
@@ -1,220 +1,18 @@
-import re
-import json
-import pdfplumber
-import glob
+"""
+Extrator de Direito Constitucional.
+
+Padrões dos PDFs, gabarito, gatilhos e arquivos de saída estão no perfil da
+matéria em Data Loader Tools/perfis_materias.json; o motor é o
+extrator_materias.py, o mesmo de todas as matérias. Lê <matéria>/fonts e
+grava em <matéria>/datasets, de qualquer diretório.
+"""
 import os
+import sys
 
-# ==============================================================================
-# CONFIGURAÇÃO
-# ==============================================================================
-PADRAO_PDF = "../Direito Constitucional*.pdf"
-PADRAO_EXTRA = "../DC*.pdf" 
-ARQUIVO_SAIDA = "dataset_constitucional_final.json"
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Data Loader Tools"))
+from extrator_materias import main_materia
 
-# ==============================================================================
-# INTELIGÊNCIA DE TEXTO
-# ==============================================================================
-
-def limpar_texto(texto):
-    if not texto: return ""
-    return re.sub(r'\n{3,}', '\n\n', texto).strip()
-
-def separar_comando_enunciado(texto_completo):
-    """
-    Separa o Comando (Contexto/Instrução) do Enunciado (Assertiva).
-    """
-    if not texto_completo: return "", ""
-
-    # Gatilhos de separação (Lógica V3 mantida)
-    gatilhos = [
-        r'(julgue\s+o(s)?\s+.*?(item|itens)\s+(a\s+seguir|seguintes?|subsequentes?|próximos?).*?(:|\.))',
-        r'(julgue\s+o(s)?\s+(seguintes?|próximos?|subsequentes?)\s+(item|itens).*?(:|\.))',
-        r'(julgue\s+o(s)?\s+(item|itens).*?de\s+acordo.*?(:|\.))',
-        r'(julgue\s+o(s)?\s+.*?(item|itens).*?(:|\.))',
-        r'(assinale\s+a\s+opção\s+correta.*?(:|\.))'
-    ]
-    
-    divisor = None
-    match_pos = -1
-
-    for g in gatilhos:
-        iterator = re.finditer(g, texto_completo, re.IGNORECASE | re.DOTALL)
-        for match in iterator:
-            if match.end() > match_pos and match.end() < len(texto_completo) - 2:
-                match_pos = match.end()
-                divisor = match
-
-    if divisor:
-        comando = texto_completo[:divisor.end()].strip()
-        enunciado = texto_completo[divisor.end():].strip()
-        enunciado = re.sub(r'^[\.\:\-\s]+', '', enunciado)
-        enunciado = re.sub(r'\s+(Certo|Errado)$', '', enunciado, flags=re.IGNORECASE)
-        return comando, enunciado
-
-    # Fallback
-    partes = texto_completo.split('\n\n')
-    if len(partes) >= 2:
-        enunciado_cand = partes[-1].strip()
-        if len(enunciado_cand) < 600:
-            comando = "\n\n".join(partes[:-1]).strip()
-            return comando, enunciado_cand
-        
-    return texto_completo, "[Enunciado não separado automaticamente]"
-
-# ==============================================================================
-# MOTOR DE EXTRAÇÃO (COM FILTRO RÍGIDO DE GABARITO)
-# ==============================================================================
-
-def processar_pdf(caminho_pdf):
-    nome_arquivo = os.path.basename(caminho_pdf)
-    print(f"   📄 Processando: {nome_arquivo}...")
-    
-    texto_bruto = ""
-    try:
-        with pdfplumber.open(caminho_pdf) as pdf:
-            for page in pdf.pages:
-                t = page.extract_text()
-                if t: texto_bruto += t + "\n"
-    except Exception as e:
-        print(f"      ❌ Erro ao ler PDF: {e}")
-        return []
-
-    linhas = texto_bruto.split('\n')
-    questoes = []
-    
-    regex_url = re.compile(r'tecconcursos\.com\.br/questoes/(\d+)')
-    regex_inicio = re.compile(r'^(\d+)\)\s*(.*)')
-    # REGEX BLINDADO: Apenas Certo ou Errado. Ignora 'A', 'B', 'Anulada', etc.
-    regex_gabarito = re.compile(r'^Gabarito:\s*(Certo|Errado)', re.IGNORECASE)
-
-    i = 0
-    total = len(linhas)
-    q_atual = None
-    buffer_texto = []
-
-    while i < total:
-        linha = linhas[i].strip()
-        
-        # 1. LINK ID
-        match_id = regex_url.search(linha)
-        if match_id:
-            if q_atual:
-                full = "\n".join(buffer_texto)
-                cmd, enun = separar_comando_enunciado(full)
-                q_atual['comando'] = limpar_texto(cmd)
-                q_atual['enunciado'] = limpar_texto(enun)
-                questoes.append(q_atual)
-                q_atual = None
-                buffer_texto = []
-            
-            novo_id = match_id.group(1)
-            banca = ""
-            materia = "Direito Constitucional"
-            assunto = ""
-            
-            offset = 1
-            found_start = False
-            while offset <= 5 and (i + offset) < total:
-                prox = linhas[i + offset].strip()
-                if not prox: 
-                    offset += 1
-                    continue
-                
-                if not banca and ("CEBRASPE" in prox or "FGV" in prox or "FCC" in prox):
-                    banca = prox
-                elif not assunto and " - " in prox and prox != banca:
-                    parts = prox.split(" - ", 1)
-                    if len(parts) > 1:
-                        assunto = parts[1].strip()
-                        materia = parts[0].strip()
-                    else:
-                        assunto = prox
-
-                match_num = regex_inicio.match(prox)
-                if match_num:
-                    q_atual = {
-                        "numero": int(match_num.group(1)),
-                        "id_tec": novo_id,
-                        "link": f"www.tecconcursos.com.br/questoes/{novo_id}",
-                        "banca_orgao": banca,
-                        "materia": materia,
-                        "assunto": assunto,
-                        "gabarito": "" # Inicia vazio
-                    }
-                    if match_num.group(2): buffer_texto.append(match_num.group(2))
-                    i += offset
-                    found_start = True
-                    break
-                offset += 1
-            
-            if not found_start:
-                q_atual = {
-                    "numero": 0, "id_tec": novo_id,
-                    "link": f"www.tecconcursos.com.br/questoes/{novo_id}",
-                    "banca_orgao": banca, "materia": materia, "assunto": assunto, "gabarito": ""
-                }
-                i += offset
-            i += 1
-            continue
-
-        # 2. GABARITO (Só captura se for Certo/Errado)
-        match_gab = regex_gabarito.search(linha)
-        if match_gab and q_atual:
-            q_atual['gabarito'] = match_gab.group(1) # Salva "Certo" ou "Errado"
-            # Se for "Gabarito: A", o regex não casa, e o campo continua vazio ""
-        
-        # 3. TEXTO
-        elif q_atual and "www.tecconcursos" not in linha:
-            buffer_texto.append(linha)
-        
-        i += 1
-
-    if q_atual:
-        full = "\n".join(buffer_texto)
-        cmd, enun = separar_comando_enunciado(full)
-        q_atual['comando'] = limpar_texto(cmd)
-        q_atual['enunciado'] = limpar_texto(enun)
-        questoes.append(q_atual)
-
-    # --- FILTRAGEM FINAL RÍGIDA ---
-    questoes_validas = []
-    excluidas = 0
-    
-    for q in questoes:
-        gab = q.get('gabarito', '').capitalize()
-        if gab in ["Certo", "Errado"]:
-            questoes_validas.append(q)
-        else:
-            excluidas += 1
-            
-    print(f"      🗑️ Excluídas (Gabarito inválido/anulada): {excluidas}")
-    return questoes_validas
-
-def main():
-    print("--- EXTRATOR DIREITO CONSTITUCIONAL V4 (Filtro Anti-Anulada) ---")
-    arquivos = glob.glob(PADRAO_PDF)
-    arquivos += glob.glob(PADRAO_EXTRA)
-    
-    if not arquivos:
-        print("Nenhum PDF encontrado.")
-        return
-
-    todas = []
-    for arq in arquivos:
-        todas.extend(processar_pdf(arq))
-    
-    # Deduplicação
-    unicas = {q['id_tec']: q for q in todas if q.get('id_tec')}
-    lista_final = list(unicas.values())
-    lista_final.sort(key=lambda x: int(x['id_tec']) if x['id_tec'].isdigit() else 0)
-
-    print("-" * 50)
-    print(f"Total Válido (Certo/Errado): {len(lista_final)}")
-    print("-" * 50)
-
-    with open(ARQUIVO_SAIDA, 'w', encoding='utf-8') as f:
-        json.dump(lista_final, f, indent=4, ensure_ascii=False)
-    print(f"Salvo em: {ARQUIVO_SAIDA}")
+MATERIA = "Direito Constitucional"
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main_materia(MATERIA)
@@ -0,0 +1,311 @@
+"""
+Liga as questões aos dispositivos da Constituição que elas citam.
+
+A árvore vem do html_to_json.py (artigo > parágrafo > inciso > alínea) e
+vira um índice pelo endereço canônico do html_to_json:
+
+    art:5                  art:37/par:6          art:37/par:unico
+    art:5/inc:LXIII        art:37/par:3/inc:II   art:5/inc:XXVIII/ali:a
+
+As citações são achadas no comando e no enunciado por uma gramática
+compilada uma vez, nas duas ordens em que aparecem nas questões (o comando
+com o texto associado resolvido pelo textos_associados.json da pasta):
+
+    art. 5º, LXIII   |   art. 37, inciso XI   |   art. 166, § 1º, da CF
+    § 2º do art. 37  |   inciso LXXIV do art. 5.º   |   parágrafo único do artigo 62
+    arts. 5º e 6º    |   artigos 37 a 41
+
+Só entram as citações da Constituição: seguidas de "da CF", "da
+Constituição" etc., ou sem diploma nenhum numa questão que fala da
+Constituição (ou da matéria Direito Constitucional). "Art. 2º da Lei
+8.112", "do ADCT", "do referido decreto" ficam de fora.
+
+Cada citação é resolvida no índice: se o dispositivo exato não existe na
+árvore (ex: inciso que o parser perdeu), vale o ancestral mais próximo que
+existe. Saída: questão -> dispositivos e dispositivo -> questões.
+
+Uso:
+    python citacoes_constituicao.py
+    python citacoes_constituicao.py "../Direito Constitucional/datasets/dataset_constitucional_final.json" -o vinculos.json
+"""
+import os
+import re
+import sys
+import glob
+import json
+import time
+import argparse
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Data Loader Tools"))
+
+from registros_json import iterar_registros
+from textos_associados import carregar_textos, expandir_comando
+from html_to_json import artigos_do_arquivo, dispositivos, rotulo_artigo, rotulo_paragrafo
+
+# ==============================================================================
+# CONFIGURAÇÃO
+# ==============================================================================
+PASTA_PELS = os.path.dirname(os.path.abspath(__file__))
+RAIZ_PROJETO = os.path.abspath(os.path.join(PASTA_PELS, ".."))
+ARQUIVO_HTML = os.path.join(PASTA_PELS, "constituicao.html")
+ARQUIVO_SAIDA = "citacoes_constituicao.json"
+PADROES_DATASETS = ["*/datasets/dataset_*_final.json*", "*/datasets/dataset_*_imagens.json*"]
+
+# "artigos 37 a 41" com intervalo maior que isto não é expandido
+MAX_INTERVALO = 20
+# Quanto texto depois da citação é olhado atrás do diploma ("da CF", "da Lei...")
+JANELA_DIPLOMA = 80
+
+ORDINAIS = {
+    "primeiro": "1", "segundo": "2", "terceiro": "3", "quarto": "4", "quinto": "5",
+    "sexto": "6", "sétimo": "7", "setimo": "7", "oitavo": "8", "nono": "9", "décimo": "10", "decimo": "10",
+}
+
+# ==============================================================================
+# GRAMÁTICA DAS CITAÇÕES
+# ==============================================================================
+# Número de artigo/parágrafo: 5º, 5.º, 5°, 5.o, 103-B
+_NUMERO = r'\d+(?:\s*-\s*[A-Z]\b)?(?:\s*\.?\s*[º°ª]|\.o\b)?'
+_ROMANO = r'(?-i:[IVXLCDM]+)\b'
+_ALINEA = r'["“‘]?[a-z]["”’]?(?![\w])'
+_ORDINAL = "|".join(ORDINAIS)
+_PARAGRAFO = (rf'(?:§+\s*(?:{_NUMERO})|par[áa]grafo\s+(?:[úu]nico|{_ORDINAL}|{_NUMERO})'
+              rf'|\d+\s*\.?\s*[º°](?=\s*,?\s*d[oa]\s+art))')
+_LISTA = r'(?:\s*(?:,|\be\b|\ba\b)\s*{item})*'
+
+REGEX_CITACAO = re.compile(
+    # Prefixo ascendente: "alínea a do inciso II do § 1º do art."
+    rf'(?:al[íi]neas?\s+(?P<ali_pre>{_ALINEA}{_LISTA.format(item=_ALINEA)})\s*,?\s*d[oa]s?\s+)?'
+    rf'(?:incisos?\s+(?P<inc_pre>{_ROMANO}{_LISTA.format(item=_ROMANO)})\s*,?\s*d[oa]s?\s+)?'
+    rf'(?:(?P<par_pre>{_PARAGRAFO})\s*,?\s*d[oa]\s+)?'
+    # O artigo (ou a lista de artigos)
+    rf'\bart(?:igos?\b|s?\.|s?\b)\s*(?P<art>{_NUMERO}{_LISTA.format(item=_NUMERO)})',
+    re.IGNORECASE
+)
+# Continuação descendente, depois do artigo: ", § 1º", ", inciso XI", ", LXIII", ", alínea a"
+REGEX_PARAGRAFO = re.compile(rf'\s*,?\s*(?P<par>§+\s*{_NUMERO}|par[áa]grafo\s+(?:[úu]nico|{_ORDINAL}|{_NUMERO}))',
+                             re.IGNORECASE)
+REGEX_INCISO = re.compile(
+    rf'\s*(?:,?\s*incisos?\s+|,\s*)(?P<inc>{_ROMANO}{_LISTA.format(item=_ROMANO)})(?!\s*-)', re.IGNORECASE
+)
+REGEX_ALINEA = re.compile(rf'\s*,?\s*al[íi]neas?\s+(?P<ali>{_ALINEA}{_LISTA.format(item=_ALINEA)})', re.IGNORECASE)
+REGEX_CAPUT = re.compile(r'\s*,?\s*caput\b', re.IGNORECASE)
+
+REGEX_DIPLOMA_CF = re.compile(
+    r'\s*[,(]?\s*(?:d[ao]\s+|na\s+|n[ao]\s+)?(?:CF\b|CF/|Constitui[çc][ãa]o|Carta\s+(?:Magna|Pol[íi]tica|da\s+Rep)'
+    r'|texto\s+constitucional|Lei\s+Maior)',
+    re.IGNORECASE
+)
+REGEX_OUTRO_DIPLOMA = re.compile(
+    r'\s*,?\s*d[ao]s?\s+(?:Lei|LC\b|Decreto|C[óo]digo|ADCT|Ato\s+das|Regimento|RI\b|RICD|RISF|Estatuto'
+    r'|Resolu[çc][ãa]o|Emenda|EC\b|LINDB|CP\b|CPC|CPP|CLT|CTN|LRF|Constitui[çc][ãa]o\s+(?:Estadual|do\s+Estado)'
+    r'|referid|mesm|presente|citad|aludid)',
+    re.IGNORECASE
+)
+REGEX_MENCAO_CF = re.compile(r'\bCF\b|Constitui[çc][ãa]o(?!\s+(?:Estadual|do\s+Estado))', re.IGNORECASE)
+
+# ==============================================================================
+# ÍNDICE DA ÁRVORE
+# ==============================================================================
+def indice_constituicao(estrutura):
+    """{endereço: dispositivo} de toda a estrutura do html_to_json (vale a última redação)."""
+    return {endereco: dispositivo for endereco, dispositivo, _ in dispositivos(estrutura)}
+
+def carregar_estrutura(caminho_html=ARQUIVO_HTML, caminho_json=None):
+    """A árvore do html_to_json: do JSON já gerado, ou direto do HTML."""
+    if caminho_json:
+        with open(caminho_json, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return list(artigos_do_arquivo(caminho_html))
+
+# ==============================================================================
+# EXTRAÇÃO DAS CITAÇÕES
+# ==============================================================================
+def _itens_lista(texto):
+    """'5º e 6º' -> ['5º', '6º']; '37 a 41' -> os números do intervalo."""
+    partes = re.split(r'\s*,\s*|\s+(e|a)\s+', texto.strip())
+    itens, separadores = partes[0::2], partes[1::2]
+    if len(itens) == 2 and separadores == ["a"] and all(re.match(r'\d+', i) for i in itens):
+        inicio, fim = (int(re.match(r'\d+', i).group(0)) for i in itens)
+        if 0 < fim - inicio <= MAX_INTERVALO:
+            return [str(n) for n in range(inicio, fim + 1)]
+    return itens
+
+def _artigos(texto):
+    return [rotulo_artigo(re.sub(r'\s', '', a)) for a in _itens_lista(texto)]
+
+def _paragrafo(texto):
+    if not texto:
+        return None
+    palavra = texto.lower().split()[-1]
+    return ORDINAIS.get(palavra) or rotulo_paragrafo(texto.strip())
+
+def _incisos(texto):
+    return [i.upper() for i in _itens_lista(texto)] if texto else [None]
+
+def _alineas(texto):
+    return [re.sub(r'[^a-z]', '', a.lower()) for a in _itens_lista(texto)] if texto else [None]
+
+def _continuacao(texto, pos):
+    """Parágrafo, incisos e alíneas citados logo depois do artigo."""
+    partes = {}
+    m = REGEX_CAPUT.match(texto, pos)
+    if m:
+        pos = m.end()
+    for chave, regex in (("par", REGEX_PARAGRAFO), ("inc", REGEX_INCISO), ("ali", REGEX_ALINEA)):
+        m = regex.match(texto, pos)
+        if m:
+            partes[chave] = m.group(chave)
+            pos = m.end()
+    return partes, pos
+
+def diploma(texto, pos):
+    """'cf', 'outro' ou None (sem diploma) logo depois da posição."""
+    trecho = texto[pos:pos + JANELA_DIPLOMA]
+    if REGEX_DIPLOMA_CF.match(trecho):
+        return "cf"
+    if REGEX_OUTRO_DIPLOMA.match(trecho):
+        return "outro"
+    return None
+
+def extrair_citacoes(texto, aceita_sem_diploma=False):
+    """
+    [(trecho citado, endereço)] das citações da Constituição no texto, um
+    endereço por dispositivo ("arts. 5º e 6º" dá dois).
+    """
+    citacoes = []
+    for m in REGEX_CITACAO.finditer(texto):
+        depois, fim = _continuacao(texto, m.end())
+        origem = diploma(texto, fim)
+        if origem == "outro" or (origem is None and not aceita_sem_diploma):
+            continue
+
+        artigos = _artigos(m.group("art"))
+        paragrafo = _paragrafo(m.group("par_pre") or depois.get("par"))
+        incisos = _incisos(m.group("inc_pre") or depois.get("inc"))
+        alineas = _alineas(m.group("ali_pre") or depois.get("ali"))
+        if len(artigos) > 1:
+            # Lista de artigos: o resto da citação não se aplica a todos
+            paragrafo, incisos, alineas = None, [None], [None]
+
+        trecho = " ".join(texto[m.start():fim].split())
+        for artigo in artigos:
+            for inciso in incisos:
+                for alinea in alineas:
+                    endereco = f"art:{artigo}"
+                    if paragrafo:
+                        endereco += f"/par:{paragrafo}"
+                    if inciso:
+                        endereco += f"/inc:{inciso}"
+                    if alinea:
+                        endereco += f"/ali:{alinea}"
+                    citacoes.append((trecho, endereco))
+    return citacoes
+
+def resolver(endereco, indice):
+    """O endereço, ou o ancestral mais próximo que existe no índice (None se nem o artigo existe)."""
+    partes = endereco.split("/")
+    while partes:
+        candidato = "/".join(partes)
+        if candidato in indice:
+            return candidato
+        partes.pop()
+    return None
+
+# ==============================================================================
+# VÍNCULOS
+# ==============================================================================
+def fala_da_constituicao(q, texto):
+    return "constitucional" in (q.get("materia") or "").lower() or bool(REGEX_MENCAO_CF.search(texto))
+
+def texto_da_questao(q, textos):
+    """Comando (com o texto associado resolvido) + enunciado."""
+    try:
+        comando = expandir_comando(q, textos)
+    except KeyError:
+        comando = q.get('comando') or ""
+    return f"{comando}\n{q.get('enunciado') or ''}"
+
+def questoes_dos_arquivos(arquivos):
+    """(questão, textos associados da pasta do dataset), em streaming."""
+    for caminho in arquivos:
+        textos = carregar_textos(os.path.dirname(os.path.abspath(caminho)))
+        for q in iterar_registros(caminho):
+            yield q, textos
+
+def vincular(questoes, indice):
+    """
+    (por_questao, por_dispositivo) de um iterável de (questão, textos associados):
+        por_questao     {id_tec: [{"citacao", "endereco", "dispositivo"}]}
+        por_dispositivo {dispositivo: [id_tec, ...]}
+    """
+    por_questao = {}
+    por_dispositivo = defaultdict(list)
+    for q, textos in questoes:
+        texto = texto_da_questao(q, textos)
+        if "art" not in texto.lower() and "§" not in texto:
+            continue
+        vinculos = []
+        vistos = set()
+        for trecho, endereco in extrair_citacoes(texto, fala_da_constituicao(q, texto)):
+            if endereco in vistos:
+                continue
+            vistos.add(endereco)
+            dispositivo = resolver(endereco, indice)
+            vinculos.append({"citacao": trecho, "endereco": endereco, "dispositivo": dispositivo})
+            if dispositivo and q.get("id_tec") not in por_dispositivo[dispositivo]:
+                por_dispositivo[dispositivo].append(q.get("id_tec"))
+        if vinculos:
+            por_questao[q.get("id_tec")] = vinculos
+    return por_questao, dict(por_dispositivo)
+
+# ==============================================================================
+# MAIN
+# ==============================================================================
+def main():
+    parser = argparse.ArgumentParser(description="Liga as questões aos dispositivos da Constituição citados.")
+    parser.add_argument("arquivos", nargs="*",
+                        help="Datasets .json ou .jsonl (Padrão: todos os _final e _imagens das matérias)")
+    parser.add_argument("--html", default=ARQUIVO_HTML, help="constituicao.html")
+    parser.add_argument("--estrutura", default=None,
+                        help="JSON já gerado pelo html_to_json.py (em vez de reprocessar o HTML)")
+    parser.add_argument("-o", "--saida", default=ARQUIVO_SAIDA, help=f"Arquivo de saída (Padrão: {ARQUIVO_SAIDA})")
+    args = parser.parse_args()
+
+    arquivos = args.arquivos or sorted({c for p in PADROES_DATASETS
+                                        for c in glob.glob(os.path.join(RAIZ_PROJETO, p))})
+    if not arquivos:
+        print("❌ Nenhum dataset encontrado.")
+        return
+
+    inicio = time.time()
+    indice = indice_constituicao(carregar_estrutura(args.html, args.estrutura))
+    print(f"📜 Dispositivos no índice: {len(indice)}")
+
+    por_questao, por_dispositivo = vincular(questoes_dos_arquivos(arquivos), indice)
+    citacoes = [v for vinculos in por_questao.values() for v in vinculos]
+    sem_dispositivo = sum(1 for v in citacoes if v["dispositivo"] is None)
+    aproximadas = sum(1 for v in citacoes if v["dispositivo"] not in (None, v["endereco"]))
+
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump({
+            "metadata": {
+                "arquivos": [os.path.relpath(os.path.abspath(a), RAIZ_PROJETO) for a in arquivos],
+                "total_questoes": len(por_questao),
+                "total_citacoes": len(citacoes),
+                "total_dispositivos": len(por_dispositivo),
+            },
+            "questoes": por_questao,
+            "dispositivos": dict(sorted(por_dispositivo.items())),
+        }, f, indent=2, ensure_ascii=False)
+
+    print(f"🔗 Questões com citação da CF: {len(por_questao)} | Citações: {len(citacoes)} | "
+          f"Dispositivos citados: {len(por_dispositivo)}")
+    if aproximadas or sem_dispositivo:
+        print(f"⚠️  Resolvidas no ancestral: {aproximadas} | Fora da árvore: {sem_dispositivo}")
+    print(f"⏱️  {time.time() - inicio:.1f}s")
+    print(f"💾 Salvo: {args.saida}")
+
+if __name__ == "__main__":
+    main()
@@ -1,52 +1,207 @@
+"""
+Conversor do HTML de uma norma (constituicao.html) para a árvore
+artigo > parágrafo > inciso > alínea em JSON.
+
+O HTML é lido em blocos e passa por etapas em fluxo, sem montar o documento
+inteiro na memória:
+
+    blocos -> entidades (&nbsp;...) -> tags -> espaços -> marcadores -> linhas -> árvore
+
+Cada etapa faz o mesmo que as substituições globais da versão anterior
+(html.unescape, tags viram quebra ou somem, \\s+ vira um espaço, \\n antes de
+"Art.", "Parágrafo único", "§", inciso e alínea), só que bloco a bloco. Os
+artigos saem um a um e o JSON é gravado à medida que saem, então normas
+maiores (regimentos, Lei 8.112, códigos) cabem numa memória limitada.
+
+A conversão completa também grava um índice por endereço canônico
+(art:37/par:6, art:5/inc:LXIII/ali:a): cada dispositivo numa linha compacta
+de constituicao_completa.dispositivos.jsonl e, em
+constituicao_completa.indice.json, o offset e o tamanho dessa linha. O
+IndiceDispositivos acha um dispositivo com um acesso ao dicionário e um seek,
+sem ler o documento inteiro.
+
+Uso:
+    python html_to_json.py constituicao.html
+    python html_to_json.py constituicao.html --preview
+
+    from html_to_json import IndiceDispositivos
+    with IndiceDispositivos("constituicao_completa.indice.json") as indice:
+        print(indice.lei_seca("art:37/par:6"))
+"""
 import re
 import json
 import html
+import heapq
 import argparse
 import sys
 import os
 
+TAMANHO_BLOCO = 1 << 16
+# Uma entidade (&...;) mais longa que isto no fim do bloco não é esperada
+MAX_ENTIDADE = 40
+# Maior prefixo incompleto de um marcador ("Parágrafo único" sem a última letra)
+MAX_PREFIXO_MARCADOR = 16
+# Letras que podem vir antes do "-" de um inciso (prefixo de tamanho livre)
+LETRAS_ROMANAS = "IVXLCDM"
+
+# --- MARCADORES ESTRATÉGICOS ---
+# Uma quebra de linha antes destes termos garante que fiquem no início da linha.
+# (?<!\() impede que quebremos linhas se o termo estiver dentro de parênteses.
+# Ex: "(Parágrafo único...)" não ganhará \n antes, logo não será tratado como novo item.
+MARCADORES = [re.compile(m) for m in (
+    r"(Art\.\s*[\d\wº°ª]+)",
+    r"(?<!\()(?<!\(\s)(Parágrafo\s*único)",  # Protege contra "(Parágrafo único"
+    r"(§\s*[\dº°ª]+)",
+    r"([IVXLCDM]+\s*-)",
+    r"([a-z]\))",
+)]
+
+RE_TAG_QUEBRA = re.compile(r'<(p|br|div|h\d)[^>]*>', re.IGNORECASE)
+RE_TAG_FECHA_QUEBRA = re.compile(r'</(p|div|h\d)>', re.IGNORECASE)
+RE_TAG = re.compile(r'<[^>]+>')
+RE_ESPACOS = re.compile(r'\s+')
+
+# ==============================================================================
+# TOKENIZADOR (etapas em fluxo: blocos de texto -> linhas)
+# ==============================================================================
+def _blocos_arquivo(f):
+    while True:
+        bloco = f.read(TAMANHO_BLOCO)
+        if not bloco:
+            return
+        yield bloco
+
+def _desescapar(blocos):
+    """html.unescape bloco a bloco, sem partir uma entidade no meio."""
+    pendente = ""
+    for bloco in blocos:
+        texto = pendente + bloco
+        corte = texto.rfind("&")
+        if corte < 0 or len(texto) - corte > MAX_ENTIDADE:
+            corte = len(texto)
+        pendente = texto[corte:]
+        if corte:
+            yield html.unescape(texto[:corte])
+    if pendente:
+        yield html.unescape(pendente)
+
+def _remover_tags(texto):
+    # Substituições básicas de tags por quebras de linha; as demais somem
+    texto = RE_TAG_QUEBRA.sub('\n', texto)
+    texto = RE_TAG_FECHA_QUEBRA.sub('\n', texto)
+    return RE_TAG.sub('', texto)
+
+def _sem_tags(blocos):
+    """
+    Texto sem as tags. Uma tag vai do "<" até o primeiro ">", então nenhuma
+    atravessa o último ">" do bloco: o que vem depois dele, a partir do
+    próximo "<", espera o bloco seguinte.
+    """
+    resto = ""
+    for bloco in blocos:
+        texto = resto + bloco
+        corte = texto.find("<", texto.rfind(">") + 1)
+        if corte < 0:
+            corte = len(texto)
+        resto = texto[corte:]
+        yield _remover_tags(texto[:corte])
+    if resto:
+        # Sem ">" até o fim: o "<" e o que vem depois são texto
+        yield _remover_tags(resto)
+
+def _espacos_simples(blocos):
+    """Cada sequência de espaços vira um espaço; sem espaço no começo e no fim."""
+    iniciado = False
+    espaco_pendente = False
+    for bloco in blocos:
+        texto = RE_ESPACOS.sub(" ", bloco)
+        if texto.startswith(" "):
+            espaco_pendente = True
+            texto = texto[1:]
+        if not texto:
+            continue
+        espaco_no_fim = texto.endswith(" ")
+        if espaco_no_fim:
+            texto = texto[:-1]
+        if espaco_pendente and iniciado:
+            yield " "
+        yield texto
+        iniciado = True
+        espaco_pendente = espaco_no_fim
+
+def _linhas(blocos):
+    """
+    Corta o texto antes de cada marcador e devolve as linhas (sem strip).
+
+    Cada marcador é procurado do ponto onde parou, como no re.sub de cada
+    um sobre o texto inteiro. Uma ocorrência que chega ao fim do buffer
+    ainda pode crescer ("Art. 1" + "23") e espera o próximo bloco; os cortes
+    só saem quando todos os marcadores já passaram deles.
+    """
+    buffer = ""
+    base = 0                       # posição (no texto inteiro) de buffer[0]
+    inicio_linha = 0
+    posicoes = [0] * len(MARCADORES)
+    cortes = []
+
+    def procurar(final):
+        for i, marcador in enumerate(MARCADORES):
+            while True:
+                m = marcador.search(buffer, posicoes[i] - base)
+                if m and (final or m.end() < len(buffer)):
+                    heapq.heappush(cortes, base + m.start())
+                    posicoes[i] = base + m.end()
+                    continue
+                if m:
+                    posicoes[i] = base + m.start()
+                elif not final:
+                    # Só perto do fim do buffer pode começar uma ocorrência incompleta
+                    seguro = len(buffer) - MAX_PREFIXO_MARCADOR
+                    while seguro > posicoes[i] - base and buffer[seguro - 1] in LETRAS_ROMANAS:
+                        seguro -= 1
+                    posicoes[i] = max(posicoes[i], base + seguro)
+                break
+
+    for bloco in blocos:
+        buffer += bloco
+        procurar(final=False)
+        fronteira = min(posicoes)
+        while cortes and cortes[0] < fronteira:
+            corte = heapq.heappop(cortes)
+            yield buffer[inicio_linha - base:corte - base]
+            inicio_linha = corte
+        # O buffer guarda a linha em andamento e 2 caracteres antes (lookbehind)
+        descarte = max(0, min(inicio_linha, fronteira - 2) - base)
+        buffer = buffer[descarte:]
+        base += descarte
+
+    procurar(final=True)
+    while cortes:
+        corte = heapq.heappop(cortes)
+        yield buffer[inicio_linha - base:corte - base]
+        inicio_linha = corte
+    yield buffer[inicio_linha - base:]
+
+def linhas_do_html(blocos):
+    """Linhas (marcadores no início) de um HTML dado em blocos de texto."""
+    return _linhas(_espacos_simples(_sem_tags(_desescapar(blocos))))
+
 def limpar_html_para_texto(html_content):
     """Limpa tags HTML e prepara o texto para processamento."""
     print("Iniciando limpeza do HTML...")
-    
-    texto = html.unescape(html_content)
-    
-    # Substituições básicas de tags por quebras de linha
-    texto = re.sub(r'<(p|br|div|h\d)[^>]*>', '\n', texto, flags=re.IGNORECASE)
-    texto = re.sub(r'</(p|div|h\d)>', '\n', texto, flags=re.IGNORECASE)
-    texto = re.sub(r'<[^>]+>', '', texto)
-    texto = re.sub(r'\s+', ' ', texto).strip()
-    
-    # --- MARCADORES ESTRATÉGICOS ---
-    # Inserimos \n antes destes termos para garantir que fiquem no início da linha.
-    # A novidade: (?<!\() impede que quebremos linhas se o termo estiver dentro de parênteses.
-    # Ex: "(Parágrafo único...)" não ganhará \n antes, logo não será tratado como novo item.
-    
-    marcadores = [
-        r"(Art\.\s*[\d\wº°ª]+)", 
-        r"(?<!\()(?<!\(\s)(Parágrafo\s*único)", # Protege contra "(Parágrafo único"
-        r"(§\s*[\dº°ª]+)", 
-        r"([IVXLCDM]+\s*-)", 
-        r"([a-z]\))"
-    ]
-    for m in marcadores:
-        texto = re.sub(m, r'\n\1', texto)
-        
-    return texto
+    return "\n".join(linhas_do_html([html_content]))
 
-def gerar_estrutura(texto, preview_mode=False):
-    """Processa o texto limpo e gera a estrutura JSON corrigida."""
-    print("Processando estrutura hierárquica...")
-    
-    linhas = texto.split('\n')
-    estrutura = []
-    
+# ==============================================================================
+# ESTRUTURA (máquina de estados sobre as linhas)
+# ==============================================================================
+def artigos(linhas, preview_mode=False):
+    """Gera os artigos completos, um a um, a partir das linhas."""
     # Variáveis de Estado
-    artigo_atual = None      
+    artigo_atual = None
     container_atual = None   # Artigo ou Parágrafo (quem recebe incisos)
     ultimo_inciso = None     # Quem recebe alíneas
     item_focado = None       # O último item criado (para concatenar texto solto)
-    
+
     # Regex de identificação
     re_artigo = re.compile(r"^\s*Art\.\s*([\d\wº°ª]+)[\.\s\-]*(.*)", re.IGNORECASE)
     re_paragrafo = re.compile(r"^\s*(§\s*[\dº°ª]+|Parágrafo\s*único)[\.\s\-]*(.*)", re.IGNORECASE)
@@ -63,19 +218,19 @@ def gerar_estrutura(texto, preview_mode=False):
         match_art = re_artigo.match(linha)
         if match_art:
             if preview_mode and count_artigos >= 10: break
-            
+
             if artigo_atual:
-                estrutura.append(artigo_atual)
-            
+                yield artigo_atual
+
             count_artigos += 1
-            
+
             artigo_atual = {
                 "tipo": "artigo",
                 "rotulo": match_art.group(1).replace('.', ''),
                 "texto": match_art.group(2).strip(),
                 "itens": []
             }
-            
+
             container_atual = artigo_atual
             ultimo_inciso = None
             item_focado = artigo_atual # Foco para append de texto
@@ -90,14 +245,14 @@ def gerar_estrutura(texto, preview_mode=False):
 
             novo_par = {
                 "tipo": "paragrafo",
-                "rotulo": rotulo, 
+                "rotulo": rotulo,
                 "texto": match_par.group(2).strip(),
                 "itens": []
             }
-            
+
             artigo_atual["itens"].append(novo_par)
-            container_atual = novo_par 
-            ultimo_inciso = None 
+            container_atual = novo_par
+            ultimo_inciso = None
             item_focado = novo_par
             continue
 
@@ -110,7 +265,7 @@ def gerar_estrutura(texto, preview_mode=False):
                 "texto": match_inc.group(2).strip(),
                 "itens": []
             }
-            
+
             container_atual["itens"].append(novo_inciso)
             ultimo_inciso = novo_inciso
             item_focado = novo_inciso
@@ -127,24 +282,182 @@ def gerar_estrutura(texto, preview_mode=False):
             ultimo_inciso["itens"].append(nova_alinea)
             item_focado = nova_alinea
             continue
-            
+
         # --- 5. TEXTO SOLTO (CONTINUAÇÃO) ---
         # Se chegou aqui, a linha não é inicio de nada, mas contém texto.
         # Provavelmente é a continuação de uma frase quebrada.
         if item_focado:
             item_focado["texto"] += " " + linha
 
-    # Adiciona o último artigo
+    # O último artigo
     if artigo_atual and (not preview_mode or count_artigos <= 10):
-        estrutura.append(artigo_atual)
-        
-    return estrutura
+        yield artigo_atual
+
+def gerar_estrutura(texto, preview_mode=False):
+    """Processa o texto limpo e gera a estrutura JSON corrigida."""
+    print("Processando estrutura hierárquica...")
+    return list(artigos(texto.split('\n'), preview_mode))
+
+def artigos_do_arquivo(caminho, preview_mode=False):
+    """Os artigos de um arquivo HTML, lido em blocos."""
+    with open(caminho, 'r', encoding='utf-8', errors='ignore') as f:
+        yield from artigos(linhas_do_html(_blocos_arquivo(f)), preview_mode)
+
+def gravar_json(artigos_gerados, caminho):
+    """Grava a lista de artigos à medida que saem (mesmo texto do json.dump com indent=2)."""
+    total = 0
+    with open(caminho, 'w', encoding='utf-8') as f_out:
+        for artigo in artigos_gerados:
+            f_out.write("[\n  " if total == 0 else ",\n  ")
+            f_out.write(json.dumps(artigo, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+            total += 1
+        f_out.write("\n]" if total else "[]")
+    return total
+
+# ==============================================================================
+# ÍNDICE POR ENDEREÇO (consulta de um dispositivo sem ler o documento inteiro)
+# ==============================================================================
+# Endereço canônico: art:37, art:37/par:6, art:37/par:unico, art:5/inc:LXIII/ali:a
+# Arquivos: <saida>.dispositivos.jsonl (um dispositivo por linha, compacto, com
+# os endereços dos filhos) e <saida>.indice.json ({endereço: [offset, tamanho]}).
+SUFIXO_DISPOSITIVOS = ".dispositivos.jsonl"
+SUFIXO_INDICE = ".indice.json"
+PREFIXOS_ENDERECO = {"artigo": "art", "paragrafo": "par", "inciso": "inc", "alinea": "ali"}
+
+def rotulo_artigo(rotulo, texto=""):
+    """'5º' -> '5'. O parser corta o sufixo de '103-B.' e deixa o 'B.' no texto."""
+    numero = re.sub(r'\.\s*o$|[º°ª.\s]', '', rotulo)
+    sufixo = re.match(r'([A-Z])\.\s', texto or "")
+    return f"{numero}-{sufixo.group(1)}" if sufixo else numero
+
+def rotulo_paragrafo(rotulo):
+    """'§ 6º' -> '6', 'Parágrafo único' -> 'unico'."""
+    if re.search(r'[úu]nico', rotulo, re.IGNORECASE):
+        return "unico"
+    numero = re.search(r'\d+', rotulo)
+    return numero.group(0) if numero else rotulo
+
+def endereco_item(item, base=""):
+    tipo = item["tipo"]
+    if tipo == "artigo":
+        rotulo = rotulo_artigo(item["rotulo"], item.get("texto"))
+    elif tipo == "paragrafo":
+        rotulo = rotulo_paragrafo(item["rotulo"])
+    elif tipo == "inciso":
+        rotulo = item["rotulo"].upper()
+    else:
+        rotulo = item["rotulo"].lower()
+    parte = f"{PREFIXOS_ENDERECO[tipo]}:{rotulo}"
+    return f"{base}/{parte}" if base else parte
+
+def dispositivos(artigos_gerados):
+    """
+    Gera (endereço, dispositivo sem os itens, endereços dos filhos) de cada
+    artigo e item, pai antes dos filhos. Redação antiga e nova com o mesmo
+    rótulo têm o mesmo endereço; quem indexa fica com a última (a vigente).
+    """
+    def percorrer(item, base):
+        endereco = endereco_item(item, base)
+        filhos = [(endereco_item(filho, endereco), filho) for filho in item.get("itens", [])]
+        enderecos_filhos = list(dict.fromkeys(e for e, _ in filhos))
+        yield endereco, {k: v for k, v in item.items() if k != "itens"}, enderecos_filhos
+        for _, filho in filhos:
+            yield from percorrer(filho, endereco)
+
+    for artigo in artigos_gerados:
+        yield from percorrer(artigo, "")
+
+class EscritorIndice:
+    """Grava os dispositivos (.jsonl) e o índice de offsets à medida que os artigos saem."""
+
+    def __init__(self, caminho_saida):
+        base = os.path.splitext(caminho_saida)[0]
+        self.caminho_dados = base + SUFIXO_DISPOSITIVOS
+        self.caminho_indice = base + SUFIXO_INDICE
+        self.enderecos = {}
+        self._dados = open(self.caminho_dados, 'wb')
+
+    def adicionar(self, artigo):
+        for endereco, dispositivo, filhos in dispositivos([artigo]):
+            linha = json.dumps({"endereco": endereco, **dispositivo, "filhos": filhos},
+                               ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b"\n"
+            self.enderecos[endereco] = [self._dados.tell(), len(linha)]
+            self._dados.write(linha)
+
+    def fechar(self):
+        self._dados.close()
+        with open(self.caminho_indice, 'w', encoding='utf-8') as f:
+            json.dump({"dados": os.path.basename(self.caminho_dados), "enderecos": self.enderecos},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        return len(self.enderecos)
+
+def _registrando(artigos_gerados, escritor):
+    for artigo in artigos_gerados:
+        escritor.adicionar(artigo)
+        yield artigo
+
+class IndiceDispositivos:
+    """
+    Consulta por endereço: o índice (só offsets) é carregado uma vez e cada
+    dispositivo é lido do .jsonl com um seek.
+
+        with IndiceDispositivos("constituicao_completa.indice.json") as indice:
+            print(indice.lei_seca("art:37/par:6"))
+    """
+
+    def __init__(self, caminho_indice):
+        with open(caminho_indice, 'r', encoding='utf-8') as f:
+            dados = json.load(f)
+        self.enderecos = dados["enderecos"]
+        self._dados = open(os.path.join(os.path.dirname(caminho_indice), dados["dados"]), 'rb')
+
+    def __contains__(self, endereco):
+        return endereco in self.enderecos
+
+    def __len__(self):
+        return len(self.enderecos)
+
+    def dispositivo(self, endereco):
+        """O dispositivo (tipo, rotulo, texto, filhos) ou None se o endereço não existe."""
+        posicao = self.enderecos.get(endereco)
+        if posicao is None:
+            return None
+        self._dados.seek(posicao[0])
+        return json.loads(self._dados.read(posicao[1]))
+
+    def lei_seca(self, endereco, com_filhos=True):
+        """Texto do dispositivo como na lei ("§ 6º As pessoas...", "I - ..."), com os filhos abaixo."""
+        dispositivo = self.dispositivo(endereco)
+        if dispositivo is None:
+            return None
+        rotulo, texto = dispositivo["rotulo"], dispositivo["texto"]
+        if dispositivo["tipo"] == "artigo":
+            linha = f"Art. {rotulo} {texto}"
+        elif dispositivo["tipo"] == "inciso":
+            linha = f"{rotulo} - {texto}"
+        elif dispositivo["tipo"] == "alinea":
+            linha = f"{rotulo}) {texto}"
+        else:
+            linha = f"{rotulo} {texto}"
+        linhas = [linha.strip()]
+        if com_filhos:
+            linhas += [self.lei_seca(filho) for filho in dispositivo["filhos"]]
+        return "\n".join(linhas)
+
+    def close(self):
+        self._dados.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 def main():
     parser = argparse.ArgumentParser(description="Conversor HTML -> JSON")
     parser.add_argument("arquivo_entrada", help="Caminho do arquivo HTML")
     parser.add_argument("--preview", action="store_true", help="Gera apenas os 10 primeiros artigos")
-    
+
     args = parser.parse_args()
 
     if not os.path.exists(args.arquivo_entrada):
@@ -152,20 +465,22 @@ def main():
         return
 
     try:
-        with open(args.arquivo_entrada, 'r', encoding='utf-8', errors='ignore') as f:
-            conteudo = f.read()
+        print("Processando HTML em blocos...")
+        nome_saida = "constituicao_preview.json" if args.preview else "constituicao_completa.json"
 
-        dados = gerar_estrutura(limpar_html_para_texto(conteudo), args.preview)
+        gerados = artigos_do_arquivo(args.arquivo_entrada, args.preview)
+        escritor = None if args.preview else EscritorIndice(nome_saida)
+        if escritor:
+            gerados = _registrando(gerados, escritor)
 
-        nome_saida = "constituicao_preview.json" if args.preview else "constituicao_completa.json"
-        
-        with open(nome_saida, 'w', encoding='utf-8') as f_out:
-            json.dump(dados, f_out, indent=2, ensure_ascii=False)
-            
-        print(f"Sucesso! Arquivo salvo em: {nome_saida}")
+        total = gravar_json(gerados, nome_saida)
+
+        print(f"Sucesso! {total} artigos salvos em: {nome_saida}")
+        if escritor:
+            print(f"Índice: {escritor.fechar()} dispositivos em {escritor.caminho_indice}")
 
     except Exception as e:
         print(f"Erro: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,6 +1,10 @@
-import json
-import re
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Data Loader Tools"))
+from segmentador import separar_comando_enunciado
+from memo_segmentacao import memo_segmentacao
+from registros_json import iterar_registros, gravar_registros, localizar, formato_do_caminho, caminho_no_formato
 
 # ==============================================================================
 # CONFIGURAÇÃO
@@ -11,48 +15,6 @@ ARQUIVO_RICO = "dataset_RL_rico.json"
 ARQUIVO_FINAL_TEXTO = "dataset_RL_final.json" # Vai direto pro Banco de Dados
 ARQUIVO_FINAL_IMAGEM = "dataset_RL_imagens.json" # Precisa da sua curadoria visual
 
-# ==============================================================================
-# INTELIGÊNCIA DE TEXTO (V5)
-# ==============================================================================
-
-def separar_comando_enunciado(texto_completo):
-    if not texto_completo: return "", ""
-
-    gatilhos = [
-        r'(julgue\s+o(s)?\s+.*?(item|itens)\s+(a\s+seguir|seguintes?|subsequentes?|próximos?).*?(:|\.))',
-        r'(julgue\s+o(s)?\s+(seguintes?|próximos?|subsequentes?)\s+(item|itens).*?(:|\.))',
-        r'(julgue\s+o(s)?\s+(item|itens).*?de\s+acordo.*?(:|\.))',
-        r'(julgue\s+o(s)?\s+.*?(item|itens).*?(:|\.))',
-        r'(assinale\s+a\s+opção\s+correta.*?(:|\.))'
-    ]
-    
-    divisor = None
-    match_pos = -1
-
-    for g in gatilhos:
-        iterator = re.finditer(g, texto_completo, re.IGNORECASE | re.DOTALL)
-        for match in iterator:
-            if match.end() > match_pos and match.end() < len(texto_completo) - 2:
-                match_pos = match.end()
-                divisor = match
-
-    if divisor:
-        comando = texto_completo[:divisor.end()].strip()
-        enunciado = texto_completo[divisor.end():].strip()
-        enunciado = re.sub(r'^[\.\:\-\s]+', '', enunciado)
-        enunciado = re.sub(r'\s+(Certo|Errado)$', '', enunciado, flags=re.IGNORECASE)
-        return comando, enunciado
-
-    partes = texto_completo.split('\n\n')
-    if len(partes) >= 2:
-        enunciado_cand = partes[-1].strip()
-        # Enunciado de matemática pode ser curto, mas o comando também pode ser.
-        if len(enunciado_cand) < 600: 
-            comando = "\n\n".join(partes[:-1]).strip()
-            return comando, enunciado_cand
-        
-    return texto_completo, "[Enunciado não separado automaticamente]"
-
 # ==============================================================================
 # FUSÃO DOS DADOS
 # ==============================================================================
@@ -60,25 +22,22 @@ def separar_comando_enunciado(texto_completo):
 def main():
     print("--- PASSO 3: FUSÃO E TRIAGEM (RACIOCÍNIO LÓGICO) ---")
 
-    if not os.path.exists(ARQUIVO_MAPA) or not os.path.exists(ARQUIVO_RICO):
+    arquivo_mapa = localizar(ARQUIVO_MAPA)
+    arquivo_rico = localizar(ARQUIVO_RICO)
+    if not os.path.exists(arquivo_mapa) or not os.path.exists(arquivo_rico):
         print("❌ Erro: Arquivos base (mapa_RL.json ou dataset_RL_rico.json) não encontrados.")
         return
 
     # 1. Carrega o Mapa num Dicionário para busca rápida (O(1))
-    with open(ARQUIVO_MAPA, 'r', encoding='utf-8') as f:
-        mapa_lista = json.load(f)
-    map_dict = {q['id_tec']: q for q in mapa_lista}
-
-    # 2. Carrega o texto Rico da Web
-    with open(ARQUIVO_RICO, 'r', encoding='utf-8') as f:
-        rico_lista = json.load(f)
+    map_dict = {q['id_tec']: q for q in iterar_registros(arquivo_mapa)}
 
     questoes_texto = []
     questoes_imagem = []
     orfãs = 0
+    memo = memo_segmentacao(separar_comando_enunciado)
 
-    # 3. Processamento e Fusão
-    for q_rico in rico_lista:
+    # 2/3. Lê o texto Rico da Web questão a questão e faz a fusão
+    for q_rico in iterar_registros(arquivo_rico):
         id_tec = q_rico.get('id_tec')
         
         # Ignora se por algum motivo não capturou o ID
@@ -88,8 +47,8 @@ def main():
 
         q_mapa = map_dict[id_tec]
 
-        # Separa Comando e Enunciado
-        cmd, enun = separar_comando_enunciado(q_rico.get('texto_completo', ''))
+        # Separa Comando e Enunciado (textos já separados antes saem do memo)
+        cmd, enun = memo.calcular(q_rico.get('texto_completo', ''))
 
         # Monta o objeto final
         questao_final = {
@@ -114,6 +73,8 @@ def main():
             # Texto/Latex Puro. Prontas para o banco!
             questoes_texto.append(questao_final)
 
+    memo.gravar()
+
     # Ordenação por ID
     questoes_texto.sort(key=lambda x: int(x['id_tec']))
     questoes_imagem.sort(key=lambda x: int(x['id_tec']))
@@ -123,18 +84,22 @@ def main():
     print(f"   ✅ Texto Puro / LaTeX (Prontas pro DB): {len(questoes_texto)}")
     print(f"   🖼️ Com Imagem (Para Revisão Visual): {len(questoes_imagem)}")
     print(f"   🗑️ Órfãs (ID não achado no mapa): {orfãs}")
+    print(f"   ♻️ Separações reaproveitadas do memo: {memo.acertos} de {memo.acertos + memo.calculados}")
     print("-" * 50)
 
+    # Saídas no mesmo formato (.json ou .jsonl) do dataset rico
+    formato = formato_do_caminho(arquivo_rico)
+
     # Salva as prontas
-    with open(ARQUIVO_FINAL_TEXTO, 'w', encoding='utf-8') as f:
-        json.dump(questoes_texto, f, indent=4, ensure_ascii=False)
-    print(f"Salvo: {ARQUIVO_FINAL_TEXTO}")
+    arquivo_final_texto = caminho_no_formato(ARQUIVO_FINAL_TEXTO, formato)
+    gravar_registros(questoes_texto, arquivo_final_texto)
+    print(f"Salvo: {arquivo_final_texto}")
 
     # Salva as que precisam de imagem
     if questoes_imagem:
-        with open(ARQUIVO_FINAL_IMAGEM, 'w', encoding='utf-8') as f:
-            json.dump(questoes_imagem, f, indent=4, ensure_ascii=False)
-        print(f"Salvo: {ARQUIVO_FINAL_IMAGEM}")
+        arquivo_final_imagem = caminho_no_formato(ARQUIVO_FINAL_IMAGEM, formato)
+        gravar_registros(questoes_imagem, arquivo_final_imagem)
+        print(f"Salvo: {arquivo_final_imagem}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
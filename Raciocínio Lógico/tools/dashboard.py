@@ -1,5 +1,9 @@
 import json
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Data Loader Tools"))
+from registros_json import carregar_registros, localizar
 
 ARQUIVO_JSON = "dataset_RL_imagens.json"
 ARQUIVO_HTML = "dashboard_RL.html"
@@ -7,12 +11,12 @@ ARQUIVO_HTML = "dashboard_RL.html"
 def main():
     print("--- GERADOR DE DASHBOARD VISUAL (RACIOCÍNIO LÓGICO) ---")
 
-    if not os.path.exists(ARQUIVO_JSON):
+    arquivo_json = localizar(ARQUIVO_JSON)
+    if not os.path.exists(arquivo_json):
         print(f"❌ Erro: {ARQUIVO_JSON} não encontrado.")
         return
 
-    with open(ARQUIVO_JSON, 'r', encoding='utf-8') as f:
-        questoes = json.load(f)
+    questoes = carregar_registros(arquivo_json)
 
     # Injeta os dados JSON diretamente no JavaScript do HTML para evitar bloqueios de CORS do navegador
     json_dados = json.dumps(questoes, ensure_ascii=False)
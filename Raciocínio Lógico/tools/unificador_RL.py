@@ -1,5 +1,8 @@
-import json
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Data Loader Tools"))
+from registros_json import carregar_registros, gravar_registros, localizar
 
 # ==============================================================================
 # CONFIGURAÇÃO DOS ARQUIVOS
@@ -11,20 +14,20 @@ ARQUIVO_DEFINITIVO = "dataset_RL_DEFINITIVO.json"     # O Banco Final
 def main():
     print("--- UNIFICADOR FINAL: RACIOCÍNIO LÓGICO ---")
 
-    if not os.path.exists(ARQUIVO_TEXTO):
+    arquivo_texto = localizar(ARQUIVO_TEXTO)
+    if not os.path.exists(arquivo_texto):
         print(f"❌ Erro: Arquivo base {ARQUIVO_TEXTO} não encontrado.")
         return
 
     # 1. Carrega as questões de Texto/Latex
-    with open(ARQUIVO_TEXTO, 'r', encoding='utf-8') as f:
-        questoes_texto = json.load(f)
+    questoes_texto = carregar_registros(arquivo_texto)
     print(f"📄 Carregadas {len(questoes_texto)} questões de Texto Puro/LaTeX.")
 
     # 2. Carrega as questões com Imagem Aprovadas (se o arquivo existir)
     questoes_imagem = []
-    if os.path.exists(ARQUIVO_IMAGENS):
-        with open(ARQUIVO_IMAGENS, 'r', encoding='utf-8') as f:
-            questoes_imagem = json.load(f)
+    arquivo_imagens = localizar(ARQUIVO_IMAGENS)
+    if os.path.exists(arquivo_imagens):
+        questoes_imagem = carregar_registros(arquivo_imagens)
         print(f"🖼️ Carregadas {len(questoes_imagem)} questões com Imagem (Aprovadas).")
     else:
         print(f"⚠️ Aviso: Arquivo {ARQUIVO_IMAGENS} não encontrado. Nenhuma imagem adicionada.")
@@ -36,8 +39,7 @@ def main():
     questoes_totais.sort(key=lambda x: int(x['id_tec']))
 
     # 5. Salva o Arquivo Definitivo
-    with open(ARQUIVO_DEFINITIVO, 'w', encoding='utf-8') as f:
-        json.dump(questoes_totais, f, indent=4, ensure_ascii=False)
+    gravar_registros(questoes_totais, ARQUIVO_DEFINITIVO)
 
     print("-" * 50)
     print(f"✅ SUCESSO! Banco de Raciocínio Lógico CONCLUÍDO.")